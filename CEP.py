@@ -3,6 +3,7 @@ This file contains the main class of the project. It processes streams of events
 by invoking the rest of the system components.
 """
 from base.DataFormatter import DataFormatter
+from misc import DefaultConfig
 from parallel.EvaluationManagerFactory import EvaluationManagerFactory
 from parallel.ParallelExecutionParameters import ParallelExecutionParameters
 from stream.Stream import InputStream, OutputStream
@@ -31,13 +32,22 @@ class CEP:
                                                                                        eval_mechanism_params,
                                                                                        parallel_execution_params)
 
-    def run(self, events: InputStream, matches: OutputStream, data_formatter: DataFormatter):
+    def run(self, events: InputStream, matches: OutputStream, data_formatter: DataFormatter,
+            enable_attribute_projection: bool = DefaultConfig.ENABLE_ATTRIBUTE_PROJECTION):
         """
         Applies the evaluation mechanism to detect the predefined patterns in a given stream of events.
+        If attribute projection is enabled, the events of the detected matches only contain the attributes required
+        for the evaluation.
         Returns the total time elapsed during evaluation.
         """
+        if enable_attribute_projection:
+            data_formatter.set_projection(self.__evaluation_manager.get_required_attribute_names())
         start = datetime.now()
-        self.__evaluation_manager.eval(events, matches, data_formatter)
+        try:
+            self.__evaluation_manager.eval(events, matches, data_formatter)
+        finally:
+            if enable_attribute_projection:
+                data_formatter.set_projection(None)
         return (datetime.now() - start).total_seconds()
 
     def get_pattern_match(self):
@@ -129,7 +129,7 @@ class SelectivityStatistics(Statistics):
         (atomic_condition, is_condition_success) = data
 
         if atomic_condition:
-            atomic_condition_id = str(atomic_condition)
+            atomic_condition_id = atomic_condition.get_condition_id()
             if atomic_condition_id in self.__atomic_condition_to_total_map:
                 self.__atomic_condition_to_total_map[atomic_condition_id] += 1
                 if is_condition_success:
@@ -171,7 +171,7 @@ class SelectivityStatistics(Statistics):
                 atomic_conditions = conditions.extract_atomic_conditions()
                 for atomic_condition in atomic_conditions:
                     if atomic_condition:
-                        atomic_condition_id = str(atomic_condition)
+                        atomic_condition_id = atomic_condition.get_condition_id()
                         self.__relevant_indices.add((i, j))
                         self.__atomic_condition_to_total_map[atomic_condition_id] = 0.0
                         self.__atomic_condition_to_success_map[atomic_condition_id] = 0.0
@@ -6,8 +6,9 @@ class StatisticsCollector:
     """
     Collects, maintains and updates statistics from the stream
     """
-    def __init__(self, statistics: dict):
+    def __init__(self, statistics: dict, selectivity_sampling_interval: int = 1):
         self.__statistics = statistics
+        self.__selectivity_sampling_interval = selectivity_sampling_interval
 
     def handle_event(self, event: Event):
         """
@@ -30,3 +31,9 @@ class StatisticsCollector:
         """
         if statistics_type in self.__statistics:
             self.__statistics[statistics_type].update(data)
+
+    def get_selectivity_sampling_interval(self):
+        """
+        Returns N such that only every N-th evaluation of an atomic condition updates the selectivity statistics.
+        """
+        return self.__selectivity_sampling_interval
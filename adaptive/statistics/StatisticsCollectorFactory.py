@@ -2,6 +2,7 @@ from typing import List
 from datetime import timedelta
 from base.Pattern import Pattern
 from misc import DefaultConfig
+from misc.TimestampUnits import TimestampUnits, convert_time_window
 from adaptive.statistics.StatisticsTypes import StatisticsTypes
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
 from adaptive.statistics.StatisticsFactory import StatisticsFactory
@@ -12,11 +13,15 @@ class StatisticsCollectorParameters:
     Parameters for the statistics collector
     """
     def __init__(self, statistics_time_window: timedelta = DefaultConfig.STATISTICS_TIME_WINDOW,
-                 statistics_types: StatisticsTypes or List[StatisticsTypes] = DefaultConfig.DEFAULT_STATISTICS_TYPE):
+                 statistics_types: StatisticsTypes or List[StatisticsTypes] = DefaultConfig.DEFAULT_STATISTICS_TYPE,
+                 selectivity_sampling_interval: int = DefaultConfig.SELECTIVITY_STATISTICS_SAMPLING_INTERVAL):
         if isinstance(statistics_types, StatisticsTypes):
             statistics_types = [statistics_types]
+        if selectivity_sampling_interval < 1:
+            raise Exception("Invalid selectivity sampling interval: %s" % (selectivity_sampling_interval,))
         self.statistics_types = statistics_types
         self.statistics_time_window = statistics_time_window
+        self.selectivity_sampling_interval = selectivity_sampling_interval
 
 
 class StatisticsCollectorFactory:
@@ -25,25 +30,28 @@ class StatisticsCollectorFactory:
     """
 
     @staticmethod
-    def build_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters, patterns: List[Pattern]):
+    def build_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters, patterns: List[Pattern],
+                                   timestamp_unit: TimestampUnits = DefaultConfig.DEFAULT_TIMESTAMP_UNIT):
         if statistics_collector_parameters is None:
             statistics_collector_parameters = StatisticsCollectorFactory.__create_default_statistics_collector_parameters()
-        return StatisticsCollectorFactory.__create_statistics_collector(statistics_collector_parameters, patterns)
+        return StatisticsCollectorFactory.__create_statistics_collector(statistics_collector_parameters, patterns,
+                                                                        timestamp_unit)
 
     @staticmethod
     def __create_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters,
-                                      patterns: List[Pattern]):
+                                      patterns: List[Pattern], timestamp_unit: TimestampUnits):
         """
         Currently, multi-pattern is not supported.
         TODO: To support multi-pattern mode it will need to go through a loop and create statistics for each pattern.
         """
         pattern = patterns[0]
-        statistics_time_window = statistics_collector_parameters.statistics_time_window
+        statistics_time_window = convert_time_window(statistics_collector_parameters.statistics_time_window,
+                                                     timestamp_unit)
         statistics_dict = {}
         for stat_type in statistics_collector_parameters.statistics_types:
             stat = StatisticsFactory.create_statistics(pattern, stat_type, statistics_time_window)
             statistics_dict[stat_type] = stat
-        return StatisticsCollector(statistics_dict)
+        return StatisticsCollector(statistics_dict, statistics_collector_parameters.selectivity_sampling_interval)
 
     @staticmethod
     def __create_default_statistics_collector_parameters():
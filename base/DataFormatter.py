@@ -1,4 +1,8 @@
 from abc import ABC
+from datetime import datetime
+
+from misc.TimestampCache import TimestampCache
+from misc.TimestampUnits import TimestampUnits, convert_timestamp, convert_time_fields
 
 
 class EventTypeClassifier(ABC):
@@ -19,9 +23,14 @@ class DataFormatter(ABC):
     """
     An abstract class encapsulating the details regarding the input data format.
     A dedicated DataFormatter is expected to be implemented for each new type of input / dataset used by the system.
+    The timestamps returned by get_event_timestamp are expected to be represented according to the timestamp unit of
+    the data formatter, which must be identical to the one of the evaluation mechanism.
     """
-    def __init__(self, event_type_classifier: EventTypeClassifier):
+    def __init__(self, event_type_classifier: EventTypeClassifier,
+                 timestamp_unit: TimestampUnits = TimestampUnits.DATETIME):
         self.__event_type_classifier = event_type_classifier
+        self.__timestamp_unit = timestamp_unit
+        self.__timestamp_cache = None
 
     def parse_event(self, raw_data: str):
         """
@@ -30,6 +39,23 @@ class DataFormatter(ABC):
         """
         raise NotImplementedError()
 
+    def set_projection(self, attribute_names: set):
+        """
+        Restricts the payloads returned by parse_event to the given attributes, in addition to the attributes required
+        for deducing the event type, timestamp and probability. If None is given, all attributes are parsed.
+        This method is optional for a DataFormatter subclass. By default, all attributes are always parsed.
+        """
+        pass
+
+    def peek_event_type(self, raw_data: str):
+        """
+        Deduces and returns the type of the event represented by the given raw data object without parsing it entirely,
+        enabling to discard irrelevant events before their payload is decoded.
+        This method is optional for a DataFormatter subclass. By default, None is returned, meaning that the type can
+        only be deduced from the fully parsed payload.
+        """
+        return None
+
     def get_event_timestamp(self, event_payload: dict):
         """
         Deduces and returns the timestamp of the event specified by the given payload.
@@ -42,6 +68,42 @@ class DataFormatter(ABC):
         """
         return self.__event_type_classifier.get_event_type(event_payload)
 
+    def get_timestamp_unit(self):
+        """
+        Returns the representation of the timestamps returned by get_event_timestamp.
+        """
+        return self.__timestamp_unit
+
+    def _convert_timestamp(self, timestamp: datetime):
+        """
+        Converts the given datetime object into the timestamp representation of this data formatter.
+        """
+        return convert_timestamp(timestamp, self.__timestamp_unit)
+
+    def _create_timestamp_cache(self, decode_function: callable, max_size: int = None):
+        """
+        Creates a cache memoizing the given function, which decodes a raw timestamp (e.g., a string) into a datetime
+        object or into a tuple of its fields (year, month, day, hour, minute, second). The cached values are already
+        converted into the timestamp representation of this data formatter. Decoding into fields is preferable, as
+        integer timestamps are then calculated without creating intermediate datetime objects.
+        Subclasses are encouraged to use this cache in get_event_timestamp whenever many events share the same raw
+        timestamp, as timestamp decoding is often among the most expensive parts of event parsing.
+        """
+        def decode_and_convert(raw_timestamp):
+            decoded_timestamp = decode_function(raw_timestamp)
+            if isinstance(decoded_timestamp, tuple):
+                return convert_time_fields(decoded_timestamp, self.__timestamp_unit)
+            return self._convert_timestamp(decoded_timestamp)
+        self.__timestamp_cache = TimestampCache(decode_and_convert) if max_size is None \
+            else TimestampCache(decode_and_convert, max_size)
+        return self.__timestamp_cache
+
+    def get_timestamp_cache(self):
+        """
+        Returns the timestamp cache of this data formatter, or None if it does not cache the timestamps.
+        """
+        return self.__timestamp_cache
+
     def get_probability(self, event_payload: dict):
         """
         Deduces and returns the occurrence probability of the event specified by the given payload. None is returned if
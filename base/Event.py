@@ -8,7 +8,9 @@ class Event:
     This class represents a single primitive event received from an input stream. It may contain arbitrary attributes
     of arbitrary types. The only requirement is that event type and timestamp of occurrence must be derivable from these
     attributes using an appropriate data formatter.
+    The instances of this class have no per-instance attribute dictionary to reduce their memory footprint.
     """
+    __slots__ = ("payload", "type", "min_timestamp", "max_timestamp", "timestamp", "probability", "attribute_cache")
 
     # used in order to assign a serial number to each event that enters the system
     counter = 0
@@ -22,10 +24,20 @@ class Event:
         self.min_timestamp = self.max_timestamp = self.timestamp = data_formatter.get_event_timestamp(self.payload)
         self.payload[Event.INDEX_ATTRIBUTE_NAME] = Event.counter
         self.probability = data_formatter.get_probability(self.payload)
+        # the attribute values extracted by condition variables if the attribute cache is enabled (see AttributeCache)
+        self.attribute_cache = None
         if self.probability is not None and (self.probability < 0.0 or self.probability > 1.0):
             raise Exception("Invalid value for probability:%s" % (self.probability,))
         Event.counter += 1
 
+    @staticmethod
+    def skip():
+        """
+        Accounts for a raw event discarded without being converted into an Event object, keeping the serial numbers of
+        the subsequent events consistent with their positions in the input stream.
+        """
+        Event.counter += 1
+
     def __eq__(self, other):
         return self.payload[Event.INDEX_ATTRIBUTE_NAME] == other.payload[Event.INDEX_ATTRIBUTE_NAME]
 
@@ -49,10 +61,13 @@ class AggregatedEvent(Event):
     Represents a set of events produced by a Kleene closure operator.
     TODO: as of now, can only be used for a flat (non-nested) Kleene closure.
     """
+    __slots__ = ("primitive_events",)
+
     def __init__(self, events: List[Event], probability: float):
         self.type = None if len(events) == 0 else events[0].type  # will not be set correctly for nested Kleene closures
         self.probability = probability
         self.payload = {Event.INDEX_ATTRIBUTE_NAME: Event.counter}
+        self.attribute_cache = None
 
         self.primitive_events = events
 
@@ -4,6 +4,7 @@ from typing import List, Dict
 from base.Event import Event
 from condition.Condition import Condition, Variable, BinaryCondition, TrueCondition
 from condition.CompositeCondition import CompositeCondition, AndCondition
+from condition.Expression import BooleanExpression
 from base.PatternStructure import PatternStructure, CompositeStructure, PrimitiveEventStructure, \
     SeqOperator, NegationOperator, UnaryStructure
 from datetime import timedelta
@@ -17,6 +18,7 @@ class Pattern:
     The entire pattern structure is divided into a positive and a negative component to allow for different treatment
     during evaluation.
     - A condition to be satisfied by the primitive events. This condition might encapsulate multiple nested conditions.
+    The condition can also be specified as a declarative expression, in which case it is compiled into a condition.
     - A time window for the pattern matches to occur within.
     - A ConsumptionPolicy object that contains the policies that filter certain partial matches.
     - An optional confidence parameter, intended to indicate the minimal acceptable probability of a pattern match. This
@@ -24,7 +26,7 @@ class Pattern:
     A pattern can also carry statistics with it, in order to enable advanced tree construction mechanisms - this is
     hopefully a temporary hack.
     """
-    def __init__(self, pattern_structure: PatternStructure, pattern_matching_condition: Condition,
+    def __init__(self, pattern_structure: PatternStructure, pattern_matching_condition: Condition or BooleanExpression,
                  time_window: timedelta, consumption_policy: ConsumptionPolicy = None, pattern_id: int = None,
                  confidence: float = None, statistics: Dict = None):
         if confidence is not None and (confidence < 0.0 or confidence > 1.0):
@@ -36,6 +38,8 @@ class Pattern:
         self.negative_structure = self.__extract_negative_structure()
 
         self.condition = pattern_matching_condition
+        if isinstance(self.condition, BooleanExpression):
+            self.condition = self.condition.to_condition()
         if isinstance(self.condition, TrueCondition):
             self.condition = AndCondition()
         elif not isinstance(self.condition, CompositeCondition):
@@ -115,6 +119,13 @@ class Pattern:
             return self.__get_all_event_types_aux(structure.arg)
         return reduce(lambda x, y: x + y, [self.__get_all_event_types_aux(arg) for arg in structure.args])
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes required for detecting this pattern, or None if they cannot be
+        determined.
+        """
+        return self.condition.get_attribute_names()
+
     def get_primitive_events(self) -> List[PrimitiveEventStructure]:
         """
         Returns a list of primitive events that make up the pattern structure.
@@ -7,13 +7,27 @@ class PatternMatch:
     Represents a set of primitive events satisfying one or more patterns.
     An instance of this class could correspond either to a full pattern match, or to any intermediate result
     created during the evaluation process.
+    Since a huge number of partial matches may be stored during the evaluation, the instances of this class have no
+    per-instance attribute dictionary.
     """
-    def __init__(self, events: List[Event], probability: float = None):
+    __slots__ = ("events", "last_timestamp", "first_timestamp", "pattern_ids", "probability")
+
+    def __init__(self, events: List[Event], probability: float = None,
+                 first_timestamp=None, last_timestamp=None):
         self.events = events
-        self.last_timestamp = max(events, key=lambda x: x.max_timestamp).max_timestamp
-        self.first_timestamp = min(events, key=lambda x: x.min_timestamp).min_timestamp
-        # this field is only used for full pattern matches
-        self.pattern_ids = []
+        # the earliest and the latest timestamps are only calculated if they are not already known to the caller
+        if first_timestamp is None or last_timestamp is None:
+            first_timestamp, last_timestamp = events[0].min_timestamp, events[0].max_timestamp
+            for i in range(1, len(events)):
+                event = events[i]
+                if event.min_timestamp < first_timestamp:
+                    first_timestamp = event.min_timestamp
+                if event.max_timestamp > last_timestamp:
+                    last_timestamp = event.max_timestamp
+        self.first_timestamp = first_timestamp
+        self.last_timestamp = last_timestamp
+        # this field is only used for full pattern matches - an immutable empty tuple is shared by all partial matches
+        self.pattern_ids = ()
         self.probability = probability
 
     def __eq__(self, other):
@@ -40,4 +54,4 @@ class PatternMatch:
         Adds a new pattern ID corresponding to this pattern,
         """
         if pattern_id not in self.pattern_ids:
-            self.pattern_ids.append(pattern_id)
+            self.pattern_ids += (pattern_id,)
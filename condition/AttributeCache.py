@@ -0,0 +1,91 @@
+"""
+This file contains the cache of the event attribute values extracted by the attribute getters of condition variables.
+"""
+from threading import Lock
+
+from base.Event import Event
+from misc import DefaultConfig
+
+
+class AttributeCache:
+    """
+    An opt-in memo of the attribute values extracted from events by the attribute getters of condition variables.
+    The values are stored alongside each event in a dictionary keyed by the attribute getter. As the conditions of an
+    evaluation tree are copies of the pattern condition sharing the original getters, a value extracted for the
+    condition of one node is reused by the conditions of the other nodes and by the sorting keys of the storages.
+    The cache is consulted by the compiled conditions, by the batch filtering of the candidates and by the sorting keys
+    of the storages. Conditions evaluated by the interpreter (i.e., if COMPILE_CONDITIONS is disabled or the conditions
+    are reordered) receive the event payloads rather than the events, and thus always apply the getters.
+    Counting the hits and misses is opt-in (see COLLECT_ATTRIBUTE_CACHE_STATISTICS), as the counters are shared by all
+    the evaluation mechanisms in the process and are updated under a lock.
+    """
+    __hit_count = 0
+    __miss_count = 0
+    __statistics_lock = Lock()
+
+    @staticmethod
+    def get_attribute(event: Event, getattr_func: callable, content):
+        """
+        Returns the value extracted by the given getter from the given content of the given event, only applying the
+        getter if the value is not already cached for this event.
+        """
+        cache = event.attribute_cache
+        if cache is None:
+            cache = event.attribute_cache = {}
+        elif getattr_func in cache:
+            return cache[getattr_func]
+        value = cache[getattr_func] = getattr_func(content)
+        return value
+
+    @staticmethod
+    def get_attribute_and_count(event: Event, getattr_func: callable, content):
+        """
+        Similarly to get_attribute, returns the value extracted by the given getter, while counting the cache hits and
+        misses.
+        """
+        is_hit = event.attribute_cache is not None and getattr_func in event.attribute_cache
+        with AttributeCache.__statistics_lock:
+            if is_hit:
+                AttributeCache.__hit_count += 1
+            else:
+                AttributeCache.__miss_count += 1
+        return AttributeCache.get_attribute(event, getattr_func, content)
+
+    @staticmethod
+    def get_attribute_function():
+        """
+        Returns the function to be used for retrieving the attribute values via the cache, which also counts the hits
+        and misses if configured.
+        """
+        return AttributeCache.get_attribute_and_count if DefaultConfig.COLLECT_ATTRIBUTE_CACHE_STATISTICS \
+            else AttributeCache.get_attribute
+
+    @staticmethod
+    def get_hit_count():
+        """
+        Returns the number of attribute values retrieved from the cache.
+        """
+        return AttributeCache.__hit_count
+
+    @staticmethod
+    def get_miss_count():
+        """
+        Returns the number of attribute values that had to be extracted by the attribute getters.
+        """
+        return AttributeCache.__miss_count
+
+    @staticmethod
+    def get_hit_rate():
+        """
+        Returns the fraction of the attribute value requests served from the cache, or None if no requests were made.
+        """
+        total_count = AttributeCache.__hit_count + AttributeCache.__miss_count
+        return None if total_count == 0 else AttributeCache.__hit_count / total_count
+
+    @staticmethod
+    def reset_statistics():
+        """
+        Resets the hit and miss counters.
+        """
+        with AttributeCache.__statistics_lock:
+            AttributeCache.__hit_count = AttributeCache.__miss_count = 0
@@ -2,10 +2,12 @@
 This file contains the composite condition classes.
 """
 from abc import ABC
+from time import perf_counter
 
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
 from condition.Condition import Condition, AtomicCondition
 from condition.KCCondition import KCCondition
+from misc import DefaultConfig
 
 
 class CompositeCondition(Condition, ABC):
@@ -17,15 +19,116 @@ class CompositeCondition(Condition, ABC):
         self.__conditions = list(condition_list)
         self.__terminating_result = terminating_result
         self._statistics_collector = None
+        # the number of evaluations between subsequent reorderings of the conditions or None if reordering is disabled
+        self.__reordering_interval = None
+        # the number of evaluations between subsequent timed evaluations
+        self.__timing_interval = None
+        self.__evaluation_count = 0
+        # for each condition, the number of its evaluations, the number of evaluations yielding the terminating result,
+        # the total time spent in its timed evaluations and the number of these evaluations
+        self.__evaluation_statistics = None
+        self.__is_reordered = False
 
     def eval(self, binding: dict = None):
         if self.get_num_conditions() == 0:
             return True
+        if self.__reordering_interval is not None:
+            return self.__eval_and_reorder(binding)
         for condition in self.__conditions:
             if condition.eval(binding) == self.__terminating_result:
                 return self.__terminating_result
         return not self.__terminating_result
 
+    def __eval_and_reorder(self, binding: dict = None):
+        """
+        Evaluates this condition while counting the outcomes of each evaluated condition. As timing an evaluation may
+        cost as much as the evaluation itself, the cost of the conditions is only measured in a sample of the
+        evaluations. The conditions are periodically reordered according to the collected measurements.
+        """
+        result = not self.__terminating_result
+        is_timed = self.__evaluation_count % self.__timing_interval == 0
+        for condition, statistics in zip(self.__conditions, self.__evaluation_statistics):
+            if is_timed:
+                start_time = perf_counter()
+                is_terminating = condition.eval(binding) == self.__terminating_result
+                statistics[2] += perf_counter() - start_time
+                statistics[3] += 1
+            else:
+                is_terminating = condition.eval(binding) == self.__terminating_result
+            statistics[0] += 1
+            if is_terminating:
+                statistics[1] += 1
+                result = self.__terminating_result
+                break
+        self.__evaluation_count += 1
+        if self.__evaluation_count % self.__reordering_interval == 0:
+            self.__reorder_conditions()
+        return result
+
+    def __reorder_conditions(self):
+        """
+        Sorts the conditions in ascending order of their expected evaluation cost per evaluation yielding the
+        terminating result. This way, cheap conditions that frequently determine the result (e.g., rarely satisfied
+        conditions in a conjunction) are evaluated first.
+        Conditions that were never timed or never yielded the terminating result are kept at the end in their current
+        order. The measurements are then halved, such that the order adapts to changes in the data.
+        """
+        def get_rank(statistics):
+            # the average cost divided by the probability of yielding the terminating result
+            evaluation_count, terminating_count, total_time, timed_count = statistics
+            if terminating_count == 0 or timed_count == 0:
+                return float("inf")
+            return (total_time / timed_count) * (evaluation_count / terminating_count)
+
+        ordered_pairs = sorted(zip(self.__conditions, self.__evaluation_statistics),
+                               key=lambda pair: get_rank(pair[1]))
+        new_conditions = [condition for condition, _ in ordered_pairs]
+        if any(new is not old for new, old in zip(new_conditions, self.__conditions)):
+            self.__is_reordered = True
+        self.__conditions[:] = new_conditions
+        self.__evaluation_statistics = [[value / 2 for value in statistics] for _, statistics in ordered_pairs]
+
+    def set_reordering_interval(self, reordering_interval: int or None):
+        """
+        Enables the periodic reordering of the conditions of this composite condition and all nested composite
+        conditions, according to the observed selectivity and evaluation cost of each condition. The conditions are
+        reordered every reordering_interval evaluations. Reordering is disabled if None is given.
+        As the conditions may be evaluated in any order, they should not rely on each other (e.g., a condition should
+        not assume that a preceding condition has guarded it against invalid attribute values).
+        """
+        self.__reordering_interval = reordering_interval
+        self.__timing_interval = DefaultConfig.CONDITION_REORDERING_TIMING_INTERVAL
+        self.__evaluation_count = 0
+        self.__evaluation_statistics = None if reordering_interval is None else \
+            [self.__create_evaluation_statistics() for _ in self.__conditions]
+        for condition in self.__conditions:
+            if isinstance(condition, CompositeCondition):
+                condition.set_reordering_interval(reordering_interval)
+
+    @staticmethod
+    def __create_evaluation_statistics():
+        """
+        Returns the initial measurements of a single condition: the number of its evaluations, the number of
+        evaluations yielding the terminating result, the total time spent in its timed evaluations and the number of
+        these evaluations.
+        """
+        return [0, 0, 0.0, 0]
+
+    def get_reordering_interval(self):
+        """
+        Returns the number of evaluations between subsequent reorderings of the conditions, or None if reordering is
+        disabled.
+        """
+        return self.__reordering_interval
+
+    def is_reordered(self):
+        """
+        Returns True if the order of the conditions of this composite condition or any nested composite condition was
+        changed by the periodic reordering and False otherwise.
+        """
+        return self.__is_reordered or any(condition.is_reordered() for condition in self.__conditions
+                                          if isinstance(condition, CompositeCondition))
+
     def __eq__(self, other):
         if self == other:
             return True
@@ -69,6 +172,8 @@ class CompositeCondition(Condition, ABC):
         # remove the conditions at previously saved indices
         for index in reversed(conditions_to_remove):
             self.__conditions.pop(index)
+            if self.__evaluation_statistics is not None:
+                self.__evaluation_statistics.pop(index)
 
         return CompositeCondition(self.__terminating_result, *result_conditions)
 
@@ -78,6 +183,12 @@ class CompositeCondition(Condition, ABC):
         """
         return len(self.__conditions)
 
+    def get_terminating_result(self):
+        """
+        Returns the evaluation result of a single condition that determines the result of this composite condition.
+        """
+        return self.__terminating_result
+
     def get_conditions_list(self):
         """
         Returns the list of conditions encapsulated by this composite condition.
@@ -90,11 +201,25 @@ class CompositeCondition(Condition, ABC):
             result.extend(f.extract_atomic_conditions())
         return result
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes this condition depends on, or None if they cannot be determined.
+        """
+        attribute_names = set()
+        for condition in self.__conditions:
+            condition_attribute_names = condition.get_attribute_names()
+            if condition_attribute_names is None:
+                return None
+            attribute_names |= condition_attribute_names
+        return attribute_names
+
     def add_atomic_condition(self, condition: AtomicCondition):
         """
         Adds a new atomic condition to this composite condition.
         """
         self.__conditions.append(condition)
+        if self.__evaluation_statistics is not None:
+            self.__evaluation_statistics.append(self.__create_evaluation_statistics())
         condition.set_statistics_collector(self._statistics_collector)
 
     def set_statistics_collector(self, statistics_collector: StatisticsCollector):
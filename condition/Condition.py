@@ -39,6 +39,102 @@ class EquationSides(Enum):
     right = 1
 
 
+def get_accessed_attribute_names(getattr_func: callable):
+    """
+    Returns the names of the event attributes accessed by the given attribute getter, or None if they cannot be
+    determined.
+    The getter is traced by applying it to a dummy payload recording the accessed keys. The attributes are considered
+    unknown if the getter fails on the dummy payload, exposes the payload itself (e.g., lambda x: x) or accesses it as
+    a whole (e.g., iterates over its keys or values), or branches on the values of the attributes, in which case a
+    different set of attributes might be accessed for other payloads.
+    """
+    payload = _AttributeAccessRecorder()
+    try:
+        value = getattr_func(payload)
+    except Exception:
+        return None
+    if payload.is_opaque or _AttributeAccessRecorder.contains_payload(value):
+        return None
+    return payload.accessed_attribute_names
+
+
+class _DummyAttributeValue:
+    """
+    A dummy attribute value supporting the arithmetic and comparison operations. Converting it to a Boolean value
+    (e.g., in a conditional expression) marks the getter as depending on the attribute values.
+    """
+    def __init__(self, recorder):
+        self.__recorder = recorder
+
+    def __operation(self, *args):
+        return self
+
+    __add__ = __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = __operation
+    __truediv__ = __rtruediv__ = __floordiv__ = __rfloordiv__ = __mod__ = __rmod__ = __pow__ = __rpow__ = __operation
+    __neg__ = __pos__ = __abs__ = __round__ = __operation
+    __lt__ = __le__ = __gt__ = __ge__ = __eq__ = __ne__ = __operation
+    __hash__ = object.__hash__
+
+    def __bool__(self):
+        self.__recorder.is_opaque = True
+        return True
+
+    def __int__(self):
+        return 1
+
+    def __float__(self):
+        return 1.0
+
+    def __index__(self):
+        return 1
+
+    def __str__(self):
+        return "1"
+
+
+class _AttributeAccessRecorder(dict):
+    """
+    A dummy event payload recording the names of the attributes accessed by an attribute getter, and whether the
+    payload was accessed in a way preventing the attributes from being determined.
+    """
+    def __init__(self):
+        super().__init__()
+        self.accessed_attribute_names = set()
+        self.is_opaque = False
+
+    def __getitem__(self, key):
+        self.accessed_attribute_names.add(key)
+        return _DummyAttributeValue(self)
+
+    def get(self, key, default=None):
+        return self[key]
+
+    def __contains__(self, key):
+        self.accessed_attribute_names.add(key)
+        # the result of the membership test might affect the accessed attributes
+        self.is_opaque = True
+        return True
+
+    def __access_entire_payload(self, *args, **kwargs):
+        self.is_opaque = True
+        raise Exception("The attributes accessed by the getter cannot be determined")
+
+    keys = values = items = copy = __iter__ = __len__ = __access_entire_payload
+    __eq__ = __ne__ = __repr__ = __str__ = __bool__ = __access_entire_payload
+    __hash__ = object.__hash__
+
+    @staticmethod
+    def contains_payload(value):
+        """
+        Returns True if the given value returned by a getter is or contains a dummy payload and False otherwise.
+        """
+        if isinstance(value, _AttributeAccessRecorder):
+            return True
+        if isinstance(value, (list, tuple, set)):
+            return any(_AttributeAccessRecorder.contains_payload(item) for item in value)
+        return False
+
+
 class Variable:
     """
     This class represents a variable in an event-related condition.
@@ -59,6 +155,12 @@ class Variable:
             raise NameError("Name %s is not bound to a value" % self.name)
         return self.getattr_func(binding[self.name])
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes this variable depends on, or None if they cannot be determined.
+        """
+        return get_accessed_attribute_names(self.getattr_func)
+
     def __repr__(self):
         return self.name
 
@@ -91,6 +193,12 @@ class Condition(ABC):
         """
         return set()
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes this condition depends on, or None if they cannot be determined.
+        """
+        return set()
+
 
 class AtomicCondition(Condition, ABC):
     """
@@ -101,15 +209,36 @@ class AtomicCondition(Condition, ABC):
     def __init__(self):
         # currently used to update the selectivity statistics if they are present in the statistics collector
         self._statistics_collector = None
+        # only every N-th evaluation is reported to the statistics collector
+        self.__sampling_interval = 1
+        self.__evaluations_until_sample = 1
+        # the string identifying this condition in the statistics, calculated upon first use
+        self.__condition_id = None
 
     def eval(self, binding: dict or list = None):
-        result = self._eval(binding)
-        # updates the selectivity statistics based on the evaluated atomic condition result
-        data = (self, result)
+        return self._update_statistics(self._eval(binding))
+
+    def _update_statistics(self, result):
+        """
+        Updates the selectivity statistics based on the given result of evaluating this condition and returns the
+        result. Only a sample of the evaluations, as configured in the statistics collector, is reported.
+        """
         if self._statistics_collector is not None:
-            self._statistics_collector.update_statistics_by_type(StatisticsTypes.SELECTIVITY_MATRIX, data)
+            self.__evaluations_until_sample -= 1
+            if self.__evaluations_until_sample == 0:
+                self.__evaluations_until_sample = self.__sampling_interval
+                self._statistics_collector.update_statistics_by_type(StatisticsTypes.SELECTIVITY_MATRIX,
+                                                                     (self, result))
         return result
 
+    def get_condition_id(self):
+        """
+        Returns the string identifying this condition in the statistics.
+        """
+        if self.__condition_id is None:
+            self.__condition_id = str(self)
+        return self.__condition_id
+
     @abstractmethod
     def _eval(self, binding):
         """
@@ -131,6 +260,9 @@ class AtomicCondition(Condition, ABC):
         Sets the statistic collector object for registering successful and failed condition evaluations.
         """
         self._statistics_collector = statistics_collector
+        self.__sampling_interval = 1 if statistics_collector is None else \
+            statistics_collector.get_selectivity_sampling_interval()
+        self.__evaluations_until_sample = self.__sampling_interval
 
     def get_statistics_collector(self):
         """
@@ -196,6 +328,20 @@ class SimpleCondition(AtomicCondition):
         """
         return set(term.name for term in self.terms)
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes this condition depends on, or None if they cannot be determined.
+        """
+        attribute_names = set()
+        for term in self.terms:
+            if not isinstance(term, Variable):
+                continue
+            term_attribute_names = term.get_attribute_names()
+            if term_attribute_names is None:
+                return None
+            attribute_names |= term_attribute_names
+        return attribute_names
+
 
 class BinaryCondition(SimpleCondition):
     """
@@ -0,0 +1,155 @@
+"""
+This file contains the condition compiler, translating a condition tree into a single Python function.
+"""
+from typing import List
+
+from base.Event import AggregatedEvent
+from condition.AttributeCache import AttributeCache
+from condition.BaseRelationCondition import BaseRelationCondition
+from condition.CompositeCondition import CompositeCondition
+from condition.Condition import Condition, AtomicCondition, SimpleCondition, TrueCondition, Variable, RelopTypes
+
+# the Python operators corresponding to the basic relation conditions
+RELOP_TYPE_TO_PYTHON_OPERATOR = {
+    RelopTypes.Equal: "==",
+    RelopTypes.NotEqual: "!=",
+    RelopTypes.Greater: ">",
+    RelopTypes.GreaterEqual: ">=",
+    RelopTypes.Smaller: "<",
+    RelopTypes.SmallerEqual: "<=",
+}
+
+
+def compile_condition(condition: Condition, names: List[str]):
+    """
+    Translates the given condition into a function receiving a sequence of event payloads, ordered according to the
+    given event names, and returning the result of evaluating the condition on these payloads.
+    The generated function accesses the payloads by their positions and applies the attribute getters and the relation
+    operators directly, as opposed to the interpreted evaluation going through the eval methods of all conditions and
+    variables. The selectivity statistics are updated for the atomic conditions having a statistics collector.
+    Returns None if the condition cannot be compiled (e.g., Kleene closure conditions, atomic conditions overriding
+    the evaluation logic or periodically reordered composite conditions), in which case it should be evaluated via its
+    eval method.
+    """
+    return _ConditionCompiler(names, False).create_function(condition)
+
+
+def compile_event_condition(condition: Condition, names: List[str], use_attribute_cache: bool = False):
+    """
+    Similarly to compile_condition, translates the given condition into a function, except that the generated function
+    receives a sequence of events rather than their payloads. The condition is thereby resolved into positions in the
+    event list of a partial match, and the payloads are only extracted from the events referenced by the condition.
+    The content of an aggregated event is the list of the payloads of its primitive events.
+    If use_attribute_cache is set, the attribute values are retrieved via the attribute cache of the events.
+    """
+    return _ConditionCompiler(names, True, use_attribute_cache).create_function(condition)
+
+
+class _ConditionCompiler:
+    """
+    Generates the source code of a compiled condition. The attribute getters, relation operators and constants
+    referenced by the generated code are kept in a dedicated namespace.
+    """
+    def __init__(self, names: List[str], is_event_based: bool, use_attribute_cache: bool = False):
+        self.__slots = {name: slot for slot, name in enumerate(names)}
+        self.__is_event_based = is_event_based
+        self.__use_attribute_cache = is_event_based and use_attribute_cache
+        self.__used_slots = set()
+        self.__namespace = {"AggregatedEvent": AggregatedEvent} if is_event_based else {}
+
+    def compile(self, condition: Condition):
+        """
+        Returns a Python expression evaluating the given condition, or None if the condition cannot be compiled.
+        """
+        if isinstance(condition, CompositeCondition):
+            if condition.get_reordering_interval() is not None:
+                # the order of evaluation of the conditions is not fixed
+                return None
+            return self.__compile_composite_condition(condition)
+        if not isinstance(condition, AtomicCondition) or type(condition).eval is not AtomicCondition.eval:
+            return None
+        if isinstance(condition, TrueCondition):
+            expression = "True"
+        elif isinstance(condition, SimpleCondition) and type(condition)._eval is SimpleCondition._eval:
+            expression = self.__compile_simple_condition(condition)
+        else:
+            return None
+        if expression is None or condition.get_statistics_collector() is None:
+            return expression
+        return "%s(%s)" % (self.__add_to_namespace("u", condition._update_statistics), expression)
+
+    def create_function(self, condition: Condition):
+        """
+        Creates a function evaluating the given condition, or returns None if the condition cannot be compiled.
+        """
+        expression = self.compile(condition)
+        if expression is None:
+            return None
+        if self.__is_event_based:
+            source = "def compiled_condition(events):\n"
+            for slot in sorted(self.__used_slots):
+                source += "    e%d = events[%d]\n" % (slot, slot)
+                source += "    p%d = [event.payload for event in e%d.primitive_events] " \
+                          "if isinstance(e%d, AggregatedEvent) else e%d.payload\n" % (slot, slot, slot, slot)
+        else:
+            source = "def compiled_condition(payloads):\n"
+            for slot in sorted(self.__used_slots):
+                source += "    p%d = payloads[%d]\n" % (slot, slot)
+        source += "    return %s\n" % (expression,)
+        exec(compile(source, "<compiled condition>", "exec"), self.__namespace)
+        return self.__namespace["compiled_condition"]
+
+    def __compile_composite_condition(self, condition: CompositeCondition):
+        """
+        Joins the expressions of the conditions of the given composite condition with the respective logic operator.
+        """
+        if condition.get_num_conditions() == 0:
+            return "True"
+        expressions = []
+        for inner_condition in condition.get_conditions_list():
+            expression = self.compile(inner_condition)
+            if expression is None:
+                return None
+            expressions.append(expression)
+        separator = " or " if condition.get_terminating_result() else " and "
+        return "(" + separator.join(expressions) + ")"
+
+    def __compile_simple_condition(self, condition: SimpleCondition):
+        """
+        Inlines the operator of a basic relation condition, or calls the relation operator of any other simple
+        condition.
+        """
+        if isinstance(condition, BaseRelationCondition) and condition.relop_type in RELOP_TYPE_TO_PYTHON_OPERATOR:
+            left_term = self.__compile_term(condition.left_term_repr)
+            right_term = self.__compile_term(condition.right_term_repr)
+            if left_term is None or right_term is None:
+                return None
+            return "(%s %s %s)" % (left_term, RELOP_TYPE_TO_PYTHON_OPERATOR[condition.relop_type], right_term)
+        terms = [self.__compile_term(term) for term in condition.terms]
+        if None in terms:
+            return None
+        return "%s(%s)" % (self.__add_to_namespace("r", condition.relation_op), ", ".join(terms))
+
+    def __compile_term(self, term):
+        """
+        Returns an expression calculating the value of the given term, or None if the term refers to an unknown name.
+        """
+        if not isinstance(term, Variable):
+            return self.__add_to_namespace("c", term)
+        slot = self.__slots.get(term.name)
+        if slot is None:
+            return None
+        self.__used_slots.add(slot)
+        getattr_func_name = self.__add_to_namespace("g", term.getattr_func)
+        if self.__use_attribute_cache:
+            return "%s(e%d, %s, p%d)" % (self.__add_to_namespace("a", AttributeCache.get_attribute_function()), slot,
+                                         getattr_func_name, slot)
+        return "%s(p%d)" % (getattr_func_name, slot)
+
+    def __add_to_namespace(self, prefix: str, value):
+        """
+        Adds the given object to the namespace of the generated function and returns its name.
+        """
+        name = "%s%d" % (prefix, len(self.__namespace))
+        self.__namespace[name] = value
+        return name
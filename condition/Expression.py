@@ -0,0 +1,474 @@
+"""
+This file contains the declarative condition expressions.
+As opposed to conditions defined using arbitrary Python functions, an expression exposes its structure, that is, the
+events and attributes it refers to and the operations it applies to them. Expressions are built using the Python
+operators and compiled into the regular condition classes. For example:
+    a, b = EventReference("a"), EventReference("b")
+    condition = (a["Opening Price"] * 1.1 < b["Opening Price"]) & (a["Volume"] > 1000)
+is compiled into a conjunction of a SmallerThanCondition and a GreaterThanCondition.
+"""
+import operator
+from abc import ABC
+from typing import List
+
+from condition.BaseRelationCondition import EqCondition, NotEqCondition, GreaterThanCondition, SmallerThanCondition, \
+    GreaterThanEqCondition, SmallerThanEqCondition
+from condition.CompositeCondition import AndCondition, OrCondition
+from condition.Condition import Condition, Variable, SimpleCondition, RelopTypes
+
+# the condition classes corresponding to the comparison types
+RELOP_TYPE_TO_CONDITION_TYPE = {
+    RelopTypes.Equal: EqCondition,
+    RelopTypes.NotEqual: NotEqCondition,
+    RelopTypes.Greater: GreaterThanCondition,
+    RelopTypes.GreaterEqual: GreaterThanEqCondition,
+    RelopTypes.Smaller: SmallerThanCondition,
+    RelopTypes.SmallerEqual: SmallerThanEqCondition,
+}
+
+# the functions and the symbols corresponding to the comparison types
+RELOP_TYPE_TO_OPERATOR = {
+    RelopTypes.Equal: (operator.eq, "=="),
+    RelopTypes.NotEqual: (operator.ne, "!="),
+    RelopTypes.Greater: (operator.gt, ">"),
+    RelopTypes.GreaterEqual: (operator.ge, ">="),
+    RelopTypes.Smaller: (operator.lt, "<"),
+    RelopTypes.SmallerEqual: (operator.le, "<="),
+}
+
+
+class Expression(ABC):
+    """
+    The base class of the expression classes hierarchy.
+    """
+    def get_event_names(self):
+        """
+        Returns the names of the events this expression refers to.
+        """
+        return {event_name for event_name, _ in self.get_attribute_references()}
+
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes this expression refers to.
+        """
+        return {attribute_name for _, attribute_name in self.get_attribute_references()}
+
+    def get_attribute_references(self):
+        """
+        Returns the (event name, attribute name) pairs this expression refers to.
+        """
+        raise NotImplementedError()
+
+    def is_equivalent(self, other):
+        """
+        Returns True if the given expression has the same structure as this expression and False otherwise.
+        """
+        return isinstance(other, Expression) and self._get_key() == other._get_key()
+
+    def _get_key(self):
+        """
+        Returns a tuple describing the structure of this expression.
+        """
+        raise NotImplementedError()
+
+
+class ValueExpression(Expression, ABC):
+    """
+    An expression calculating a value, that is, an event attribute, a constant or an arithmetic expression.
+    Applying the arithmetic operators to value expressions creates arithmetic expressions, and applying the comparison
+    operators creates comparisons.
+    """
+    def create_getter(self):
+        """
+        Returns a function calculating the value of this expression given the payload of the single event it refers to.
+        """
+        raise NotImplementedError()
+
+    def create_evaluator(self, slots: dict):
+        """
+        Returns a function calculating the value of this expression given a sequence of event payloads, where the
+        position of the payload of each event is specified by the given dictionary.
+        """
+        raise NotImplementedError()
+
+    def __add__(self, other):
+        return ArithmeticExpression(operator.add, "+", self, other)
+
+    def __radd__(self, other):
+        return ArithmeticExpression(operator.add, "+", other, self)
+
+    def __sub__(self, other):
+        return ArithmeticExpression(operator.sub, "-", self, other)
+
+    def __rsub__(self, other):
+        return ArithmeticExpression(operator.sub, "-", other, self)
+
+    def __mul__(self, other):
+        return ArithmeticExpression(operator.mul, "*", self, other)
+
+    def __rmul__(self, other):
+        return ArithmeticExpression(operator.mul, "*", other, self)
+
+    def __truediv__(self, other):
+        return ArithmeticExpression(operator.truediv, "/", self, other)
+
+    def __rtruediv__(self, other):
+        return ArithmeticExpression(operator.truediv, "/", other, self)
+
+    def __neg__(self):
+        return ArithmeticExpression(operator.sub, "-", 0, self)
+
+    def __eq__(self, other):
+        return ComparisonExpression(RelopTypes.Equal, self, other)
+
+    def __ne__(self, other):
+        return ComparisonExpression(RelopTypes.NotEqual, self, other)
+
+    def __gt__(self, other):
+        return ComparisonExpression(RelopTypes.Greater, self, other)
+
+    def __ge__(self, other):
+        return ComparisonExpression(RelopTypes.GreaterEqual, self, other)
+
+    def __lt__(self, other):
+        return ComparisonExpression(RelopTypes.Smaller, self, other)
+
+    def __le__(self, other):
+        return ComparisonExpression(RelopTypes.SmallerEqual, self, other)
+
+    # the comparison operators are overloaded, hence the identity-based hash has to be restored explicitly
+    __hash__ = object.__hash__
+
+
+class EventReference:
+    """
+    A reference to a primitive event of a pattern, used for creating references to its attributes.
+    """
+    def __init__(self, event_name: str):
+        self.event_name = event_name
+
+    def __getitem__(self, attribute_name: str):
+        return AttributeReference(self.event_name, attribute_name)
+
+    def __repr__(self):
+        return self.event_name
+
+
+class AttributeReference(ValueExpression):
+    """
+    A reference to an attribute of a primitive event.
+    """
+    def __init__(self, event_name: str, attribute_name: str):
+        self.event_name = event_name
+        self.attribute_name = attribute_name
+
+    def get_attribute_references(self):
+        return {(self.event_name, self.attribute_name)}
+
+    def create_getter(self):
+        return operator.itemgetter(self.attribute_name)
+
+    def create_evaluator(self, slots: dict):
+        slot, attribute_name = slots[self.event_name], self.attribute_name
+        return lambda payloads: payloads[slot][attribute_name]
+
+    def _get_key(self):
+        return "attribute", self.event_name, self.attribute_name
+
+    def __repr__(self):
+        return "%s.%s" % (self.event_name, self.attribute_name)
+
+
+class ConstantExpression(ValueExpression):
+    """
+    A constant value.
+    """
+    def __init__(self, value):
+        self.value = value
+
+    def get_attribute_references(self):
+        return set()
+
+    def create_getter(self):
+        value = self.value
+        return lambda payload: value
+
+    def create_evaluator(self, slots: dict):
+        value = self.value
+        return lambda payloads: value
+
+    def _get_key(self):
+        return "constant", self.value
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+class ArithmeticExpression(ValueExpression):
+    """
+    An arithmetic operation applied to two value expressions. Operands which are not expressions are treated as
+    constants.
+    """
+    def __init__(self, operation: callable, symbol: str, left_operand, right_operand):
+        self.operation = operation
+        self.symbol = symbol
+        self.left_operand = to_expression(left_operand)
+        self.right_operand = to_expression(right_operand)
+
+    def get_attribute_references(self):
+        return self.left_operand.get_attribute_references() | self.right_operand.get_attribute_references()
+
+    def create_getter(self):
+        operation = self.operation
+        left_getter, right_getter = self.left_operand.create_getter(), self.right_operand.create_getter()
+        if isinstance(self.right_operand, ConstantExpression):
+            value = self.right_operand.value
+            return lambda payload: operation(left_getter(payload), value)
+        return lambda payload: operation(left_getter(payload), right_getter(payload))
+
+    def create_evaluator(self, slots: dict):
+        operation = self.operation
+        left_evaluator, right_evaluator = self.left_operand.create_evaluator(slots), \
+            self.right_operand.create_evaluator(slots)
+        return lambda payloads: operation(left_evaluator(payloads), right_evaluator(payloads))
+
+    def _get_key(self):
+        return "arithmetic", self.symbol, self.left_operand._get_key(), self.right_operand._get_key()
+
+    def __repr__(self):
+        return "(%s %s %s)" % (self.left_operand, self.symbol, self.right_operand)
+
+
+class BooleanExpression(Expression, ABC):
+    """
+    An expression evaluating to a Boolean value, that is, a comparison or a logic connective. Boolean expressions are
+    combined using the & (and) and | (or) operators and compiled into conditions using to_condition.
+    """
+    def to_condition(self) -> Condition:
+        """
+        Compiles this expression into an equivalent condition.
+        """
+        raise NotImplementedError()
+
+    def __and__(self, other):
+        return ConnectiveExpression(True, self, other)
+
+    def __or__(self, other):
+        return ConnectiveExpression(False, self, other)
+
+    def __bool__(self):
+        raise Exception("Boolean expressions cannot be evaluated directly - use & and | instead of 'and' and 'or' "
+                        "and avoid chained comparisons")
+
+
+class ComparisonExpression(BooleanExpression):
+    """
+    A comparison between two value expressions.
+    """
+    def __init__(self, relop_type: RelopTypes, left_operand, right_operand):
+        self.relop_type = relop_type
+        self.left_operand = to_expression(left_operand)
+        self.right_operand = to_expression(right_operand)
+
+    def get_attribute_references(self):
+        return self.left_operand.get_attribute_references() | self.right_operand.get_attribute_references()
+
+    def to_condition(self):
+        """
+        If each side of the comparison refers to at most a single event, the comparison is compiled into the basic
+        relation condition of its type, whose terms are the calculated values of both sides. This way, it can be used
+        for sorting the storages as any other basic relation condition. Otherwise, it is compiled into an
+        ExpressionCondition.
+        """
+        left_event_names = self.left_operand.get_event_names()
+        right_event_names = self.right_operand.get_event_names()
+        if len(left_event_names) == 0 and len(right_event_names) == 0:
+            raise Exception("Invalid comparison between constants: %s" % (self,))
+        if len(left_event_names) > 1 or len(right_event_names) > 1:
+            return ExpressionCondition(self)
+        return RELOP_TYPE_TO_CONDITION_TYPE[self.relop_type](ComparisonExpression.__create_term(self.left_operand),
+                                                             ComparisonExpression.__create_term(self.right_operand))
+
+    @staticmethod
+    def __create_term(operand: ValueExpression):
+        """
+        Creates a condition term calculating the value of the given expression, which refers to at most a single event.
+        """
+        if len(operand.get_event_names()) == 0:
+            return operand.create_getter()(None)
+        return ExpressionVariable(operand)
+
+    def _get_key(self):
+        return "comparison", self.relop_type, self.left_operand._get_key(), self.right_operand._get_key()
+
+    def __repr__(self):
+        return "%s %s %s" % (self.left_operand, RELOP_TYPE_TO_OPERATOR[self.relop_type][1], self.right_operand)
+
+
+class ConnectiveExpression(BooleanExpression):
+    """
+    A conjunction or a disjunction of Boolean expressions.
+    """
+    def __init__(self, is_conjunction: bool, *operands):
+        self.is_conjunction = is_conjunction
+        self.operands = []
+        for operand in operands:
+            if not isinstance(operand, BooleanExpression):
+                raise Exception("Invalid operand for a logic connective: %s" % (operand,))
+            if isinstance(operand, ConnectiveExpression) and operand.is_conjunction == is_conjunction:
+                # flatten nested connectives of the same type
+                self.operands.extend(operand.operands)
+            else:
+                self.operands.append(operand)
+
+    def get_attribute_references(self):
+        return set().union(*(operand.get_attribute_references() for operand in self.operands))
+
+    def to_condition(self):
+        conditions = [operand.to_condition() for operand in self.operands]
+        return AndCondition(*conditions) if self.is_conjunction else OrCondition(*conditions)
+
+    def _get_key(self):
+        return ("conjunction" if self.is_conjunction else "disjunction",) + \
+            tuple(operand._get_key() for operand in self.operands)
+
+    def __repr__(self):
+        separator = " AND " if self.is_conjunction else " OR "
+        return "(" + separator.join(str(operand) for operand in self.operands) + ")"
+
+
+class ExpressionVariable(Variable):
+    """
+    A variable whose value is calculated by a value expression referring to a single event.
+    As opposed to a regular variable, the accessed attributes are known without tracing the attribute getter, and
+    variables are compared by the structure of their expressions rather than by the bytecode of their getters.
+    """
+    def __init__(self, expression: ValueExpression):
+        event_names = expression.get_event_names()
+        if len(event_names) != 1:
+            raise Exception("An expression variable must refer to a single event: %s" % (expression,))
+        super().__init__(next(iter(event_names)), expression.create_getter())
+        self.expression = expression
+
+    def get_attribute_names(self):
+        return self.expression.get_attribute_names()
+
+    def __repr__(self):
+        return str(self.expression)
+
+    def __eq__(self, other):
+        return isinstance(other, ExpressionVariable) and self.expression.is_equivalent(other.expression)
+
+
+class _PayloadVariable(Variable):
+    """
+    A variable whose value is the entire payload of an event, of which only the given attributes are accessed.
+    """
+    def __init__(self, event_name: str, attribute_names: set):
+        super().__init__(event_name, _get_payload)
+        self.__attribute_names = attribute_names
+
+    def get_attribute_names(self):
+        return set(self.__attribute_names)
+
+    def __eq__(self, other):
+        return isinstance(other, _PayloadVariable) and self.name == other.name and \
+            self.get_attribute_names() == other.get_attribute_names()
+
+
+class ExpressionCondition(SimpleCondition):
+    """
+    A condition evaluating a comparison referring to multiple events on at least one of its sides (e.g.,
+    a.x + b.x < c.x). The terms of the condition are the payloads of the events, and the relation operator evaluates
+    the comparison on these payloads.
+    """
+    def __init__(self, expression: ComparisonExpression):
+        event_names = sorted(expression.get_event_names())
+        attribute_references = expression.get_attribute_references()
+        terms = [_PayloadVariable(name, {attribute for event_name, attribute in attribute_references
+                                         if event_name == name})
+                 for name in event_names]
+        slots = {name: slot for slot, name in enumerate(event_names)}
+        comparison = RELOP_TYPE_TO_OPERATOR[expression.relop_type][0]
+        left_evaluator = expression.left_operand.create_evaluator(slots)
+        right_evaluator = expression.right_operand.create_evaluator(slots)
+        super().__init__(*terms,
+                         relation_op=lambda *payloads: comparison(left_evaluator(payloads), right_evaluator(payloads)))
+        self.expression = expression
+
+    def __repr__(self):
+        return str(self.expression)
+
+    def __eq__(self, other):
+        return isinstance(other, ExpressionCondition) and self.expression.is_equivalent(other.expression)
+
+
+def to_expression(value):
+    """
+    Returns the given value if it is a value expression, or wraps it into a constant expression otherwise.
+    """
+    if isinstance(value, BooleanExpression):
+        raise Exception("A Boolean expression cannot be used as an operand: %s" % (value,))
+    return value if isinstance(value, ValueExpression) else ConstantExpression(value)
+
+
+def get_equality_attributes(condition: Condition):
+    """
+    Returns a dictionary mapping each event name to the names of its attributes which are required to be equal to an
+    attribute of another event by the top-level conjunction of the given condition (e.g., a.Ticker == b.Ticker).
+    Only conditions created from expressions are considered.
+    """
+    result = {}
+    for terms in _get_equality_terms(condition):
+        for term in terms:
+            result.setdefault(term.name, set()).add(term.expression.attribute_name)
+    return result
+
+
+def get_partitioning_attribute_names(condition: Condition, event_names: List[str]):
+    """
+    Returns the names of the attributes required to have the same value in all the events with the given names by the
+    equalities of the top-level conjunction of the given condition (e.g., a.Ticker == b.Ticker and
+    b.Ticker == c.Ticker). Partitioning the events by any of these attributes preserves all matches.
+    """
+    # for each attribute, the events connected by equalities of this attribute are merged into a single component
+    components_by_attribute = {}
+    for left_term, right_term in _get_equality_terms(condition):
+        attribute_name = left_term.expression.attribute_name
+        if right_term.expression.attribute_name != attribute_name:
+            continue
+        components = components_by_attribute.setdefault(attribute_name, {})
+        merged_component = components.get(left_term.name, {left_term.name}) | \
+            components.get(right_term.name, {right_term.name})
+        for event_name in merged_component:
+            components[event_name] = merged_component
+    if len(event_names) == 0:
+        return set()
+    return {attribute_name for attribute_name, components in components_by_attribute.items()
+            if set(event_names).issubset(components.get(event_names[0], ()))}
+
+
+def _get_equality_terms(condition: Condition):
+    """
+    Returns the pairs of terms of the equalities between attributes of two different events in the top-level
+    conjunction of the given condition.
+    """
+    conditions = [condition]
+    result = []
+    while len(conditions) > 0:
+        current_condition = conditions.pop()
+        if isinstance(current_condition, AndCondition):
+            conditions.extend(current_condition.get_conditions_list())
+            continue
+        if not isinstance(current_condition, EqCondition):
+            continue
+        terms: List[Variable] = [current_condition.left_term_repr, current_condition.right_term_repr]
+        if not all(isinstance(term, ExpressionVariable) and isinstance(term.expression, AttributeReference)
+                   for term in terms) or terms[0].name == terms[1].name:
+            continue
+        result.append(tuple(terms))
+    return result
+
+
+def _get_payload(payload):
+    return payload
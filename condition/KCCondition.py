@@ -3,7 +3,7 @@ This file contains the Kleene closure condition classes.
 """
 from abc import ABC
 
-from condition.Condition import AtomicCondition
+from condition.Condition import AtomicCondition, get_accessed_attribute_names
 
 
 class KCCondition(AtomicCondition, ABC):
@@ -39,6 +39,12 @@ class KCCondition(AtomicCondition, ABC):
         """
         return self._names
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the event attributes this condition depends on, or None if they cannot be determined.
+        """
+        return get_accessed_attribute_names(self._getattr_func)
+
     def __repr__(self):
         return "KC [" + ", ".join(self._names) + "]"
 
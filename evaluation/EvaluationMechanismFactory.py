@@ -6,6 +6,7 @@ from adaptive.statistics.StatisticsCollector import StatisticsCollector
 from base.Pattern import Pattern
 from evaluation.EvaluationMechanismTypes import EvaluationMechanismTypes
 from misc import DefaultConfig
+from misc.TimestampUnits import TimestampUnits
 from tree.evaluation.TreeEvaluationMechanismUpdateTypes import TreeEvaluationMechanismUpdateTypes
 from adaptive.optimizer.OptimizerFactory import OptimizerParameters, OptimizerFactory, \
     StatisticsDeviationAwareOptimizerParameters
@@ -25,9 +26,11 @@ class EvaluationMechanismParameters:
     Parameters required for evaluation mechanism creation.
     """
     def __init__(self, eval_mechanism_type: EvaluationMechanismTypes = DefaultConfig.DEFAULT_EVALUATION_MECHANISM_TYPE,
-                 optimizer_params: OptimizerParameters = OptimizerParameters()):
+                 optimizer_params: OptimizerParameters = OptimizerParameters(),
+                 timestamp_unit: TimestampUnits = DefaultConfig.DEFAULT_TIMESTAMP_UNIT):
         self.type = eval_mechanism_type
         self.optimizer_params = optimizer_params
+        self.timestamp_unit = timestamp_unit
 
 
 class TreeBasedEvaluationMechanismParameters(EvaluationMechanismParameters):
@@ -37,8 +40,9 @@ class TreeBasedEvaluationMechanismParameters(EvaluationMechanismParameters):
     def __init__(self,
                  storage_params: TreeStorageParameters = TreeStorageParameters(),
                  optimizer_params: OptimizerParameters = StatisticsDeviationAwareOptimizerParameters(),
-                 tree_update_type: TreeEvaluationMechanismUpdateTypes = DefaultConfig.DEFAULT_TREE_UPDATE_TYPE):
-        super().__init__(EvaluationMechanismTypes.TREE_BASED, optimizer_params)
+                 tree_update_type: TreeEvaluationMechanismUpdateTypes = DefaultConfig.DEFAULT_TREE_UPDATE_TYPE,
+                 timestamp_unit: TimestampUnits = DefaultConfig.DEFAULT_TIMESTAMP_UNIT):
+        super().__init__(EvaluationMechanismTypes.TREE_BASED, optimizer_params, timestamp_unit)
         self.storage_params = storage_params
         self.tree_update_type = tree_update_type
 
@@ -70,7 +74,8 @@ class EvaluationMechanismFactory:
         optimizer_params = eval_mechanism_params.optimizer_params
         statistic_collector_params = optimizer_params.statistics_collector_params
         statistics_collector = StatisticsCollectorFactory.build_statistics_collector(statistic_collector_params,
-                                                                                     patterns)
+                                                                                     patterns,
+                                                                                     eval_mechanism_params.timestamp_unit)
         optimizer = OptimizerFactory.build_optimizer(eval_mechanism_params.optimizer_params)
         cost_model_type = eval_mechanism_params.optimizer_params.tree_plan_params.cost_model_type
         pattern_to_tree_plan_map = {pattern: optimizer.build_initial_plan(pattern, cost_model_type)
@@ -84,7 +89,8 @@ class EvaluationMechanismFactory:
 
         return EvaluationMechanismFactory.__create_tree_based_evaluation_mechanism_by_update_type(
             pattern_to_tree_plan_map, eval_mechanism_params.storage_params, runtime_statistics_collector, optimizer,
-            optimizer_params.statistics_updates_time_window, eval_mechanism_params.tree_update_type)
+            optimizer_params.statistics_updates_time_window, eval_mechanism_params.tree_update_type,
+            eval_mechanism_params.timestamp_unit)
 
     @staticmethod
     def __merge_tree_plans(pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
@@ -116,7 +122,8 @@ class EvaluationMechanismFactory:
                                                                 statistics_collector: StatisticsCollector,
                                                                 optimizer: Optimizer,
                                                                 statistics_update_time_window: timedelta,
-                                                                tree_update_type: TreeEvaluationMechanismUpdateTypes):
+                                                                tree_update_type: TreeEvaluationMechanismUpdateTypes,
+                                                                timestamp_unit: TimestampUnits):
         """
         Instantiates a tree-based evaluation mechanism given all the parameters.
         """
@@ -125,12 +132,14 @@ class EvaluationMechanismFactory:
                                                        storage_params,
                                                        statistics_collector,
                                                        optimizer,
-                                                       statistics_update_time_window)
+                                                       statistics_update_time_window,
+                                                       timestamp_unit)
 
         if tree_update_type == TreeEvaluationMechanismUpdateTypes.SIMULTANEOUS_TREE_EVALUATION:
             return SimultaneousTreeBasedEvaluationMechanism(pattern_to_tree_plan_map,
                                                             storage_params,
                                                             statistics_collector,
                                                             optimizer,
-                                                            statistics_update_time_window)
+                                                            statistics_update_time_window,
+                                                            timestamp_unit)
         raise Exception("Unknown evaluation mechanism type: %s" % (tree_update_type,))
@@ -0,0 +1,139 @@
+"""
+This file contains a buffer for items arriving in the order of their keys and expiring in the same order.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+from misc.BlockedSortedList import RangeView
+
+
+class ArrivalOrderedBuffer:
+    """
+    A sequence of items appended in non-decreasing order of their keys (e.g., timestamps) and removed from its
+    beginning, similarly to a deque. Unlike a deque, it supports binary search over the keys and constant-time
+    positional access.
+    The items and their keys are stored in two parallel lists, together with the number of the already removed items
+    at their beginning. Removing an item only advances this offset, and the lists are compacted once the removed items
+    occupy at least half of them, such that the amortized cost of a removal is constant and the memory consumption is
+    proportional to the number of items actually stored.
+    """
+    def __init__(self):
+        self.__items = []
+        self.__keys = []
+        self.__start = 0
+
+    def __len__(self):
+        return len(self.__items) - self.__start
+
+    def __iter__(self):
+        return islice(self.__items, self.__start, None)
+
+    def __getitem__(self, index):
+        """
+        Implements list-style "get item" semantics. A slice is returned as a new list.
+        """
+        if isinstance(index, slice):
+            return self.__items[self.__start:][index]
+        return self.__items[self.__get_actual_index(index)]
+
+    def __setitem__(self, index: int, item_and_key: tuple):
+        """
+        Replaces the item at the given position with the given (item, key) pair. The order of the keys is the
+        responsibility of the caller.
+        """
+        actual_index = self.__get_actual_index(index)
+        self.__items[actual_index], self.__keys[actual_index] = item_and_key
+
+    def __delitem__(self, index: int):
+        actual_index = self.__get_actual_index(index)
+        self.__items = self.__items[self.__start:actual_index] + self.__items[actual_index + 1:]
+        self.__keys = self.__keys[self.__start:actual_index] + self.__keys[actual_index + 1:]
+        self.__start = 0
+
+    def append(self, item, key):
+        """
+        Appends the given item to the end of the buffer. The key must not be smaller than any of the stored keys.
+        """
+        self.__items.append(item)
+        self.__keys.append(key)
+
+    def bisect_left(self, key):
+        """
+        Returns the position of the first item whose key is not smaller than the given key.
+        """
+        return bisect_left(self.__keys, key, self.__start) - self.__start
+
+    def bisect_right(self, key):
+        """
+        Returns the position of the first item whose key is greater than the given key.
+        """
+        return bisect_right(self.__keys, key, self.__start) - self.__start
+
+    def get_range(self, start: int, end: int):
+        """
+        Returns a view of the items in the given range of positions. No items are copied.
+        """
+        return RangeView(self, [(start, end)])
+
+    def get_range_complement(self, start: int, end: int):
+        """
+        Returns a view of all the items outside the given range of positions. No items are copied.
+        """
+        return RangeView(self, [(0, start), (end, len(self))])
+
+    def iterate_range(self, start: int, end: int):
+        """
+        Returns an iterator over the items in the given range of positions.
+        """
+        return islice(self.__items, self.__start + start, self.__start + end)
+
+    def remove_while(self, predicate: callable):
+        """
+        Removes the items from the beginning of the buffer as long as they satisfy the given predicate.
+        """
+        items, start = self.__items, self.__start
+        end = len(items)
+        while start < end and predicate(items[start]):
+            start += 1
+        self.__start = start
+        self.__compact()
+
+    def remove_first(self, count: int):
+        """
+        Removes the given number of items from the beginning of the buffer.
+        """
+        self.__start = min(self.__start + max(count, 0), len(self.__items))
+        self.__compact()
+
+    def filter(self, predicate: callable):
+        """
+        Removes all the items not satisfying the given predicate, preserving the order of the remaining ones.
+        The lists are replaced rather than modified in place, such that ongoing iterations are not affected.
+        """
+        items = self.__items
+        indices_to_keep = [i for i in range(self.__start, len(items)) if predicate(items[i])]
+        self.__items = [items[i] for i in indices_to_keep]
+        self.__keys = [self.__keys[i] for i in indices_to_keep]
+        self.__start = 0
+
+    def __compact(self):
+        """
+        Releases the removed items if they occupy at least half of the buffer.
+        The lists are replaced rather than modified in place, such that ongoing iterations are not affected.
+        """
+        if self.__start == 0 or 2 * self.__start < len(self.__items):
+            return
+        self.__items = self.__items[self.__start:]
+        self.__keys = self.__keys[self.__start:]
+        self.__start = 0
+
+    def __get_actual_index(self, index: int):
+        """
+        Translates a position in the buffer into an index in the underlying lists.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("buffer index out of range")
+        return self.__start + index
@@ -0,0 +1,247 @@
+"""
+This file contains a sorted container supporting efficient insertions at arbitrary positions.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain, islice
+
+from misc import DefaultConfig
+
+
+class BlockedSortedList:
+    """
+    A sequence of items kept sorted in increasing order of their keys. Items with equal keys are kept in their
+    insertion order.
+    The items are stored in a list of blocks, each of which is a short sorted list. An insertion only shifts the
+    elements of a single block, as opposed to a plain sorted list in which an insertion shifts all subsequent elements.
+    A block exceeding twice the configured block size is split into two halves.
+    The keys of each block are stored in a parallel list, such that they are only calculated once, upon insertion.
+    """
+    def __init__(self, block_size: int = DefaultConfig.SORTED_STORAGE_BLOCK_SIZE):
+        self.__block_size = block_size
+        self.__key_blocks = []
+        self.__item_blocks = []
+        # the largest key of each block
+        self.__maxes = []
+        # the position of the first item of each block, or None if it has to be recalculated
+        self.__offsets = []
+        self.__length = 0
+
+    def __len__(self):
+        return self.__length
+
+    def __iter__(self):
+        return chain.from_iterable(self.__item_blocks)
+
+    def __getitem__(self, index):
+        """
+        Implements list-style "get item" semantics. A slice is returned as a new list.
+        """
+        if isinstance(index, slice):
+            return list(islice(self, *index.indices(self.__length)))
+        block_index, inner_index = self.__locate(index)
+        return self.__item_blocks[block_index][inner_index]
+
+    def __setitem__(self, index: int, item_and_key: tuple):
+        """
+        Replaces the item at the given position with the given (item, key) pair. The sorting order is the
+        responsibility of the caller.
+        """
+        block_index, inner_index = self.__locate(index)
+        item, key = item_and_key
+        self.__item_blocks[block_index][inner_index] = item
+        self.__key_blocks[block_index][inner_index] = key
+        self.__maxes[block_index] = self.__key_blocks[block_index][-1]
+
+    def __delitem__(self, index: int):
+        block_index, inner_index = self.__locate(index)
+        del self.__item_blocks[block_index][inner_index]
+        del self.__key_blocks[block_index][inner_index]
+        if len(self.__key_blocks[block_index]) == 0:
+            del self.__item_blocks[block_index]
+            del self.__key_blocks[block_index]
+            del self.__maxes[block_index]
+        else:
+            self.__maxes[block_index] = self.__key_blocks[block_index][-1]
+        self.__length -= 1
+        self.__offsets = None
+
+    def add(self, item, key):
+        """
+        Inserts the given item into its position according to the given key, after all items having an equal key.
+        """
+        if self.__length == 0 or key >= self.__maxes[-1]:
+            self.append(item, key)
+            return
+        block_index = bisect_right(self.__maxes, key)
+        keys, items = self.__key_blocks[block_index], self.__item_blocks[block_index]
+        inner_index = bisect_right(keys, key)
+        keys.insert(inner_index, key)
+        items.insert(inner_index, item)
+        self.__length += 1
+        self.__offsets = None
+        if len(keys) > 2 * self.__block_size:
+            self.__split(block_index)
+
+    def append(self, item, key):
+        """
+        Appends the given item to the end of the list. The key must not be smaller than any of the stored keys.
+        """
+        if self.__length == 0 or len(self.__key_blocks[-1]) >= self.__block_size:
+            if self.__offsets is not None:
+                self.__offsets.append(self.__length)
+            self.__key_blocks.append([key])
+            self.__item_blocks.append([item])
+            self.__maxes.append(key)
+        else:
+            self.__key_blocks[-1].append(key)
+            self.__item_blocks[-1].append(item)
+            self.__maxes[-1] = key
+        self.__length += 1
+
+    def bisect_left(self, key):
+        """
+        Returns the position of the first item whose key is not smaller than the given key.
+        """
+        block_index = bisect_left(self.__maxes, key)
+        if block_index == len(self.__maxes):
+            return self.__length
+        return self.__get_offsets()[block_index] + bisect_left(self.__key_blocks[block_index], key)
+
+    def bisect_right(self, key):
+        """
+        Returns the position of the first item whose key is greater than the given key.
+        """
+        block_index = bisect_right(self.__maxes, key)
+        if block_index == len(self.__maxes):
+            return self.__length
+        return self.__get_offsets()[block_index] + bisect_right(self.__key_blocks[block_index], key)
+
+    def get_range(self, start: int, end: int):
+        """
+        Returns a view of the items in the given range of positions. No items are copied.
+        """
+        return RangeView(self, [(start, end)])
+
+    def get_range_complement(self, start: int, end: int):
+        """
+        Returns a view of all the items outside the given range of positions. No items are copied.
+        """
+        return RangeView(self, [(0, start), (end, self.__length)])
+
+    def iterate_range(self, start: int, end: int):
+        """
+        Returns an iterator over the items in the given range of positions.
+        """
+        if start >= end:
+            return iter(())
+        block_index, inner_index = self.__locate(start)
+        count = end - start
+        first_block = self.__item_blocks[block_index]
+        if inner_index + count <= len(first_block):
+            return islice(first_block, inner_index, inner_index + count)
+        return islice(chain.from_iterable(islice(self.__item_blocks, block_index, None)), inner_index,
+                      inner_index + count)
+
+    def remove_first(self, count: int):
+        """
+        Removes the given number of items from the beginning of the list.
+        The blocks are replaced rather than modified in place, such that ongoing iterations are not affected.
+        """
+        if count <= 0:
+            return
+        if count >= self.__length:
+            self.clear()
+            return
+        block_index, inner_index = self.__locate(count)
+        self.__key_blocks = self.__key_blocks[block_index:]
+        self.__item_blocks = self.__item_blocks[block_index:]
+        self.__maxes = self.__maxes[block_index:]
+        if inner_index > 0:
+            self.__key_blocks[0] = self.__key_blocks[0][inner_index:]
+            self.__item_blocks[0] = self.__item_blocks[0][inner_index:]
+        self.__length -= count
+        self.__offsets = None
+
+    def filter(self, predicate: callable):
+        """
+        Removes all the items not satisfying the given predicate.
+        The blocks are replaced rather than modified in place, such that ongoing iterations are not affected.
+        """
+        new_key_blocks, new_item_blocks = [], []
+        for keys, items in zip(self.__key_blocks, self.__item_blocks):
+            indices_to_keep = [i for i, item in enumerate(items) if predicate(item)]
+            if len(indices_to_keep) == len(items):
+                new_key_blocks.append(keys)
+                new_item_blocks.append(items)
+            elif len(indices_to_keep) > 0:
+                new_key_blocks.append([keys[i] for i in indices_to_keep])
+                new_item_blocks.append([items[i] for i in indices_to_keep])
+        self.__key_blocks, self.__item_blocks = new_key_blocks, new_item_blocks
+        self.__maxes = [keys[-1] for keys in new_key_blocks]
+        self.__length = sum(map(len, new_key_blocks))
+        self.__offsets = None
+
+    def clear(self):
+        self.__key_blocks, self.__item_blocks, self.__maxes, self.__offsets = [], [], [], []
+        self.__length = 0
+
+    def __split(self, block_index: int):
+        """
+        Splits the given block into two halves.
+        """
+        keys, items = self.__key_blocks[block_index], self.__item_blocks[block_index]
+        half = len(keys) // 2
+        self.__key_blocks[block_index:block_index + 1] = [keys[:half], keys[half:]]
+        self.__item_blocks[block_index:block_index + 1] = [items[:half], items[half:]]
+        self.__maxes[block_index:block_index + 1] = [keys[half - 1], keys[-1]]
+
+    def __get_offsets(self):
+        """
+        Returns the positions of the first items of the blocks, recalculating them if necessary.
+        """
+        if self.__offsets is None:
+            self.__offsets = [0]
+            self.__offsets.extend(accumulate(map(len, self.__key_blocks[:-1])))
+        return self.__offsets
+
+    def __locate(self, index: int):
+        """
+        Translates a position in the list into a block index and a position inside this block.
+        """
+        if index < 0:
+            index += self.__length
+        if index < 0 or index >= self.__length:
+            raise IndexError("list index out of range")
+        offsets = self.__get_offsets()
+        block_index = bisect_right(offsets, index) - 1
+        return block_index, index - offsets[block_index]
+
+
+class RangeView:
+    """
+    A read-only view of one or more disjoint ranges of positions, given in increasing order, in a container providing
+    positional access and an iterate_range method (e.g., a BlockedSortedList).
+    The positions are only resolved upon access, hence a view should not be kept across modifications of the container.
+    """
+    def __init__(self, sorted_list, ranges: list):
+        self.__sorted_list = sorted_list
+        self.__ranges = [(start, end) for start, end in ranges if start < end]
+        self.__length = sum(end - start for start, end in self.__ranges)
+
+    def __len__(self):
+        return self.__length
+
+    def __iter__(self):
+        if len(self.__ranges) == 1:
+            return self.__sorted_list.iterate_range(*self.__ranges[0])
+        return chain.from_iterable(self.__sorted_list.iterate_range(start, end) for start, end in self.__ranges)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self.__length
+        if index < 0 or index >= self.__length:
+            raise IndexError("range index out of range")
+        for start, end in self.__ranges:
+            if index < end - start:
+                return self.__sorted_list[start + index]
+            index -= end - start
@@ -0,0 +1,337 @@
+"""
+This file contains a sorted container keeping the keys and the timestamps of its items in NumPy arrays.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain, islice
+
+from misc import DefaultConfig
+from misc.BlockedSortedList import RangeView
+
+try:
+    import numpy
+except ImportError:  # NumPy might not be installed
+    numpy = None
+
+
+class _ColumnarBlock:
+    """
+    A short run of items sorted by their keys. The keys and the timestamps of the items are stored in NumPy arrays
+    which may be longer than the list of the items, leaving room for insertions.
+    """
+    __slots__ = ("items", "keys", "timestamps")
+
+    def __init__(self, items: list, keys, timestamps):
+        self.items = items
+        self.keys = keys
+        self.timestamps = timestamps
+
+
+class ColumnarSortedList:
+    """
+    A sequence of items kept sorted in increasing order of their numeric keys, similarly to a BlockedSortedList.
+    The items are stored in a list of blocks, such that an insertion only shifts the elements of a single block. The
+    keys and the timestamps of each block are stored in contiguous NumPy arrays parallel to its list of items, such that
+    searches within a block are performed by numpy.searchsorted and the expired items are located by vectorized
+    comparisons of the timestamps.
+    Keys and timestamps are stored as 64-bit integers as long as all of them are integers, and as 64-bit floating point
+    numbers otherwise.
+    """
+    def __init__(self, block_size: int = DefaultConfig.SORTED_STORAGE_BLOCK_SIZE):
+        if numpy is None:
+            raise Exception("NumPy is required for the columnar sorted list")
+        self.__block_size = block_size
+        self.__blocks = []
+        # the largest key of each block
+        self.__maxes = []
+        # the position of the first item of each block, or None if it has to be recalculated
+        self.__offsets = []
+        self.__length = 0
+        # the types of the arrays, determined upon the first insertion
+        self.__key_type = None
+        self.__timestamp_type = None
+
+    def __len__(self):
+        return self.__length
+
+    def __iter__(self):
+        return chain.from_iterable(block.items for block in self.__blocks)
+
+    def __getitem__(self, index):
+        """
+        Implements list-style "get item" semantics. A slice is returned as a new list.
+        """
+        if isinstance(index, slice):
+            return list(islice(self, *index.indices(self.__length)))
+        block_index, inner_index = self.__locate(index)
+        return self.__blocks[block_index].items[inner_index]
+
+    def __setitem__(self, index: int, item_key_and_timestamp: tuple):
+        """
+        Replaces the item at the given position with the given (item, key, timestamp) triplet. The sorting order is
+        the responsibility of the caller.
+        """
+        item, key, timestamp = item_key_and_timestamp
+        self.__fit_types(key, timestamp)
+        block_index, inner_index = self.__locate(index)
+        block = self.__blocks[block_index]
+        block.items[inner_index] = item
+        block.keys[inner_index] = key
+        block.timestamps[inner_index] = timestamp
+        self.__maxes[block_index] = block.keys[len(block.items) - 1].item()
+
+    def __delitem__(self, index: int):
+        block_index, inner_index = self.__locate(index)
+        block = self.__blocks[block_index]
+        length = len(block.items)
+        if length == 1:
+            del self.__blocks[block_index]
+            del self.__maxes[block_index]
+        else:
+            del block.items[inner_index]
+            block.keys[inner_index:length - 1] = block.keys[inner_index + 1:length]
+            block.timestamps[inner_index:length - 1] = block.timestamps[inner_index + 1:length]
+            self.__maxes[block_index] = block.keys[length - 2].item()
+        self.__length -= 1
+        self.__offsets = None
+
+    def add(self, item, key: int or float, timestamp: int or float):
+        """
+        Inserts the given item into its position according to the given key, after all items having an equal key.
+        """
+        if self.__length == 0 or key >= self.__maxes[-1]:
+            self.append(item, key, timestamp)
+            return
+        self.__fit_types(key, timestamp)
+        block_index = bisect_right(self.__maxes, key)
+        block = self.__blocks[block_index]
+        length = len(block.items)
+        inner_index = int(numpy.searchsorted(block.keys[:length], key, side="right"))
+        block.items.insert(inner_index, item)
+        self.__insert_values(block, inner_index, length, key, timestamp)
+        self.__length += 1
+        self.__offsets = None
+        if length + 1 > 2 * self.__block_size:
+            self.__split(block_index)
+
+    def append(self, item, key: int or float, timestamp: int or float):
+        """
+        Appends the given item to the end of the list. The key must not be smaller than any of the stored keys.
+        """
+        self.__fit_types(key, timestamp)
+        if self.__length == 0 or len(self.__blocks[-1].items) >= self.__block_size:
+            if self.__offsets is not None:
+                self.__offsets.append(self.__length)
+            capacity = DefaultConfig.COLUMNAR_STORAGE_INITIAL_CAPACITY
+            block = _ColumnarBlock([], numpy.empty(capacity, dtype=self.__key_type),
+                                   numpy.empty(capacity, dtype=self.__timestamp_type))
+            self.__blocks.append(block)
+            self.__maxes.append(key)
+        else:
+            block = self.__blocks[-1]
+            self.__maxes[-1] = key
+        length = len(block.items)
+        block.items.append(item)
+        self.__insert_values(block, length, length, key, timestamp)
+        self.__length += 1
+
+    def bisect_left(self, key: int or float):
+        """
+        Returns the position of the first item whose key is not smaller than the given key.
+        """
+        block_index = bisect_left(self.__maxes, key)
+        if block_index == len(self.__maxes):
+            return self.__length
+        block = self.__blocks[block_index]
+        return self.__get_offsets()[block_index] + \
+            int(numpy.searchsorted(block.keys[:len(block.items)], key, side="left"))
+
+    def bisect_right(self, key: int or float):
+        """
+        Returns the position of the first item whose key is greater than the given key.
+        """
+        block_index = bisect_right(self.__maxes, key)
+        if block_index == len(self.__maxes):
+            return self.__length
+        block = self.__blocks[block_index]
+        return self.__get_offsets()[block_index] + \
+            int(numpy.searchsorted(block.keys[:len(block.items)], key, side="right"))
+
+    def bisect_timestamp_left(self, timestamp: int or float):
+        """
+        Returns the position of the first item whose timestamp is not smaller than the given timestamp, assuming the
+        timestamps to be sorted as well (e.g., if the items are sorted by their timestamps).
+        """
+        position = 0
+        for block in self.__blocks:
+            length = len(block.items)
+            if block.timestamps[length - 1] >= timestamp:
+                return position + int(numpy.searchsorted(block.timestamps[:length], timestamp, side="left"))
+            position += length
+        return position
+
+    def get_range(self, start: int, end: int):
+        """
+        Returns a view of the items in the given range of positions. No items are copied.
+        """
+        return RangeView(self, [(start, end)])
+
+    def get_range_complement(self, start: int, end: int):
+        """
+        Returns a view of all the items outside the given range of positions. No items are copied.
+        """
+        return RangeView(self, [(0, start), (end, self.__length)])
+
+    def iterate_range(self, start: int, end: int):
+        """
+        Returns an iterator over the items in the given range of positions.
+        """
+        if start >= end:
+            return iter(())
+        block_index, inner_index = self.__locate(start)
+        count = end - start
+        first_block = self.__blocks[block_index].items
+        if inner_index + count <= len(first_block):
+            return islice(first_block, inner_index, inner_index + count)
+        return islice(chain.from_iterable(block.items for block in islice(self.__blocks, block_index, None)),
+                      inner_index, inner_index + count)
+
+    def remove_first(self, count: int):
+        """
+        Removes the given number of items from the beginning of the list.
+        The blocks are replaced rather than modified in place, such that ongoing iterations are not affected.
+        """
+        if count <= 0:
+            return
+        if count >= self.__length:
+            self.clear()
+            return
+        block_index, inner_index = self.__locate(count)
+        self.__blocks = self.__blocks[block_index:]
+        self.__maxes = self.__maxes[block_index:]
+        if inner_index > 0:
+            block = self.__blocks[0]
+            length = len(block.items)
+            self.__blocks[0] = _ColumnarBlock(block.items[inner_index:], block.keys[inner_index:length].copy(),
+                                              block.timestamps[inner_index:length].copy())
+        self.__length -= count
+        self.__offsets = None
+
+    def remove_expired(self, earliest_timestamp: int or float):
+        """
+        Removes all the items whose timestamps are smaller than the given timestamp.
+        The blocks are replaced rather than modified in place, such that ongoing iterations are not affected.
+        """
+        self.__retain(lambda block, length: block.timestamps[:length] >= earliest_timestamp)
+
+    def filter(self, predicate: callable):
+        """
+        Removes all the items not satisfying the given predicate.
+        The blocks are replaced rather than modified in place, such that ongoing iterations are not affected.
+        """
+        self.__retain(lambda block, length: numpy.fromiter(map(predicate, block.items), dtype=bool, count=length))
+
+    def clear(self):
+        self.__blocks, self.__maxes, self.__offsets = [], [], []
+        self.__length = 0
+
+    def __retain(self, get_mask: callable):
+        """
+        Keeps only the items selected by the Boolean masks calculated for each block by the given function.
+        """
+        new_blocks = []
+        for block in self.__blocks:
+            length = len(block.items)
+            mask = get_mask(block, length)
+            if mask.all():
+                new_blocks.append(block)
+                continue
+            indices_to_keep = numpy.flatnonzero(mask)
+            if len(indices_to_keep) == 0:
+                continue
+            items = block.items
+            new_blocks.append(_ColumnarBlock([items[i] for i in indices_to_keep.tolist()],
+                                             block.keys[indices_to_keep], block.timestamps[indices_to_keep]))
+        self.__blocks = new_blocks
+        self.__maxes = [block.keys[len(block.items) - 1].item() for block in new_blocks]
+        self.__length = sum(len(block.items) for block in new_blocks)
+        self.__offsets = None
+
+    def __insert_values(self, block: _ColumnarBlock, index: int, length: int, key, timestamp):
+        """
+        Inserts the given key and timestamp at the given position of the arrays of the given block, whose first
+        length entries are in use, shifting the subsequent entries and doubling the capacity of the arrays if necessary.
+        """
+        if length == len(block.keys):
+            new_keys = numpy.empty(2 * length, dtype=self.__key_type)
+            new_keys[:length] = block.keys
+            new_timestamps = numpy.empty(2 * length, dtype=self.__timestamp_type)
+            new_timestamps[:length] = block.timestamps
+            block.keys, block.timestamps = new_keys, new_timestamps
+        keys, timestamps = block.keys, block.timestamps
+        if index < length:
+            keys[index + 1:length + 1] = keys[index:length]
+            timestamps[index + 1:length + 1] = timestamps[index:length]
+        keys[index] = key
+        timestamps[index] = timestamp
+
+    def __split(self, block_index: int):
+        """
+        Splits the given block into two halves.
+        """
+        block = self.__blocks[block_index]
+        length = len(block.items)
+        half = length // 2
+        first_block = _ColumnarBlock(block.items[:half], block.keys[:half].copy(), block.timestamps[:half].copy())
+        second_block = _ColumnarBlock(block.items[half:], block.keys[half:length].copy(),
+                                      block.timestamps[half:length].copy())
+        self.__blocks[block_index:block_index + 1] = [first_block, second_block]
+        self.__maxes[block_index:block_index + 1] = [first_block.keys[half - 1].item(),
+                                                     second_block.keys[length - half - 1].item()]
+
+    def __fit_types(self, key, timestamp):
+        """
+        Determines the types of the arrays upon the first insertion, and converts the arrays of integers into arrays
+        of floating point numbers once a non-integer value is encountered.
+        """
+        key_type, timestamp_type = ColumnarSortedList.__get_type(key), ColumnarSortedList.__get_type(timestamp)
+        if self.__key_type is None:
+            self.__key_type, self.__timestamp_type = key_type, timestamp_type
+            return
+        if self.__key_type == numpy.int64 and key_type == numpy.float64:
+            self.__key_type = numpy.float64
+            for block in self.__blocks:
+                block.keys = block.keys.astype(numpy.float64)
+        if self.__timestamp_type == numpy.int64 and timestamp_type == numpy.float64:
+            self.__timestamp_type = numpy.float64
+            for block in self.__blocks:
+                block.timestamps = block.timestamps.astype(numpy.float64)
+
+    @staticmethod
+    def __get_type(value: int or float):
+        """
+        Returns the type of the array fitting the given value.
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise Exception("The columnar sorted list only supports numeric keys and timestamps")
+        return numpy.int64 if isinstance(value, int) else numpy.float64
+
+    def __get_offsets(self):
+        """
+        Returns the positions of the first items of the blocks, recalculating them if necessary.
+        """
+        if self.__offsets is None:
+            self.__offsets = [0]
+            self.__offsets.extend(accumulate(len(block.items) for block in self.__blocks[:-1]))
+        return self.__offsets
+
+    def __locate(self, index: int):
+        """
+        Translates a position in the list into a block index and a position inside this block.
+        """
+        if index < 0:
+            index += self.__length
+        if index < 0 or index >= self.__length:
+            raise IndexError("list index out of range")
+        offsets = self.__get_offsets()
+        block_index = bisect_right(offsets, index) - 1
+        return block_index, index - offsets[block_index]
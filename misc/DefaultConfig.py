@@ -5,9 +5,12 @@ Each of the values below can be overridden by providing a different value in CEP
 from datetime import timedelta
 from evaluation.EvaluationMechanismTypes import EvaluationMechanismTypes
 from misc.SelectionStrategies import SelectionStrategies
+from misc.TimestampUnits import TimestampUnits
 from adaptive.statistics.StatisticsTypes import StatisticsTypes
 from adaptive.optimizer.OptimizerTypes import OptimizerTypes
 from tree.evaluation.TreeEvaluationMechanismUpdateTypes import TreeEvaluationMechanismUpdateTypes
+from tree.CleanUpPolicies import CleanUpPolicies
+from tree.LoadSheddingPolicies import LoadSheddingPolicies
 from parallel.ParallelExecutionModes import *
 from parallel.ParallelExecutionPlatforms import ParallelExecutionPlatforms
 from plan.IterativeImprovement import IterativeImprovementType, IterativeImprovementInitType
@@ -19,6 +22,8 @@ from plan.multi.MultiPatternTreePlanMergeApproaches import MultiPatternTreePlanM
 
 # general settings
 DEFAULT_EVALUATION_MECHANISM_TYPE = EvaluationMechanismTypes.TREE_BASED
+DEFAULT_TIMESTAMP_UNIT = TimestampUnits.DATETIME  # must match the timestamp unit of the data formatter
+TIMESTAMP_CACHE_SIZE = 4096  # the maximal number of decoded timestamps memoized by a data formatter
 
 # plan generation-related defaults
 DEFAULT_TREE_PLAN_BUILDER = TreePlanBuilderTypes.TRIVIAL_LEFT_DEEP_TREE
@@ -32,7 +37,48 @@ SECONDARY_SELECTION_STRATEGY = SelectionStrategies.MATCH_SINGLE
 # tree storage settings
 SHOULD_SORT_STORAGE = False
 CLEANUP_INTERVAL = 10  # the default number of pattern match additions between subsequent storage cleanups
+CLEANUP_POLICY = CleanUpPolicies.FIXED_INTERVAL
+CLEANUP_EXPIRED_FRACTION = 0.25  # the estimated fraction of expired matches triggering an adaptive storage cleanup
 PRIORITIZE_SORTING_BY_TIMESTAMP = True
+SORTED_STORAGE_BLOCK_SIZE = 512  # the typical number of pattern matches in a single block of a sorted storage
+EAGER_ARRIVAL_ORDERED_STORAGE_CLEANUP = True  # if enabled, the leaves remove expired matches upon every insertion
+USE_COLUMNAR_STORAGE = False  # if enabled and NumPy is installed, sorted storages keep their keys in NumPy arrays
+COLUMNAR_STORAGE_INITIAL_CAPACITY = 64  # the initial length of the arrays of a block of a columnar storage
+
+# load shedding settings
+MAX_PARTIAL_MATCHES_PER_NODE = None  # the maximal number of partial matches stored by a node or None for no limit
+LOAD_SHEDDING_POLICY = LoadSheddingPolicies.DROP_OLDEST
+LOAD_SHEDDING_BATCH_FRACTION = 0.1  # the fraction of the budget of a node to be freed at once when it is exhausted
+
+# join condition evaluation settings - if enabled and NumPy is installed, the numeric relation conditions of a binary
+# node are evaluated on all candidate partial matches at once, provided that there are enough candidates
+ENABLE_BATCH_CONDITION_EVALUATION = True
+BATCH_CONDITION_EVALUATION_MIN_CANDIDATES = 16
+
+# condition evaluation settings
+COMPILE_CONDITIONS = True  # if disabled, the node conditions are evaluated by the interpreter (e.g., for debugging)
+# the number of evaluations between subsequent reorderings of the conditions of a node by their observed cost and
+# selectivity, or None to keep the declaration order - reordered conditions are evaluated by the interpreter
+CONDITION_REORDERING_INTERVAL = None
+# the evaluation cost of the conditions is only timed once in this number of evaluations of a reordered condition
+CONDITION_REORDERING_TIMING_INTERVAL = 10
+# if enabled, the attribute values extracted by condition variables are memoized per event (see AttributeCache) -
+# the interpreted conditions (see COMPILE_CONDITIONS and CONDITION_REORDERING_INTERVAL) do not use the cache
+ENABLE_ATTRIBUTE_CACHE = False
+COLLECT_ATTRIBUTE_CACHE_STATISTICS = False  # if enabled, the hits and misses of the attribute cache are counted
+
+# input stream settings
+FILE_INPUT_STREAM_CHUNK_SIZE = 1000  # the number of lines read at once from an input file
+
+# output stream settings - a buffered output file is flushed as soon as any of the enabled (non-None) limits is reached
+FILE_OUTPUT_STREAM_FLUSH_ITEM_COUNT = 1000  # the number of buffered items triggering a flush
+FILE_OUTPUT_STREAM_FLUSH_BYTE_COUNT = 1 << 20  # the total size of the buffered items triggering a flush
+FILE_OUTPUT_STREAM_FLUSH_INTERVAL = timedelta(seconds=1)  # the maximal time between subsequent flushes
+FILE_OUTPUT_STREAM_MAX_PENDING_FLUSHES = 16  # the number of flushed chunks the background writer may lag behind
+FILE_OUTPUT_STREAM_WRITER_POLL_INTERVAL = 0.1  # the time in seconds between checks for a failure of the writer
+
+# if enabled, only the event attributes referenced by the patterns are parsed (see DataFormatter.set_projection)
+ENABLE_ATTRIBUTE_PROJECTION = False
 
 # iterative improvement defaults
 ITERATIVE_IMPROVEMENT_TYPE = IterativeImprovementType.SWAP_BASED
@@ -70,4 +116,5 @@ DEVIATION_OPTIMIZER_THRESHOLD = 0.5  # the default threshold for statistics chan
 DEFAULT_TREE_UPDATE_TYPE = TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION
 DEFAULT_STATISTICS_TYPE = [StatisticsTypes.ARRIVAL_RATES, StatisticsTypes.SELECTIVITY_MATRIX]  # the default statistics type can also be a list of types
 STATISTICS_TIME_WINDOW = timedelta(hours=1)  # Time window for statistics
+SELECTIVITY_STATISTICS_SAMPLING_INTERVAL = 1  # only every N-th evaluation of an atomic condition updates the selectivity statistics (1 disables sampling)
 STATISTICS_UPDATES_WAIT_TIME = None  # the default wait time between statistics updates or None to disable adaptivity
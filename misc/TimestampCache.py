@@ -0,0 +1,43 @@
+"""
+This file contains a memoization layer for decoding event timestamps.
+"""
+from functools import lru_cache
+
+from misc import DefaultConfig
+
+
+class TimestampCache:
+    """
+    A bounded least-recently-used cache of decoded timestamps, keyed by their raw (undecoded) representation.
+    In many datasets a large number of consecutive events share the same raw timestamp (e.g., minute-resolution stock
+    data), such that caching the decoded timestamps saves most of the decoding effort.
+    The given decoding function must be deterministic and its argument must be hashable.
+    """
+    def __init__(self, decode_function: callable, max_size: int = DefaultConfig.TIMESTAMP_CACHE_SIZE):
+        self.__cached_decode_function = lru_cache(maxsize=max_size)(decode_function)
+
+    def get(self, raw_timestamp):
+        """
+        Returns the decoded timestamp, decoding it only if it is not already cached.
+        """
+        return self.__cached_decode_function(raw_timestamp)
+
+    def get_hits(self):
+        return self.__cached_decode_function.cache_info().hits
+
+    def get_misses(self):
+        return self.__cached_decode_function.cache_info().misses
+
+    def get_hit_rate(self):
+        """
+        Returns the fraction of the lookups served from the cache, or None if no lookups were made yet.
+        """
+        cache_info = self.__cached_decode_function.cache_info()
+        lookups = cache_info.hits + cache_info.misses
+        return cache_info.hits / lookups if lookups > 0 else None
+
+    def clear(self):
+        """
+        Removes all cached timestamps and resets the counters.
+        """
+        self.__cached_decode_function.cache_clear()
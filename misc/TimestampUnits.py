@@ -0,0 +1,55 @@
+"""
+This file contains the supported representations of event timestamps and the conversions between them.
+"""
+from calendar import timegm
+from datetime import datetime, timedelta
+from enum import Enum
+
+# the reference point of the integer timestamps
+EPOCH = datetime(1970, 1, 1)
+
+
+class TimestampUnits(Enum):
+    """
+    The supported representations of event timestamps.
+    By default, timestamps are datetime objects and time windows are timedelta objects. Alternatively, timestamps can
+    be given as integers counting the time units elapsed since the epoch, which are much cheaper to create, compare
+    and subtract. In this case, the time windows are converted into integers of the same unit once, when the evaluation
+    mechanism is created.
+    The value of each integer unit is the number of its occurrences in a second.
+    """
+    DATETIME = 0
+    SECONDS = 1
+    MILLISECONDS = 10 ** 3
+    MICROSECONDS = 10 ** 6
+    NANOSECONDS = 10 ** 9
+
+
+def convert_time_window(time_window: timedelta, timestamp_unit: TimestampUnits):
+    """
+    Converts the given time window into the given timestamp representation. None is returned as is.
+    """
+    if time_window is None or timestamp_unit == TimestampUnits.DATETIME:
+        return time_window
+    units_per_second = timestamp_unit.value
+    return (time_window.days * 86400 + time_window.seconds) * units_per_second + \
+        time_window.microseconds * units_per_second // 10 ** 6
+
+
+def convert_timestamp(timestamp: datetime, timestamp_unit: TimestampUnits):
+    """
+    Converts the given datetime object into the given timestamp representation.
+    """
+    if timestamp_unit == TimestampUnits.DATETIME:
+        return timestamp
+    return convert_time_window(timestamp - EPOCH, timestamp_unit)
+
+
+def convert_time_fields(time_fields: tuple, timestamp_unit: TimestampUnits):
+    """
+    Converts the given fields of a timestamp (year, month, day, hour, minute, second) into the given timestamp
+    representation. An integer timestamp is calculated directly from the fields, without creating a datetime object.
+    """
+    if timestamp_unit == TimestampUnits.DATETIME:
+        return datetime(*time_fields)
+    return timegm(time_fields) * timestamp_unit.value
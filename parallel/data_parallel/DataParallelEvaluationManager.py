@@ -32,5 +32,8 @@ class DataParallelEvaluationManager(ParallelEvaluationManager, ABC):
     def get_pattern_match_stream(self):
         return self.__pattern_matches
 
+    def get_required_attribute_names(self):
+        return self.__algorithm.get_required_attribute_names()
+
     def get_structure_summary(self):
         return self.__algorithm.get_structure_summary()
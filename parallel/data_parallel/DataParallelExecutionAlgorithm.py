@@ -6,7 +6,7 @@ from base.PatternMatch import *
 from parallel.platform.ParallelExecutionPlatform import ParallelExecutionPlatform, Lock
 from stream.Stream import *
 from parallel.manager.EvaluationManager import EvaluationManager
-from parallel.manager.SequentialEvaluationManager import SequentialEvaluationManager
+from parallel.manager.SequentialEvaluationManager import SequentialEvaluationManager, get_required_attribute_names
 from typing import Set, Callable
 
 
@@ -23,6 +23,10 @@ class DataParallelExecutionAlgorithm(ABC):
         self.evaluation_managers = [SequentialEvaluationManager(patterns, eval_mechanism_params)
                                     for _ in range(self.units_number)]
         self.match_lock = platform.create_lock()
+        # the event types appearing in at least one pattern - the events of all other types can be safely discarded
+        patterns = patterns if isinstance(patterns, list) else [patterns]
+        self.event_types = set().union(*[pattern.get_all_event_types() for pattern in patterns])
+        self.patterns = patterns
 
     def eval(self, events: InputStream, matches: OutputStream, data_formatter: DataFormatter):
         """
@@ -44,6 +48,11 @@ class DataParallelExecutionAlgorithm(ABC):
 
         # iterate over all events
         for raw_event in events:
+            peeked_event_type = data_formatter.peek_event_type(raw_event)
+            if peeked_event_type is not None and peeked_event_type not in self.event_types:
+                # the event is irrelevant - no need to parse it
+                Event.skip()
+                continue
             event = Event(raw_event, data_formatter)
             for unit_id in self._classifier(event):
                 execution_units[unit_id].add_event(raw_event)
@@ -67,6 +76,22 @@ class DataParallelExecutionAlgorithm(ABC):
         """
         raise NotImplementedError()
 
+    def get_required_attribute_names(self):
+        """
+        Returns the names of the event attributes required for both the pattern detection and the event
+        classification, or None if they cannot be determined.
+        """
+        attribute_names = get_required_attribute_names(self.patterns)
+        if attribute_names is None:
+            return None
+        return attribute_names | self._get_classification_attribute_names()
+
+    def _get_classification_attribute_names(self) -> Set[str]:
+        """
+        Returns the names of the event attributes used by the classifier.
+        """
+        return set()
+
     def get_structure_summary(self):
         return tuple(map(lambda em: em.get_structure_summary(), self.evaluation_managers))
 
@@ -75,7 +100,8 @@ class DataParallelExecutionAlgorithm(ABC):
         A wrap for single unit that has input stream and an execution unit.
         """
         def __init__(self, platform, unit_id, evaluation_manager, matches, data_formatter):
-            self.events = Stream()
+            # the events are handed off to another execution unit, hence a thread-safe stream is required
+            self.events = ThreadSafeStream()
             self.execution_unit = platform.create_parallel_execution_unit(unit_id,
                                                                           self._run,
                                                                           evaluation_manager,
@@ -3,6 +3,7 @@ from base.Pattern import Pattern
 from evaluation.EvaluationMechanismFactory import EvaluationMechanismParameters
 from base.PatternMatch import *
 from parallel.platform.ParallelExecutionPlatform import ParallelExecutionPlatform
+from condition.Expression import get_partitioning_attribute_names
 from misc.Utils import is_int, is_float
 from typing import Set
 
@@ -16,6 +17,9 @@ class GroupByKeyParallelExecutionAlgorithm(DataParallelExecutionAlgorithm):
 
     All patterns must include == comparison between all attributes with the given "key" argument,
     to enforce matches on the same unit id.
+    If no key is given, it is selected among the attributes which the expression-based equality conditions of every
+    pattern require to be equal in all of its events.
+    Non-numeric key values are assigned to the units by their hash values.
 
     units_number - Indicate the number of units/threads to run, doesn't include the "main execution unit".
     """
@@ -26,7 +30,7 @@ class GroupByKeyParallelExecutionAlgorithm(DataParallelExecutionAlgorithm):
                  platform: ParallelExecutionPlatform,
                  key: str):
         super().__init__(units_number, patterns, eval_mechanism_params, platform)
-        self._key = key
+        self._key = key if key is not None else self.__select_key(self.patterns)
 
     def _classifier(self, event: Event) -> Set[int]:
         """
@@ -34,9 +38,31 @@ class GroupByKeyParallelExecutionAlgorithm(DataParallelExecutionAlgorithm):
         This will server later as the execution units.
         """
         value = event.payload.get(self._key)
-        if value is not None and (is_int(value) or is_float(value)):
+        if value is None:
+            return set()
+        if is_int(value) or is_float(value):
             return {int(value) % self.units_number}
-        return set()
+        return {hash(value) % self.units_number}
+
+    @staticmethod
+    def __select_key(patterns: List[Pattern]):
+        """
+        Returns an attribute which the equality conditions of each of the given patterns require to be equal in all of
+        its events, such that each match is detected by a single unit.
+        """
+        candidate_keys = None
+        for pattern in patterns:
+            event_names = [event.name for event in pattern.get_primitive_events()]
+            pattern_keys = get_partitioning_attribute_names(pattern.condition, event_names)
+            candidate_keys = pattern_keys if candidate_keys is None else candidate_keys & pattern_keys
+        if not candidate_keys:
+            raise Exception("No attribute is required to be equal in all the events of the patterns, "
+                            "a key must be provided")
+        # the selection must not depend on the iteration order of the set
+        return min(candidate_keys)
+
+    def _get_classification_attribute_names(self):
+        return {self._key}
 
     def _create_skip_item(self, unit_id: int):
         """
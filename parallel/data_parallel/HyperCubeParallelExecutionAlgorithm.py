@@ -76,6 +76,9 @@ class HyperCubeParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
             return units
         return set(range(self._cube.size))  # return all possible units
 
+    def _get_classification_attribute_names(self):
+        return {attribute for attributes in self._attributes_dict.values() for attribute, _ in attributes}
+
     @staticmethod
     def _calc_cubic_shares(units_number, dims) -> Tuple[Tuple[int], int]:
         """
@@ -1,6 +1,8 @@
 from abc import ABC
 from parallel.data_parallel.DataParallelExecutionAlgorithm import DataParallelExecutionAlgorithm
 from base.Pattern import Pattern
+from misc import DefaultConfig
+from misc.TimestampUnits import convert_time_window
 from evaluation.EvaluationMechanismFactory import EvaluationMechanismParameters
 from base.PatternMatch import *
 from typing import Set
@@ -24,6 +26,9 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
             self._time_delta = max(pattern.window for pattern in patterns)
         else:
             self._time_delta = patterns.window
+        timestamp_unit = DefaultConfig.DEFAULT_TIMESTAMP_UNIT if eval_mechanism_params is None \
+            else eval_mechanism_params.timestamp_unit
+        self._time_delta = convert_time_window(self._time_delta, timestamp_unit)
 
         self._interval = self._time_delta * multiple
 
@@ -26,6 +26,12 @@ class EvaluationManager(ABC):
         """
         raise NotImplementedError()
 
+    def get_required_attribute_names(self):
+        """
+        Returns the names of the event attributes required for the evaluation, or None if they cannot be determined.
+        """
+        raise NotImplementedError()
+
     def get_structure_summary(self):
         """
         Returns a string containing a short description of the underlying evaluation mechanism structure
@@ -13,6 +13,20 @@ from base.DataFormatter import DataFormatter
 from typing import List
 
 
+def get_required_attribute_names(patterns: List[Pattern]):
+    """
+    Returns the names of the event attributes required for detecting all the given patterns, or None if they cannot
+    be determined.
+    """
+    attribute_names = set()
+    for pattern in patterns:
+        pattern_attribute_names = pattern.get_attribute_names()
+        if pattern_attribute_names is None:
+            return None
+        attribute_names |= pattern_attribute_names
+    return attribute_names
+
+
 class SequentialEvaluationManager(EvaluationManager):
     """
     A trivial implementation of an evaluation manager with no parallelization capabilities.
@@ -23,6 +37,7 @@ class SequentialEvaluationManager(EvaluationManager):
             patterns = [patterns]
         self.__eval_mechanism = EvaluationMechanismFactory.build_eval_mechanism(eval_mechanism_params, patterns)
         self.__pattern_matches = None
+        self.__patterns = patterns
 
     def eval(self, event_stream: InputStream, pattern_matches: OutputStream, data_formatter: DataFormatter):
         self.__pattern_matches = pattern_matches
@@ -31,5 +46,8 @@ class SequentialEvaluationManager(EvaluationManager):
     def get_pattern_match_stream(self):
         return self.__pattern_matches
 
+    def get_required_attribute_names(self):
+        return get_required_attribute_names(self.__patterns)
+
     def get_structure_summary(self):
         return self.__eval_mechanism.get_structure_summary()
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 import random
 
 from base.DataFormatter import DataFormatter, EventTypeClassifier
+from misc.TimestampUnits import TimestampUnits
 from misc.Utils import str_to_number
 
 SENSORS_TIMESTAMP_KEY = "TimeStamp"
@@ -52,25 +53,63 @@ class SensorsDataFormatter(DataFormatter):
     format.
     """
 
-    def __init__(self, event_type_classifier: EventTypeClassifier = SensorsEventTypeClassifier()):
-        super().__init__(event_type_classifier)
+    def __init__(self, event_type_classifier: EventTypeClassifier = SensorsEventTypeClassifier(),
+                 timestamp_unit: TimestampUnits = TimestampUnits.DATETIME):
+        super().__init__(event_type_classifier, timestamp_unit)
+        # the event type can only be deduced from the raw string if it is the sensor type
+        self.__can_peek_event_type = isinstance(event_type_classifier, SensorsEventTypeClassifier)
+        # maps each sensor type to the indices of its attributes to be parsed, or None if all attributes are parsed
+        self.__projected_indices = None
+        self.__timestamp_cache = self._create_timestamp_cache(self.__decode_timestamp)
 
     def parse_event(self, raw_data: str):
         """
         Parses a Sensors formatted string into an event.
         """
         event_attributes = raw_data.replace("\n", "").split(",")
+        if self.__projected_indices is not None:
+            keys = SENSORS_KEYS_DICT[event_attributes[0]]
+            return {keys[i]: str_to_number(event_attributes[i]) for i in self.__projected_indices[event_attributes[0]]}
         return dict(zip(
             SENSORS_KEYS_DICT[event_attributes[0]],
             map(str_to_number, event_attributes)
         ))
 
+    def set_projection(self, attribute_names: set):
+        """
+        The projection is only applied if the event type is the sensor type, as otherwise it might depend on any
+        attribute.
+        """
+        if attribute_names is None or not self.__can_peek_event_type:
+            self.__projected_indices = None
+            return
+        required_keys = attribute_names | {SENSORS_TYPE_KEY, SENSORS_TIMESTAMP_KEY}
+        self.__projected_indices = {sensor_type: [i for i, key in enumerate(keys) if key in required_keys]
+                                    for sensor_type, keys in SENSORS_KEYS_DICT.items()}
+
+    def peek_event_type(self, raw_data: str):
+        """
+        Extracts the sensor type, which is the first attribute in Sensors format.
+        """
+        if not self.__can_peek_event_type:
+            return None
+        return raw_data[:raw_data.find(",")]
+
     def get_event_timestamp(self, event_payload: dict):
         """
         The event timestamp is represented in sensors using a "%m/%d/%Y %H:%M:%S" format.
         """
-        timestamp_str = event_payload[SENSORS_TIMESTAMP_KEY]
-        return datetime.strptime(timestamp_str, "%m/%d/%Y %H:%M:%S")
+        return self.__timestamp_cache.get(event_payload[SENSORS_TIMESTAMP_KEY])
+
+    @staticmethod
+    def __decode_timestamp(timestamp_str: str):
+        """
+        Decodes a "%m/%d/%Y %H:%M:%S" timestamp into its fields.
+        """
+        date_str, time_str = timestamp_str.split(" ")
+        month, day, year = date_str.split("/")
+        hour, minute, second = time_str.split(":")
+        return int(year), int(month), int(day), int(hour), int(minute), int(second)
 
 
 def random_str(lowest, highest):
@@ -1,7 +1,7 @@
-from datetime import datetime
 from typing import Any, Dict, Optional
 
 from base.DataFormatter import DataFormatter, EventTypeClassifier
+from misc.TimestampUnits import TimestampUnits
 from misc.Utils import str_to_number
 
 METASTOCK_STOCK_TICKER_KEY = "Stock Ticker"
@@ -19,6 +19,11 @@ METASTOCK_7_COLUMN_KEYS = [
 
 ADDITIONAL_OPTIONAL_KEYS = [PROBABILITY_KEY]
 
+METASTOCK_ALL_KEYS = METASTOCK_7_COLUMN_KEYS + ADDITIONAL_OPTIONAL_KEYS
+
+# the attributes required for deducing the event type, timestamp and probability
+METASTOCK_MANDATORY_KEYS = {METASTOCK_STOCK_TICKER_KEY, METASTOCK_EVENT_TIMESTAMP_KEY, PROBABILITY_KEY}
+
 
 class MetastockByTickerEventTypeClassifier(EventTypeClassifier):
     """
@@ -36,26 +41,61 @@ class MetastockDataFormatter(DataFormatter):
     A data formatter implementation for a stock event stream, where each event is given as a string in metastock 7
     format.
     """
-    def __init__(self, event_type_classifier: EventTypeClassifier = MetastockByTickerEventTypeClassifier()):
-        super().__init__(event_type_classifier)
+    def __init__(self, event_type_classifier: EventTypeClassifier = MetastockByTickerEventTypeClassifier(),
+                 timestamp_unit: TimestampUnits = TimestampUnits.DATETIME):
+        super().__init__(event_type_classifier, timestamp_unit)
+        # the event type can only be deduced from the raw string if it is the stock ticker
+        self.__can_peek_event_type = isinstance(event_type_classifier, MetastockByTickerEventTypeClassifier)
+        # the indices of the attributes to be parsed or None if all attributes are to be parsed
+        self.__projected_indices = None
+        self.__timestamp_cache = self._create_timestamp_cache(self.__decode_timestamp)
 
     def parse_event(self, raw_data: str):
         """
         Parses a metastock 7 formatted string into an event.
         """
         event_attributes = raw_data.replace("\n", "").split(",")
+        if self.__projected_indices is not None:
+            return {METASTOCK_ALL_KEYS[i]: str_to_number(event_attributes[i])
+                    for i in self.__projected_indices if i < len(event_attributes)}
         return dict(zip(
-            METASTOCK_7_COLUMN_KEYS + ADDITIONAL_OPTIONAL_KEYS,
+            METASTOCK_ALL_KEYS,
             map(str_to_number, event_attributes)
         ))
 
+    def set_projection(self, attribute_names: set):
+        """
+        The projection is only applied if the event type is the stock ticker, as otherwise it might depend on any
+        attribute.
+        """
+        if attribute_names is None or not self.__can_peek_event_type:
+            self.__projected_indices = None
+            return
+        required_keys = attribute_names | METASTOCK_MANDATORY_KEYS
+        self.__projected_indices = [i for i, key in enumerate(METASTOCK_ALL_KEYS) if key in required_keys]
+
+    def peek_event_type(self, raw_data: str):
+        """
+        Extracts the stock ticker, which is the first attribute in metastock 7 format.
+        """
+        if not self.__can_peek_event_type:
+            return None
+        return str_to_number(raw_data[:raw_data.find(",")])
+
     def get_event_timestamp(self, event_payload: dict):
         """
         The event timestamp is represented in metastock 7 using a YYYYMMDDhhmm format.
         """
-        timestamp_str = str(event_payload[METASTOCK_EVENT_TIMESTAMP_KEY])
-        return datetime(year=int(timestamp_str[0:4]), month=int(timestamp_str[4:6]), day=int(timestamp_str[6:8]),
-                        hour=int(timestamp_str[8:10]), minute=int(timestamp_str[10:12]))
+        return self.__timestamp_cache.get(event_payload[METASTOCK_EVENT_TIMESTAMP_KEY])
+
+    @staticmethod
+    def __decode_timestamp(raw_timestamp):
+        """
+        Decodes a YYYYMMDDhhmm timestamp into its fields.
+        """
+        timestamp_str = str(raw_timestamp)
+        return (int(timestamp_str[0:4]), int(timestamp_str[4:6]), int(timestamp_str[6:8]),
+                int(timestamp_str[8:10]), int(timestamp_str[10:12]), 0)
 
     def get_probability(self, event_payload: Dict[str, Any]) -> Optional[float]:
         return event_payload.get(PROBABILITY_KEY, None)
@@ -1,13 +1,14 @@
-from stream.FileStream import InputStream
+from stream.Stream import InputStream, ThreadSafeStream
 import tweepy
 import plugin.twitter.TwitterCredentials
 import json
 import time
 
 
-class TwitterInputStream(InputStream, tweepy.StreamListener):
+class TwitterInputStream(InputStream, ThreadSafeStream, tweepy.StreamListener):
     """
     Reads the objects from a Twitter session established using Twitter API.
+    The tweets are received on a separate thread, hence a thread-safe stream is used.
     """
     def __init__(self, search_words_list: list, time_limit=None):
         super().__init__()
@@ -0,0 +1,348 @@
+"""
+A compact binary event file format enabling to replay recorded event streams without parsing text lines.
+
+A binary event file consists of the following parts:
+1. The magic bytes identifying the format.
+2. The length of the header followed by the header itself, which is a JSON object containing the record size, the
+   record signatures and the string table (see below).
+3. The records, one per event, all of the same size.
+
+Each record starts with the index of its signature, followed by the event timestamp given as the number of
+microseconds since the epoch. A signature specifies the names of the event attributes and the binary encoding of their
+values: integers and floating point numbers are stored as is. The values of string attributes with few distinct values
+(e.g., event types) are stored as indices into the string table, such that each distinct string is only stored once.
+The values of the other string attributes (e.g., textual timestamps) are stored inline as fixed-width fields, keeping
+the size of the header independent of the size of the data. Since all records are of the same size, the file can be
+memory-mapped and the n-th event can be accessed directly.
+
+A text event file is converted into a binary one using the DataFormatter corresponding to its format, for example:
+python -m stream.BinaryFileStream test/EventFiles/NASDAQ_SHORT.txt NASDAQ_SHORT.bin metastock
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from datetime import timedelta
+
+from base.DataFormatter import DataFormatter
+from misc.TimestampUnits import TimestampUnits, EPOCH, convert_time_window
+from stream.Stream import InputStream
+
+BINARY_EVENT_FILE_MAGIC = b"OCEPBIN2"
+
+# the binary representations of the record prefix (the signature index and the timestamp) and the header length
+SIGNATURE_INDEX_FORMAT = "H"
+RECORD_PREFIX_FORMAT = "<" + SIGNATURE_INDEX_FORMAT + "q"
+RECORD_PREFIX_STRUCT = struct.Struct(RECORD_PREFIX_FORMAT)
+HEADER_LENGTH_STRUCT = struct.Struct("<I")
+
+# the binary representations of the supported attribute value types
+INT_VALUE_FORMAT = "q"
+FLOAT_VALUE_FORMAT = "d"
+STRING_VALUE_FORMAT = "I"
+INLINE_STRING_VALUE_FORMAT = "%ds"
+
+# the maximal number of distinct values of a string attribute stored in the string table - the values of attributes
+# exceeding this number are stored inline
+MAX_STRING_TABLE_VALUES_PER_ATTRIBUTE = 256
+
+
+class BinaryEventFileHeader:
+    """
+    Contains the information required for decoding the records of a binary event file.
+    """
+    def __init__(self, record_size: int, signatures: list, strings: list):
+        self.record_size = record_size
+        # each signature is given as a pair of a list of attribute names and a string of their value formats
+        self.signatures = signatures
+        self.strings = strings
+
+    def to_bytes(self):
+        """
+        Returns the binary representation of the header, including the magic bytes and the header length.
+        """
+        header = json.dumps({"record_size": self.record_size, "signatures": self.signatures,
+                             "strings": self.strings}).encode()
+        return BINARY_EVENT_FILE_MAGIC + HEADER_LENGTH_STRUCT.pack(len(header)) + header
+
+    @staticmethod
+    def read(input_file):
+        """
+        Reads the header from the beginning of the given binary file object.
+        """
+        if input_file.read(len(BINARY_EVENT_FILE_MAGIC)) != BINARY_EVENT_FILE_MAGIC:
+            raise Exception("Not a binary event file")
+        header_length = HEADER_LENGTH_STRUCT.unpack(input_file.read(HEADER_LENGTH_STRUCT.size))[0]
+        header = json.loads(input_file.read(header_length).decode())
+        signatures = [(keys, formats) for keys, formats in header["signatures"]]
+        return BinaryEventFileHeader(header["record_size"], signatures, header["strings"])
+
+
+class BinaryFileInputStream(InputStream):
+    """
+    Reads the records of a binary event file. Each item of the stream is the binary representation of a single event,
+    which is to be decoded by the BinaryDataFormatter returned from create_data_formatter.
+    The file is memory-mapped upon the first access.
+    """
+    def __init__(self, file_path: str, records_to_skip: int = 0):
+        super().__init__()
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError("No such file: '%s'" % (file_path,))
+        self.__file_path = file_path
+        with open(file_path, "rb") as f:
+            self.__header = BinaryEventFileHeader.read(f)
+            self.__records_offset = f.tell()
+        self.__record_size = self.__header.record_size
+        self.__records_number = (os.path.getsize(file_path) - self.__records_offset) // self.__record_size
+        self.__next_record = records_to_skip
+        self.__input_file = None
+        self.__mapped_file = None
+
+    def __next__(self):
+        if self.__next_record >= self.__records_number:
+            raise StopIteration()
+        record = self.__get_record(self.__next_record)
+        self.__next_record += 1
+        return record
+
+    def create_data_formatter(self, base_data_formatter: DataFormatter):
+        """
+        Returns a data formatter decoding the records of this stream. See BinaryDataFormatter for more details.
+        """
+        return BinaryDataFormatter(self.__header, base_data_formatter)
+
+    def close(self):
+        """
+        Releases the underlying file. No further items will be returned by this stream.
+        """
+        self.__next_record = self.__records_number
+        if self.__mapped_file is not None:
+            self.__mapped_file.close()
+            self.__mapped_file = None
+        if self.__input_file is not None:
+            self.__input_file.close()
+            self.__input_file = None
+
+    def duplicate(self):
+        """
+        Returns a new stream containing the records not yet consumed from this stream.
+        """
+        return BinaryFileInputStream(self.__file_path, self.__next_record)
+
+    def count(self):
+        return self.__records_number - self.__next_record
+
+    def first(self):
+        if self.count() == 0:
+            raise IndexError("The stream is empty")
+        return self.__get_record(self.__next_record)
+
+    def last(self):
+        if self.count() == 0:
+            raise IndexError("The stream is empty")
+        return self.__get_record(self.__records_number - 1)
+
+    def __get_record(self, index: int):
+        """
+        Returns the binary representation of the record at the given index.
+        """
+        if self.__mapped_file is None:
+            self.__input_file = open(self.__file_path, "rb")
+            self.__mapped_file = mmap.mmap(self.__input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        start = self.__records_offset + index * self.__record_size
+        return self.__mapped_file[start:start + self.__record_size]
+
+
+class BinaryDataFormatter(DataFormatter):
+    """
+    Decodes the records of a binary event file into event payloads without any string parsing.
+    The timestamp of an event is decoded from its record. The event type and probability are deduced from the decoded
+    payload by the data formatter of the original text format (the base data formatter).
+    """
+    def __init__(self, header: BinaryEventFileHeader, base_data_formatter: DataFormatter):
+        super().__init__(None, base_data_formatter.get_timestamp_unit())
+        self.__base_data_formatter = base_data_formatter
+        self.__strings = header.strings
+        self.__signatures = []
+        for keys, formats in header.signatures:
+            string_indices, inline_string_indices = [], []
+            for i, value_format in enumerate(_split_formats(formats)):
+                if value_format == STRING_VALUE_FORMAT:
+                    string_indices.append(i)
+                elif value_format.endswith("s"):
+                    inline_string_indices.append(i)
+            self.__signatures.append((keys, struct.Struct(RECORD_PREFIX_FORMAT + formats),
+                                      string_indices, inline_string_indices))
+        # the payload most recently decoded by parse_event and its timestamp
+        self.__last_payload = None
+        self.__last_timestamp = None
+
+    def parse_event(self, raw_data: bytes):
+        """
+        Decodes a binary record into an event.
+        """
+        keys, record_struct, string_indices, inline_string_indices = \
+            self.__signatures[RECORD_PREFIX_STRUCT.unpack_from(raw_data)[0]]
+        values = record_struct.unpack_from(raw_data)
+        timestamp = values[1]
+        values = values[2:]
+        if len(string_indices) > 0 or len(inline_string_indices) > 0:
+            values = list(values)
+            for i in string_indices:
+                values[i] = self.__strings[values[i]]
+            for i in inline_string_indices:
+                values[i] = values[i].rstrip(b"\0").decode()
+        payload = dict(zip(keys, values))
+        self.__last_payload = payload
+        self.__last_timestamp = timestamp
+        return payload
+
+    def get_event_timestamp(self, event_payload: dict):
+        """
+        The timestamp of a payload returned by parse_event is decoded from its record. For any other payload, the base
+        data formatter is used.
+        """
+        if event_payload is not self.__last_payload:
+            return self.__base_data_formatter.get_event_timestamp(event_payload)
+        if self.get_timestamp_unit() == TimestampUnits.DATETIME:
+            return EPOCH + timedelta(microseconds=self.__last_timestamp)
+        return self.__last_timestamp * self.get_timestamp_unit().value // TimestampUnits.MICROSECONDS.value
+
+    def get_event_type(self, event_payload: dict):
+        return self.__base_data_formatter.get_event_type(event_payload)
+
+    def get_probability(self, event_payload: dict):
+        return self.__base_data_formatter.get_probability(event_payload)
+
+
+def convert_to_binary_event_file(input_file_path: str, output_file_path: str, data_formatter: DataFormatter):
+    """
+    Converts a text event file parsed by the given data formatter into a binary event file.
+    Two passes are performed over the input file: the first one collects the signatures and the strings to be stored
+    in the header and measures the string attributes to be stored inline, and the second one writes the records.
+    """
+    # the signatures of the payloads, where the formats of the string values are yet to be determined
+    partial_signatures = set()
+    # the distinct values of each string attribute, or None for the attributes whose values are stored inline
+    attribute_strings = {}
+    # the maximal encoded length of the values of each string attribute
+    attribute_string_lengths = {}
+    with open(input_file_path, "r") as input_file:
+        for line in input_file:
+            payload = data_formatter.parse_event(line)
+            partial_signatures.add((tuple(payload.keys()), tuple(None if isinstance(value, str)
+                                                                 else _get_value_format(value)
+                                                                 for value in payload.values())))
+            for key, value in payload.items():
+                if not isinstance(value, str):
+                    continue
+                attribute_string_lengths[key] = max(attribute_string_lengths.get(key, 0), len(value.encode()))
+                strings = attribute_strings.setdefault(key, set())
+                if strings is None:
+                    continue
+                strings.add(value)
+                if len(strings) > MAX_STRING_TABLE_VALUES_PER_ATTRIBUTE:
+                    attribute_strings[key] = None
+    string_formats = {key: STRING_VALUE_FORMAT if strings is not None
+                      else INLINE_STRING_VALUE_FORMAT % (max(attribute_string_lengths[key], 1),)
+                      for key, strings in attribute_strings.items()}
+    string_indices = {}
+    for strings in attribute_strings.values():
+        for value in sorted(strings or ()):
+            string_indices.setdefault(value, len(string_indices))
+
+    signature_indices = {}
+    for keys, value_formats in sorted(partial_signatures, key=str):
+        signature = keys, "".join(string_formats[key] if value_format is None else value_format
+                                  for key, value_format in zip(keys, value_formats))
+        signature_indices.setdefault(signature, len(signature_indices))
+    if len(signature_indices) > 1 << (8 * struct.calcsize(SIGNATURE_INDEX_FORMAT)):
+        raise Exception("Too many distinct record signatures")
+
+    record_size = RECORD_PREFIX_STRUCT.size + max([struct.calcsize("<" + formats) for _, formats in signature_indices],
+                                                  default=0)
+    header = BinaryEventFileHeader(record_size, [(list(keys), formats) for keys, formats in signature_indices.keys()],
+                                   list(string_indices.keys()))
+    signature_structs = {signature: struct.Struct(RECORD_PREFIX_FORMAT + signature[1])
+                         for signature in signature_indices.keys()}
+
+    with open(input_file_path, "r") as input_file, open(output_file_path, "wb") as output_file:
+        output_file.write(header.to_bytes())
+        for line in input_file:
+            payload = data_formatter.parse_event(line)
+            signature = _get_signature(payload, string_formats)
+            values = [_encode_string(key, value, string_formats, string_indices) if isinstance(value, str) else value
+                      for key, value in payload.items()]
+            timestamp = _get_epoch_microseconds(data_formatter.get_event_timestamp(payload),
+                                                data_formatter.get_timestamp_unit())
+            record = signature_structs[signature].pack(signature_indices[signature], timestamp, *values)
+            output_file.write(record.ljust(record_size, b"\0"))
+
+
+def _get_signature(payload: dict, string_formats: dict):
+    """
+    Returns the signature of the given event payload, consisting of the attribute names and the value formats.
+    """
+    return tuple(payload.keys()), "".join(string_formats[key] if isinstance(value, str) else _get_value_format(value)
+                                          for key, value in payload.items())
+
+
+def _get_value_format(value: object):
+    """
+    Returns the binary format of the given non-string attribute value.
+    """
+    if isinstance(value, bool):
+        raise Exception("Unsupported attribute type: %s" % (type(value),))
+    if isinstance(value, int):
+        return INT_VALUE_FORMAT
+    if isinstance(value, float):
+        return FLOAT_VALUE_FORMAT
+    raise Exception("Unsupported attribute type: %s" % (type(value),))
+
+
+def _encode_string(key: str, value: str, string_formats: dict, string_indices: dict):
+    """
+    Returns the binary representation of the given value of a string attribute: either its index in the string table
+    or its encoded bytes.
+    """
+    if string_formats[key] == STRING_VALUE_FORMAT:
+        return string_indices[value]
+    return value.encode()
+
+
+def _split_formats(formats: str):
+    """
+    Splits a string of value formats into the formats of the individual values (e.g., "q19sI" into "q", "19s", "I").
+    """
+    result = []
+    count = ""
+    for char in formats:
+        if char.isdigit():
+            count += char
+            continue
+        result.append(count + char)
+        count = ""
+    return result
+
+
+def _get_epoch_microseconds(timestamp, timestamp_unit: TimestampUnits):
+    """
+    Converts the given timestamp of the given representation into the number of microseconds since the epoch.
+    """
+    if timestamp_unit == TimestampUnits.DATETIME:
+        return convert_time_window(timestamp - EPOCH, TimestampUnits.MICROSECONDS)
+    return timestamp * TimestampUnits.MICROSECONDS.value // timestamp_unit.value
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[3] not in ("metastock", "sensors"):
+        print("Usage: python -m stream.BinaryFileStream <input file> <output file> <metastock|sensors>")
+        sys.exit(1)
+    if sys.argv[3] == "metastock":
+        from plugin.stocks.Stocks import MetastockDataFormatter
+        formatter = MetastockDataFormatter()
+    else:
+        from plugin.sensors.Sensors import SensorsDataFormatter
+        formatter = SensorsDataFormatter()
+    convert_to_binary_event_file(sys.argv[1], sys.argv[2], formatter)
@@ -1,52 +1,256 @@
 import os
+from datetime import datetime, timedelta
+from itertools import islice
+from queue import Queue, Full
+from threading import Thread
 
+from misc import DefaultConfig
 from stream.Stream import InputStream, OutputStream
 
+# the size of the blocks read backwards from the end of the input file when looking for its last line
+LAST_LINE_READ_BLOCK_SIZE = 4096
+
 
 class FileInputStream(InputStream):
     """
     Reads the objects from a predefined input file.
+    The file is read lazily, one chunk of lines at a time, only when the next object is requested. This way, the memory
+    consumption of the stream does not depend on the size of the input file, and the evaluation can start as soon as the
+    first line is available.
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, chunk_size: int = DefaultConfig.FILE_INPUT_STREAM_CHUNK_SIZE,
+                 lines_to_skip: int = 0):
         super().__init__()
-        # TODO: reading the entire content of the input file here is very inefficient
-        with open(file_path, "r") as f:
-            for line in f.readlines():
-                self._stream.put(line)
-        self.close()
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError("No such file: '%s'" % (file_path,))
+        if chunk_size <= 0:
+            raise Exception("chunk size should be positive.")
+        self.__file_path = file_path
+        self.__chunk_size = chunk_size
+        # the file is only opened upon the first access
+        self.__input_file = None
+        self.__chunk = []
+        self.__chunk_index = 0
+        # the number of lines already removed from this stream (including the ones skipped on initialization)
+        self.__lines_consumed = lines_to_skip
+        self.__is_closed = False
+
+    def __next__(self):
+        if not self.__ensure_chunk_is_available():
+            raise StopIteration()
+        next_item = self.__chunk[self.__chunk_index]
+        self.__chunk_index += 1
+        self.__lines_consumed += 1
+        return next_item
+
+    def close(self):
+        """
+        Closes the underlying file. No further items will be returned by this stream.
+        """
+        self.__is_closed = True
+        self.__chunk = []
+        self.__chunk_index = 0
+        if self.__input_file is not None:
+            self.__input_file.close()
+            self.__input_file = None
+
+    def duplicate(self):
+        """
+        Returns a new stream containing the items not yet consumed from this stream. The file content is not copied.
+        """
+        return FileInputStream(self.__file_path, self.__chunk_size, self.__lines_consumed)
+
+    def count(self):
+        """
+        Returns the number of items not yet consumed from this stream. Requires a full pass over the input file.
+        """
+        if self.__is_closed:
+            return 0
+        with open(self.__file_path, "r") as f:
+            total_lines = sum(1 for _ in f)
+        return total_lines - self.__lines_consumed
+
+    def first(self):
+        """
+        Returns the next item of the stream without consuming it.
+        """
+        if not self.__ensure_chunk_is_available():
+            raise IndexError("The stream is empty")
+        return self.__chunk[self.__chunk_index]
+
+    def last(self):
+        """
+        Returns the last item of the stream. Only the tail of the input file is read.
+        """
+        if self.__is_closed:
+            raise IndexError("The stream is empty")
+        with open(self.__file_path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            buffer = b""
+            while position > 0:
+                step = min(LAST_LINE_READ_BLOCK_SIZE, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + buffer
+                # the last line begins right after the last line break preceding the final character
+                line_start = buffer.rfind(b"\n", 0, len(buffer) - 1)
+                if line_start != -1:
+                    return buffer[line_start + 1:].decode().replace("\r\n", "\n")
+        if len(buffer) == 0:
+            raise IndexError("The stream is empty")
+        # the file consists of a single line
+        return buffer.decode().replace("\r\n", "\n")
+
+    def __ensure_chunk_is_available(self):
+        """
+        Reads the next chunk of lines from the input file if the current one was entirely consumed.
+        Returns False if no more lines are available and True otherwise.
+        """
+        if self.__chunk_index < len(self.__chunk):
+            return True
+        if self.__is_closed:
+            return False
+        if self.__input_file is None:
+            self.__input_file = open(self.__file_path, "r")
+            # skip the lines consumed from the stream this one was duplicated from
+            for _ in islice(self.__input_file, self.__lines_consumed):
+                pass
+        self.__chunk = list(islice(self.__input_file, self.__chunk_size))
+        self.__chunk_index = 0
+        if len(self.__chunk) == 0:
+            self.close()
+            return False
+        return True
 
 
 class FileOutputStream(OutputStream):
     """
     Writes the objects into a predefined output file.
+    The items are accumulated in a bounded buffer which is flushed to the file as soon as it contains flush_item_count
+    items, flush_byte_count characters, or flush_interval has passed since the previous flush (any of these limits can
+    be disabled by setting it to None). The time limit is only examined when a new item is added.
+    If is_async is set, the flushed chunks are written by a background writer thread, such that adding items never
+    waits for the disk. At most DefaultConfig.FILE_OUTPUT_STREAM_MAX_PENDING_FLUSHES chunks can wait for the writer,
+    keeping the memory consumption bounded. If the writer fails, the error is raised by the next call to add_item,
+    flush or close.
     """
-    def __init__(self, base_path: str, file_name: str, is_async: bool = False):
+    def __init__(self, base_path: str, file_name: str, is_async: bool = False,
+                 flush_item_count: int = DefaultConfig.FILE_OUTPUT_STREAM_FLUSH_ITEM_COUNT,
+                 flush_byte_count: int = DefaultConfig.FILE_OUTPUT_STREAM_FLUSH_BYTE_COUNT,
+                 flush_interval: timedelta = DefaultConfig.FILE_OUTPUT_STREAM_FLUSH_INTERVAL):
         super().__init__()
         if not os.path.exists(base_path):
             os.makedirs(base_path, exist_ok=True)
-        self.__is_async = is_async
-        self.__output_path = os.path.join(base_path, file_name)
-        if self.__is_async:
-            self.__output_file = open(self.__output_path, 'w')
+        self.__output_file = open(os.path.join(base_path, file_name), 'w')
+        self.__flush_item_count = flush_item_count
+        self.__flush_byte_count = flush_byte_count
+        self.__flush_interval = flush_interval
+        self.__buffer = []
+        self.__buffer_size = 0
+        self.__last_flush_time = datetime.now()
+        self.__is_closed = False
+        self.__writer_error = None
+        if is_async:
+            self.__pending_chunks = Queue(maxsize=DefaultConfig.FILE_OUTPUT_STREAM_MAX_PENDING_FLUSHES)
+            self.__writer_thread = Thread(target=self.__write_pending_chunks, daemon=True)
+            self.__writer_thread.start()
         else:
-            self.__output_file = None
+            self.__pending_chunks = None
+            self.__writer_thread = None
 
     def add_item(self, item: object):
         """
-        Depending on the settings, either writes the item to the file immediately or buffers it for future write.
+        Buffers the item and flushes the buffer if any of the flush limits is reached.
+        """
+        if self.__is_closed:
+            raise Exception("Cannot write to a closed stream")
+        self.__raise_writer_error()
+        item_str = str(item)
+        self.__buffer.append(item_str)
+        self.__buffer_size += len(item_str)
+        if self.__should_flush():
+            self.flush()
+
+    def flush(self):
         """
-        if self.__is_async:
-            self.__output_file.write(str(item))
+        Passes the buffered items to the output file, either directly or via the background writer.
+        """
+        self.__raise_writer_error()
+        self.__last_flush_time = datetime.now()
+        if len(self.__buffer) == 0:
+            return
+        chunk = "".join(self.__buffer)
+        self.__buffer = []
+        self.__buffer_size = 0
+        if self.__pending_chunks is not None:
+            self.__put_pending_chunk(chunk)
         else:
-            super().add_item(item)
+            self.__output_file.write(chunk)
 
     def close(self):
         """
-        If asynchronous write is disabled, writes everything to the output file before closing it.
+        Writes all remaining items to the output file and closes it.
+        """
+        if self.__is_closed:
+            return
+        try:
+            self.flush()
+            if self.__writer_thread is not None:
+                self.__put_pending_chunk(None)
+                self.__writer_thread.join()
+                self.__raise_writer_error()
+        finally:
+            self.__is_closed = True
+            self.__output_file.close()
+
+    def count(self):
+        """
+        Returns the number of items buffered and not yet flushed.
+        """
+        return len(self.__buffer)
+
+    def __should_flush(self):
+        """
+        Returns True if any of the enabled flush limits is reached and False otherwise.
+        """
+        if self.__flush_item_count is not None and len(self.__buffer) >= self.__flush_item_count:
+            return True
+        if self.__flush_byte_count is not None and self.__buffer_size >= self.__flush_byte_count:
+            return True
+        return self.__flush_interval is not None and datetime.now() - self.__last_flush_time >= self.__flush_interval
+
+    def __put_pending_chunk(self, chunk):
+        """
+        Passes the given chunk to the background writer. Instead of blocking forever on a full queue, periodically
+        checks whether the writer has failed and raises its error in this case.
+        """
+        while True:
+            self.__raise_writer_error()
+            try:
+                self.__pending_chunks.put(chunk, timeout=DefaultConfig.FILE_OUTPUT_STREAM_WRITER_POLL_INTERVAL)
+                return
+            except Full:
+                if not self.__writer_thread.is_alive():
+                    self.__raise_writer_error()
+                    raise Exception("The background writer of the stream has terminated")
+
+    def __raise_writer_error(self):
+        """
+        Raises the error that terminated the background writer, if any.
+        """
+        if self.__writer_error is not None:
+            raise Exception("The background writer of the stream has failed") from self.__writer_error
+
+    def __write_pending_chunks(self):
+        """
+        The main loop of the background writer thread. An error terminates the writer and is stored to be raised by the
+        thread using the stream.
         """
-        super().close()
-        if not self.__is_async:
-            self.__output_file = open(self.__output_path, 'w')
-            for item in self:
-                self.__output_file.write(str(item))
-        self.__output_file.close()
+        try:
+            while True:
+                chunk = self.__pending_chunks.get()
+                if chunk is None:
+                    return
+                self.__output_file.write(chunk)
+        except Exception as e:
+            self.__writer_error = e
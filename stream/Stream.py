@@ -1,38 +1,116 @@
+from collections import deque
+from itertools import islice
 from queue import Queue
 
 
 class Stream:
     """
     Represents a generic stream of objects.
+    This implementation is backed by a deque and performs no locking. It is intended for streams that are only accessed
+    by a single thread at a time, which is always the case when no parallel execution platform is in use. Accessing an
+    empty stream never blocks - the iteration simply stops until more items are added.
     """
     def __init__(self):
-        self._stream = Queue()
+        self._stream = deque()
 
     def __next__(self):
-        next_item = self._stream.get(block=True)  # Blocking get
-        if next_item is None:
+        if len(self._stream) == 0:
             raise StopIteration()
-        return next_item
+        return self._stream.popleft()
 
     def __iter__(self):
         return self
 
     def add_item(self, item: object):
-        self._stream.put(item)
+        self._stream.append(item)
+
+    def add_items(self, items):
+        """
+        Appends all items in the given iterable to the stream at once.
+        """
+        self._stream.extend(items)
+
+    def get_batch(self, max_size: int):
+        """
+        Removes and returns a list of at most max_size next items of the stream. An empty list is returned if the
+        stream contains no items.
+        """
+        if max_size >= len(self._stream):
+            batch = list(self._stream)
+            self._stream.clear()
+            return batch
+        return [self._stream.popleft() for _ in range(max_size)]
 
     def close(self):
-        self._stream.put(None)
+        pass
 
     def duplicate(self):
         ret = Stream()
-        ret._stream.queue = self._stream.queue.copy()
+        ret._stream = self._stream.copy()
         return ret
 
     def get_item(self):
         return self.__next__()
 
     def count(self):
-        return self._stream.qsize()
+        return len(self._stream)
+
+    def first(self):
+        return self._stream[0]
+
+    def last(self):
+        return self._stream[-1]
+
+
+class ThreadSafeStream(Stream):
+    """
+    A stream that can be safely shared between a producer thread and a consumer thread.
+    Backed by a synchronized queue: accessing an empty stream blocks until a new item arrives or the stream is closed.
+    """
+    def __init__(self):
+        super().__init__()
+        self._stream = Queue()
+
+    def __next__(self):
+        next_item = self._stream.get(block=True)  # Blocking get
+        if next_item is None:
+            # put the closing None back so that subsequent accesses do not block
+            self._stream.put(None)
+            raise StopIteration()
+        return next_item
+
+    def add_item(self, item: object):
+        self._stream.put(item)
+
+    def add_items(self, items):
+        for item in items:
+            self._stream.put(item)
+
+    def get_batch(self, max_size: int):
+        """
+        Blocks until at least one item is available, then removes and returns a list of at most max_size items that
+        are already present in the stream. An empty list is returned if the stream is closed.
+        """
+        batch = []
+        for item in islice(self, max_size):
+            batch.append(item)
+            if self._stream.empty():
+                break
+        return batch
+
+    def close(self):
+        self._stream.put(None)
+
+    def duplicate(self):
+        ret = ThreadSafeStream()
+        ret._stream.queue = self._stream.queue.copy()
+        return ret
+
+    def count(self):
+        size = self._stream.qsize()
+        if size > 0 and self._stream.queue[-1] is None:  # the closing None is not an item of the stream
+            size -= 1
+        return size
 
     def first(self):
         return self._stream.queue[0]
@@ -51,6 +129,9 @@ class InputStream(Stream):
     def add_item(self, item: object):
         raise Exception("Unsupported operation")
 
+    def add_items(self, items):
+        raise Exception("Unsupported operation")
+
 
 class OutputStream(Stream):
     """
@@ -59,6 +140,9 @@ class OutputStream(Stream):
     def get_item(self):
         raise Exception("Unsupported operation")
 
+    def get_batch(self, max_size: int):
+        raise Exception("Unsupported operation")
+
     def first(self):
         raise Exception("Unsupported operation")
 
@@ -0,0 +1,567 @@
+import os
+import pathlib
+from datetime import timedelta
+
+from CEP import CEP
+from adaptive.statistics.StatisticsCollector import StatisticsCollector
+from adaptive.statistics.StatisticsCollectorFactory import StatisticsCollectorFactory, StatisticsCollectorParameters
+from adaptive.statistics.StatisticsTypes import StatisticsTypes
+from base.Event import Event, AggregatedEvent
+from base.Pattern import Pattern
+from base.PatternStructure import SeqOperator, AndOperator, PrimitiveEventStructure
+from condition.AttributeCache import AttributeCache
+from condition.BaseRelationCondition import SmallerThanCondition, GreaterThanEqCondition, EqCondition, \
+    GreaterThanCondition
+from condition import CompositeCondition as composite_condition_module
+from condition.CompositeCondition import AndCondition, OrCondition
+from condition.Condition import Variable, SimpleCondition, TrueCondition
+from condition.ConditionCompiler import compile_condition, compile_event_condition
+from condition.Expression import EventReference, ExpressionCondition, ExpressionVariable, get_equality_attributes, \
+    get_partitioning_attribute_names
+from condition.KCCondition import KCValueCondition
+from misc import DefaultConfig
+from parallel.ParallelExecutionParameters import ParallelExecutionParameters, \
+    DataParallelExecutionParametersHirzelAlgorithm
+from plugin.stocks.Stocks import MetastockDataFormatter
+from stream.FileStream import FileInputStream
+from stream.Stream import Stream
+from tree.nodes.BinaryNode import BinaryNode
+
+try:
+    import numpy
+except ImportError:  # NumPy might not be installed
+    numpy = None
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+CONDITION_TESTS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+
+
+def run_condition_tests():
+    if numpy is not None:  # NumPy might not be installed
+        batch_evaluation_test = TestBatchConditionEvaluation()
+        batch_evaluation_test.run_tests()
+    condition_compiler_test = TestConditionCompiler()
+    condition_compiler_test.run_tests()
+    condition_reordering_test = TestConditionReordering()
+    condition_reordering_test.run_tests()
+    statistics_sampling_test = TestStatisticsSampling()
+    statistics_sampling_test.run_tests()
+    attribute_cache_test = TestAttributeCache()
+    attribute_cache_test.run_tests()
+    condition_expressions_test = TestConditionExpressions()
+    condition_expressions_test.run_tests()
+    print("Condition unit tests executed successfully.")
+
+
+def run_cep(pattern: Pattern, parallel_execution_params: ParallelExecutionParameters = None):
+    """
+    Returns the matches of the given pattern over the test event file as sorted string representations.
+    """
+    matches = Stream()
+    CEP([pattern], parallel_execution_params=parallel_execution_params).run(FileInputStream(CONDITION_TESTS_FILE_PATH), matches, MetastockDataFormatter())
+    return sorted(str(match) for match in matches)
+
+
+"""
+BATCH CONDITION EVALUATION
+"""
+
+
+class TestBatchConditionEvaluation:
+    def __init__(self):
+        self.numeric_pattern = Pattern(
+            AndOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("GOOG", "b"),
+                        PrimitiveEventStructure("AMZN", "c")),
+            AndCondition(
+                SmallerThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                     Variable("b", lambda x: x["Opening Price"])),
+                GreaterThanEqCondition(Variable("b", lambda x: x["Volume"]), Variable("c", lambda x: x["Volume"]))),
+            timedelta(minutes=5))
+        self.string_pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("GOOG", "b")),
+            EqCondition(Variable("a", lambda x: str(x["Date"])), Variable("b", lambda x: str(x["Date"]))),
+            timedelta(minutes=5))
+
+    @staticmethod
+    def run_with_and_without_batches(pattern: Pattern):
+        """
+        Returns the matches of the given pattern with and without the batch evaluation of the join conditions, along
+        with the numbers of candidates before and after each application of the batch filter.
+        """
+        original_min_candidates = DefaultConfig.BATCH_CONDITION_EVALUATION_MIN_CANDIDATES
+        original_enable_batches = DefaultConfig.ENABLE_BATCH_CONDITION_EVALUATION
+        original_filter_candidates = BinaryNode._BinaryNode__filter_candidates
+        candidate_counts = []
+
+        def filter_candidates(node, new_partial_match, candidates, *args):
+            result = original_filter_candidates(node, new_partial_match, candidates, *args)
+            candidate_counts.append((len(candidates), len(result)))
+            return result
+
+        try:
+            BinaryNode._BinaryNode__filter_candidates = filter_candidates
+            DefaultConfig.BATCH_CONDITION_EVALUATION_MIN_CANDIDATES = 1
+            DefaultConfig.ENABLE_BATCH_CONDITION_EVALUATION = True
+            batch_matches = run_cep(pattern)
+            DefaultConfig.ENABLE_BATCH_CONDITION_EVALUATION = False
+            regular_matches = run_cep(pattern)
+        finally:
+            BinaryNode._BinaryNode__filter_candidates = original_filter_candidates
+            DefaultConfig.BATCH_CONDITION_EVALUATION_MIN_CANDIDATES = original_min_candidates
+            DefaultConfig.ENABLE_BATCH_CONDITION_EVALUATION = original_enable_batches
+        return batch_matches, regular_matches, candidate_counts
+
+    def test_numeric_conditions(self):
+        batch_matches, regular_matches, candidate_counts = TestBatchConditionEvaluation.run_with_and_without_batches(
+            self.numeric_pattern)
+        assert len(regular_matches) > 0 and batch_matches == regular_matches, \
+            "Batch condition evaluation: incorrect matches"
+        assert any(filtered_count < count for count, filtered_count in candidate_counts), \
+            "Batch condition evaluation: no candidates were discarded by the batch filter"
+
+    def test_non_numeric_conditions(self):
+        batch_matches, regular_matches, candidate_counts = TestBatchConditionEvaluation.run_with_and_without_batches(
+            self.string_pattern)
+        assert len(regular_matches) > 0 and batch_matches == regular_matches, \
+            "Batch condition evaluation: incorrect matches for non-numeric attributes"
+        assert len(candidate_counts) > 0 and \
+            all(filtered_count == count for count, filtered_count in candidate_counts), \
+            "Batch condition evaluation: candidates with non-numeric attributes were discarded by the batch filter"
+
+    def run_tests(self):
+        self.test_numeric_conditions()
+        self.test_non_numeric_conditions()
+
+
+"""
+CONDITION COMPILER
+"""
+
+
+class SelectivityRecorder(StatisticsCollector):
+    """
+    A minimal statistics collector recording the atomic condition evaluation results.
+    """
+    def __init__(self, selectivity_sampling_interval: int = 1):
+        super().__init__({}, selectivity_sampling_interval)
+        self.results = []
+
+    def update_statistics_by_type(self, statistics_type, data):
+        self.results.append(data[1])
+
+
+class TestConditionCompiler:
+    def __init__(self):
+        self.condition = AndCondition(
+            GreaterThanCondition(Variable("a", lambda x: x["Price"]), 100),
+            OrCondition(
+                SmallerThanCondition(Variable("a", lambda x: x["Price"]), Variable("b", lambda x: x["Price"])),
+                EqCondition(5, Variable("b", lambda x: x["Volume"]))),
+            SimpleCondition(Variable("a", lambda x: x["Price"]), Variable("b", lambda x: x["Price"]),
+                            Variable("c", lambda x: x["Price"]), relation_op=lambda x, y, z: x + y > z),
+            TrueCondition())
+        self.payloads = [
+            ({"Price": 150, "Volume": 1}, {"Price": 200, "Volume": 1}, {"Price": 300, "Volume": 1}),
+            ({"Price": 150, "Volume": 1}, {"Price": 120, "Volume": 5}, {"Price": 200, "Volume": 1}),
+            ({"Price": 150, "Volume": 1}, {"Price": 120, "Volume": 4}, {"Price": 200, "Volume": 1}),
+            ({"Price": 150, "Volume": 1}, {"Price": 200, "Volume": 1}, {"Price": 400, "Volume": 1}),
+            ({"Price": 50, "Volume": 1}, {"Price": 200, "Volume": 1}, {"Price": 100, "Volume": 1}),
+        ]
+
+    def test_compiled_results(self):
+        compiled_condition = compile_condition(self.condition, ["a", "b", "c"])
+        assert compiled_condition is not None, "Condition compiler: a supported condition was not compiled"
+        for a, b, c in self.payloads:
+            expected_result = self.condition.eval({"a": a, "b": b, "c": c})
+            assert bool(compiled_condition([a, b, c])) == expected_result, "Condition compiler: incorrect result"
+        # the event names may be ordered differently from the terms of the condition
+        compiled_condition = compile_condition(self.condition, ["c", "b", "a"])
+        for a, b, c in self.payloads:
+            expected_result = self.condition.eval({"a": a, "b": b, "c": c})
+            assert bool(compiled_condition([c, b, a])) == expected_result, "Condition compiler: incorrect slots"
+
+    def test_statistics(self):
+        condition = AndCondition(GreaterThanCondition(Variable("a", lambda x: x["Price"]), 100),
+                                 SmallerThanCondition(Variable("a", lambda x: x["Price"]),
+                                                      Variable("b", lambda x: x["Price"])))
+        interpreted_recorder, compiled_recorder = SelectivityRecorder(), SelectivityRecorder()
+        condition.set_statistics_collector(interpreted_recorder)
+        for a, b, _ in self.payloads:
+            condition.eval({"a": a, "b": b})
+        condition.set_statistics_collector(compiled_recorder)
+        compiled_condition = compile_condition(condition, ["a", "b"])
+        for a, b, _ in self.payloads:
+            compiled_condition([a, b])
+        assert compiled_recorder.results == interpreted_recorder.results, \
+            "Condition compiler: incorrect selectivity statistics"
+
+    def test_unsupported_conditions(self):
+        assert compile_condition(self.condition, ["a", "b"]) is None, \
+            "Condition compiler: a condition over unknown names was compiled"
+        kc_condition = AndCondition(KCValueCondition({"a"}, lambda x: x["Price"], lambda x, y: x > y, 100))
+        assert compile_condition(kc_condition, ["a"]) is None, \
+            "Condition compiler: a Kleene closure condition was compiled"
+
+    def test_event_based_condition(self):
+        data_formatter = MetastockDataFormatter()
+        a = Event("AAPL,200802010900,150,150,150,150,1000", data_formatter)
+        b = Event("GOOG,200802010901,200,200,200,200,1000", data_formatter)
+        c = Event("AMZN,200802010902,300,300,300,300,1000", data_formatter)
+        kc = AggregatedEvent([Event("MSFT,200802010903,%d,%d,%d,%d,1000" % ((price,) * 4), data_formatter)
+                              for price in (10, 20, 30)], None)
+        condition = AndCondition(
+            SmallerThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("c", lambda x: x["Opening Price"])),
+            GreaterThanCondition(Variable("c", lambda x: x["Opening Price"]),
+                                 Variable("k", lambda x: sum(e["Opening Price"] for e in x))))
+        names = ["a", "b", "c", "k"]
+        compiled_condition = compile_event_condition(condition, names)
+        for events in ([a, b, c, kc], [c, b, a, kc]):
+            binding = {name: event.payload if not isinstance(event, AggregatedEvent) else
+                       [e.payload for e in event.primitive_events] for name, event in zip(names, events)}
+            assert compiled_condition(events) == condition.eval(binding), \
+                "Condition compiler: incorrect result for events"
+
+    def test_interpreted_fallback(self):
+        original_compile_conditions = DefaultConfig.COMPILE_CONDITIONS
+        try:
+            DefaultConfig.COMPILE_CONDITIONS = False
+            interpreted_matches = run_cep(TestBatchConditionEvaluation().numeric_pattern)
+        finally:
+            DefaultConfig.COMPILE_CONDITIONS = original_compile_conditions
+        compiled_matches = run_cep(TestBatchConditionEvaluation().numeric_pattern)
+        assert len(interpreted_matches) > 0 and compiled_matches == interpreted_matches, \
+            "Condition compiler: incorrect matches"
+
+    def run_tests(self):
+        self.test_compiled_results()
+        self.test_statistics()
+        self.test_unsupported_conditions()
+        self.test_event_based_condition()
+        self.test_interpreted_fallback()
+
+
+"""
+CONDITION REORDERING
+"""
+
+
+class TestConditionReordering:
+    def __init__(self):
+        self.payloads = [{"Price": price} for price in range(20)]
+
+    def test_conjunction_reordering(self):
+        condition = AndCondition(
+            SimpleCondition(Variable("a", lambda x: x["Price"]), relation_op=lambda x: x >= 0),
+            GreaterThanCondition(Variable("a", lambda x: x["Price"]), 15))
+        expected_results = [condition.eval({"a": payload}) for payload in self.payloads]
+        condition.set_reordering_interval(10)
+        actual_results = [condition.eval({"a": payload}) for payload in self.payloads]
+        assert actual_results == expected_results, "Condition reordering: incorrect results"
+        assert condition.is_reordered() and str(condition) == "a > 15 AND [a]", \
+            "Condition reordering: the rejecting condition was not moved forward"
+        assert compile_condition(condition, ["a"]) is None, "Condition reordering: a reordered condition was compiled"
+
+    def test_disjunction_reordering(self):
+        condition = OrCondition(
+            AndCondition(GreaterThanCondition(Variable("a", lambda x: x["Price"]), 100),
+                         SmallerThanCondition(Variable("a", lambda x: x["Price"]), 200)),
+            SmallerThanCondition(Variable("a", lambda x: x["Price"]), 18))
+        expected_results = [condition.eval({"a": payload}) for payload in self.payloads]
+        condition.set_reordering_interval(4)
+        actual_results = [condition.eval({"a": payload}) for payload in self.payloads]
+        assert actual_results == expected_results, "Condition reordering: incorrect results"
+        assert str(condition.get_conditions_list()[0]) == "a < 18", \
+            "Condition reordering: the accepting condition was not moved forward"
+
+    def test_condition_added_after_enabling(self):
+        condition = AndCondition(SimpleCondition(Variable("a", lambda x: x["Price"]), relation_op=lambda x: x >= 0))
+        condition.set_reordering_interval(2)
+        condition.add_atomic_condition(GreaterThanCondition(Variable("a", lambda x: x["Price"]), 15))
+        actual_results = [condition.eval({"a": payload}) for payload in self.payloads]
+        assert actual_results == [payload["Price"] > 15 for payload in self.payloads], \
+            "Condition reordering: incorrect results for an added condition"
+        assert str(condition) == "a > 15 AND [a]", "Condition reordering: the added condition was not reordered"
+
+    def test_sampled_timing(self):
+        condition = AndCondition(
+            SimpleCondition(Variable("a", lambda x: x["Price"]), relation_op=lambda x: x >= 0),
+            GreaterThanCondition(Variable("a", lambda x: x["Price"]), -1))
+        timed_calls = []
+        original_perf_counter = composite_condition_module.perf_counter
+        original_timing_interval = DefaultConfig.CONDITION_REORDERING_TIMING_INTERVAL
+        try:
+            composite_condition_module.perf_counter = lambda: timed_calls.append(None) or 0.0
+            DefaultConfig.CONDITION_REORDERING_TIMING_INTERVAL = 5
+            condition.set_reordering_interval(100)
+            for payload in self.payloads:
+                condition.eval({"a": payload})
+        finally:
+            composite_condition_module.perf_counter = original_perf_counter
+            DefaultConfig.CONDITION_REORDERING_TIMING_INTERVAL = original_timing_interval
+        # 4 of the 20 evaluations are timed, each one timing both conditions
+        assert len(timed_calls) == 4 * 2 * 2, "Condition reordering: incorrect number of timed evaluations"
+
+    def test_structure_summary(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("GOOG", "b")),
+            AndCondition(
+                SimpleCondition(Variable("a", lambda x: x["Opening Price"]),
+                                Variable("b", lambda x: x["Opening Price"]), relation_op=lambda x, y: x < y),
+                SmallerThanCondition(Variable("a", lambda x: x["Opening Price"] + 395),
+                                     Variable("b", lambda x: x["Opening Price"]))),
+            timedelta(minutes=5))
+        original_reordering_interval = DefaultConfig.CONDITION_REORDERING_INTERVAL
+        try:
+            DefaultConfig.CONDITION_REORDERING_INTERVAL = 5
+            cep = CEP([pattern])
+            matches = Stream()
+            cep.run(FileInputStream(CONDITION_TESTS_FILE_PATH), matches, MetastockDataFormatter())
+            reordered_matches = sorted(str(match) for match in matches)
+            structure_summary = cep.get_evaluation_mechanism_structure_summary()
+        finally:
+            DefaultConfig.CONDITION_REORDERING_INTERVAL = original_reordering_interval
+        regular_matches = run_cep(pattern)
+        assert len(regular_matches) > 0 and reordered_matches == regular_matches, \
+            "Condition reordering: incorrect matches"
+        assert structure_summary == ("Seq", "a", "b", "a < b AND [a, b]"), \
+            "Condition reordering: the condition order is missing from the structure summary"
+
+    def run_tests(self):
+        self.test_conjunction_reordering()
+        self.test_disjunction_reordering()
+        self.test_condition_added_after_enabling()
+        self.test_sampled_timing()
+        self.test_structure_summary()
+
+
+"""
+STATISTICS SAMPLING
+"""
+
+
+class TestStatisticsSampling:
+    def __init__(self):
+        self.payloads = [{"Price": price} for price in range(12)]
+
+    def test_sampling_interval(self):
+        condition = GreaterThanCondition(Variable("a", lambda x: x["Price"]), 5)
+        recorder = SelectivityRecorder(3)
+        condition.set_statistics_collector(recorder)
+        for payload in self.payloads:
+            condition.eval({"a": payload})
+        assert recorder.results == [False, False, True, True], "Statistics sampling: incorrect samples"
+        compiled_condition = compile_condition(condition, ["a"])
+        for payload in self.payloads:
+            compiled_condition([payload])
+        assert len(recorder.results) == 8, "Statistics sampling: incorrect samples of a compiled condition"
+
+    def test_selectivity_statistics(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("GOOG", "b")),
+            SmallerThanCondition(Variable("a", lambda x: x["Price"]), Variable("b", lambda x: x["Price"])),
+            timedelta(minutes=5))
+        parameters = StatisticsCollectorParameters(statistics_types=StatisticsTypes.SELECTIVITY_MATRIX,
+                                                   selectivity_sampling_interval=2)
+        statistics_collector = StatisticsCollectorFactory.build_statistics_collector(parameters, [pattern])
+        pattern.condition.set_statistics_collector(statistics_collector)
+        # the sampled evaluations (every second one) are satisfied for prices 1, 3 and 5 out of 1, 3, 5, 7, 9, 11
+        for payload in self.payloads:
+            pattern.condition.eval({"a": payload, "b": {"Price": 6}})
+        selectivity_matrix = statistics_collector.get_statistics()[StatisticsTypes.SELECTIVITY_MATRIX]
+        assert selectivity_matrix[0][1] == selectivity_matrix[1][0] == 0.5, \
+            "Statistics sampling: incorrect selectivity"
+        atomic_condition = pattern.condition.extract_atomic_conditions()[0]
+        assert atomic_condition.get_condition_id() == str(atomic_condition), \
+            "Statistics sampling: incorrect condition id"
+
+    def test_default_sampling_interval(self):
+        parameters = StatisticsCollectorParameters(statistics_types=StatisticsTypes.SELECTIVITY_MATRIX)
+        assert parameters.selectivity_sampling_interval == 1, "Statistics sampling: sampling is enabled by default"
+        condition = GreaterThanCondition(Variable("a", lambda x: x["Price"]), 5)
+        recorder = SelectivityRecorder()
+        condition.set_statistics_collector(recorder)
+        for payload in self.payloads[:3]:
+            condition.eval({"a": payload})
+        assert len(recorder.results) == 3, "Statistics sampling: not all evaluations were recorded by default"
+
+    def test_invalid_sampling_interval(self):
+        try:
+            StatisticsCollectorParameters(selectivity_sampling_interval=0)
+        except Exception:
+            return
+        assert False, "Statistics sampling: an invalid sampling interval was accepted"
+
+    def run_tests(self):
+        self.test_sampling_interval()
+        self.test_selectivity_statistics()
+        self.test_default_sampling_interval()
+        self.test_invalid_sampling_interval()
+
+
+"""
+ATTRIBUTE CACHE
+"""
+
+
+class TestAttributeCache:
+    def test_cached_values(self):
+        event = Event("AAPL,200802010900,150,151,149,150.5,1000", MetastockDataFormatter())
+        calls = []
+        getattr_func = lambda x: calls.append(x) or x["Opening Price"]
+        original_collect_statistics = DefaultConfig.COLLECT_ATTRIBUTE_CACHE_STATISTICS
+        try:
+            DefaultConfig.COLLECT_ATTRIBUTE_CACHE_STATISTICS = True
+            get_attribute = AttributeCache.get_attribute_function()
+        finally:
+            DefaultConfig.COLLECT_ATTRIBUTE_CACHE_STATISTICS = original_collect_statistics
+        AttributeCache.reset_statistics()
+        values = [get_attribute(event, getattr_func, event.payload) for _ in range(4)]
+        assert values == [150] * 4 and len(calls) == 1, "Attribute cache: the getter was applied repeatedly"
+        assert AttributeCache.get_hit_count() == 3 and AttributeCache.get_miss_count() == 1 and \
+            AttributeCache.get_hit_rate() == 0.75, "Attribute cache: incorrect statistics"
+        AttributeCache.reset_statistics()
+        assert AttributeCache.get_hit_rate() is None, "Attribute cache: the statistics were not reset"
+        assert AttributeCache.get_attribute(event, getattr_func, event.payload) == 150 and len(calls) == 1 and \
+            AttributeCache.get_hit_rate() is None, "Attribute cache: the statistics were collected while disabled"
+
+    def test_cached_matches(self):
+        pattern = TestBatchConditionEvaluation().numeric_pattern
+        original_attribute_cache = DefaultConfig.ENABLE_ATTRIBUTE_CACHE
+        original_collect_statistics = DefaultConfig.COLLECT_ATTRIBUTE_CACHE_STATISTICS
+        try:
+            DefaultConfig.ENABLE_ATTRIBUTE_CACHE = True
+            DefaultConfig.COLLECT_ATTRIBUTE_CACHE_STATISTICS = True
+            AttributeCache.reset_statistics()
+            cached_matches = run_cep(pattern)
+            hit_rate = AttributeCache.get_hit_rate()
+            DefaultConfig.ENABLE_ATTRIBUTE_CACHE = False
+            AttributeCache.reset_statistics()
+            regular_matches = run_cep(pattern)
+            disabled_hit_rate = AttributeCache.get_hit_rate()
+        finally:
+            DefaultConfig.ENABLE_ATTRIBUTE_CACHE = original_attribute_cache
+            DefaultConfig.COLLECT_ATTRIBUTE_CACHE_STATISTICS = original_collect_statistics
+            AttributeCache.reset_statistics()
+        assert len(regular_matches) > 0 and cached_matches == regular_matches, "Attribute cache: incorrect matches"
+        assert hit_rate is not None and hit_rate > 0.5, "Attribute cache: the cached values were not reused"
+        assert disabled_hit_rate is None, "Attribute cache: the cache was used while disabled"
+
+    def run_tests(self):
+        self.test_cached_values()
+        self.test_cached_matches()
+
+
+"""
+CONDITION EXPRESSIONS
+"""
+
+
+class TestConditionExpressions:
+    def __init__(self):
+        self.a, self.b, self.c = EventReference("a"), EventReference("b"), EventReference("c")
+        self.payloads = {"a": {"Opening Price": 10, "Volume": 100},
+                         "b": {"Opening Price": 12, "Volume": 50},
+                         "c": {"Opening Price": 21, "Volume": 50}}
+
+    def test_compiled_conditions(self):
+        a, b, c = self.a, self.b, self.c
+        condition = ((a["Opening Price"] * 1.1 < b["Opening Price"]) & (b["Volume"] >= 50)).to_condition()
+        assert isinstance(condition, AndCondition), "Condition expressions: incorrect conjunction"
+        first_condition, second_condition = condition.get_conditions_list()
+        assert isinstance(first_condition, SmallerThanCondition) and \
+            isinstance(first_condition.left_term_repr, ExpressionVariable) and \
+            isinstance(second_condition, GreaterThanEqCondition) and second_condition.right_term_repr == 50, \
+            "Condition expressions: incorrect basic relation conditions"
+        assert condition.eval(self.payloads), "Condition expressions: incorrect evaluation result"
+        multi_event_condition = (a["Opening Price"] + b["Opening Price"] > c["Opening Price"]).to_condition()
+        assert isinstance(multi_event_condition, ExpressionCondition), \
+            "Condition expressions: incorrect multi-event condition"
+        assert multi_event_condition.eval(self.payloads), "Condition expressions: incorrect evaluation result"
+        disjunction = ((a["Volume"] < 50) | (c["Opening Price"] - a["Opening Price"] == b["Opening Price"] - 1))
+        assert isinstance(disjunction.to_condition(), OrCondition) and disjunction.to_condition().eval(self.payloads), \
+            "Condition expressions: incorrect disjunction"
+        assert compile_condition(multi_event_condition, ["a", "b", "c"])(
+            [self.payloads["a"], self.payloads["b"], self.payloads["c"]]), \
+            "Condition expressions: incorrect compiled evaluation result"
+
+    def test_introspection(self):
+        a, b, c = self.a, self.b, self.c
+        expression = (a["Opening Price"] + b["Peak Price"] > c["Opening Price"]) & (a["Volume"] == 1)
+        assert expression.get_event_names() == {"a", "b", "c"} and \
+            expression.get_attribute_names() == {"Opening Price", "Peak Price", "Volume"}, \
+            "Condition expressions: incorrect structure"
+        condition = expression.to_condition()
+        assert condition.get_attribute_names() == {"Opening Price", "Peak Price", "Volume"}, \
+            "Condition expressions: incorrect attribute names of the compiled condition"
+        assert str(expression) == "((a.Opening Price + b.Peak Price) > c.Opening Price AND a.Volume == 1)", \
+            "Condition expressions: incorrect representation"
+
+    def test_structural_equality(self):
+        a, b = self.a, self.b
+        first_condition = (a["Opening Price"] * 2 < b["Opening Price"]).to_condition()
+        second_condition = (EventReference("a")["Opening Price"] * 2 < b["Opening Price"]).to_condition()
+        third_condition = (a["Opening Price"] * 3 < b["Opening Price"]).to_condition()
+        assert first_condition == second_condition and not first_condition == third_condition, \
+            "Condition expressions: incorrect structural equality"
+
+    def test_invalid_expressions(self):
+        a, b = self.a, self.b
+        for invalid_expression in [lambda: 1 < a["Volume"] < b["Volume"],
+                                   lambda: (a["Volume"] < 1) and (b["Volume"] < 1),
+                                   lambda: (a["Volume"] < 1) + 1]:
+            try:
+                invalid_expression()
+            except Exception:
+                continue
+            assert False, "Condition expressions: an invalid expression was accepted"
+
+    def test_equality_attributes(self):
+        a, b, c = self.a, self.b, self.c
+        condition = ((a["Stock Ticker"] == b["Stock Ticker"]) & (b["Date"] == c["Date"]) &
+                     (a["Volume"] == 5) & (a["Volume"] + b["Volume"] == c["Volume"])).to_condition()
+        assert get_equality_attributes(condition) == {"a": {"Stock Ticker"}, "b": {"Stock Ticker", "Date"},
+                                                      "c": {"Date"}}, \
+            "Condition expressions: incorrect equality attributes"
+        assert get_partitioning_attribute_names(condition, ["a", "b", "c"]) == set() and \
+            get_partitioning_attribute_names(condition, ["a", "b"]) == {"Stock Ticker"}, \
+            "Condition expressions: incorrect partitioning attributes"
+        condition = ((a["Stock Ticker"] == b["Stock Ticker"]) & (c["Stock Ticker"] == b["Stock Ticker"]) &
+                     (a["Date"] == c["Date"])).to_condition()
+        assert get_partitioning_attribute_names(condition, ["a", "b", "c"]) == {"Stock Ticker"}, \
+            "Condition expressions: incorrect partitioning attributes"
+
+    def test_partitioning_key_selection(self):
+        a, b = self.a, self.b
+        pattern = Pattern(
+            AndOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("GOOG", "b")),
+            (a["Date"] == b["Date"]) & (a["Opening Price"] < b["Opening Price"]),
+            timedelta(minutes=5))
+        parallel_execution_params = DataParallelExecutionParametersHirzelAlgorithm(units_number=3)
+        parallel_matches = run_cep(pattern, parallel_execution_params)
+        assert len(parallel_matches) > 0 and parallel_matches == run_cep(pattern), \
+            "Condition expressions: incorrect matches when partitioning by the selected key"
+
+    def test_expression_pattern(self):
+        a, b, c = self.a, self.b, self.c
+        pattern = Pattern(
+            AndOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("GOOG", "b"),
+                        PrimitiveEventStructure("AMZN", "c")),
+            (a["Opening Price"] < b["Opening Price"]) & (b["Volume"] >= c["Volume"]),
+            timedelta(minutes=5))
+        assert pattern.get_attribute_names() == {"Opening Price", "Volume"}, \
+            "Condition expressions: incorrect pattern attribute names"
+        expression_matches = run_cep(pattern)
+        regular_matches = run_cep(TestBatchConditionEvaluation().numeric_pattern)
+        assert len(regular_matches) > 0 and expression_matches == regular_matches, \
+            "Condition expressions: incorrect matches"
+
+    def run_tests(self):
+        self.test_compiled_conditions()
+        self.test_introspection()
+        self.test_structural_equality()
+        self.test_invalid_expressions()
+        self.test_equality_attributes()
+        self.test_partitioning_key_selection()
+        self.test_expression_pattern()
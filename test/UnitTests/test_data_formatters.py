@@ -0,0 +1,79 @@
+import os
+import pathlib
+from datetime import timedelta
+
+from CEP import CEP
+from base.DataFormatter import EventTypeClassifier
+from base.Event import Event
+from base.Pattern import Pattern
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure
+from condition.BaseRelationCondition import EqCondition
+from condition.Condition import Variable
+from parallel.ParallelExecutionParameters import DataParallelExecutionParametersHirzelAlgorithm
+from plugin.sensors.Sensors import SensorsDataFormatter
+from plugin.stocks.Stocks import MetastockDataFormatter
+from stream.FileStream import FileInputStream
+from stream.Stream import Stream
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+DATA_FORMATTER_TESTS_STOCKS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+DATA_FORMATTER_TESTS_SENSORS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/Sensors_short.dat")
+
+
+def run_data_formatter_tests():
+    event_type_peeking_test = TestEventTypePeeking()
+    event_type_peeking_test.run_tests()
+    print("Data formatter unit tests executed successfully.")
+
+
+class _ConstantEventTypeClassifier(EventTypeClassifier):
+    """
+    Assigns the same type to all events, such that the type cannot be deduced from the raw data.
+    """
+    def get_event_type(self, event_payload: dict):
+        return "event"
+
+
+class TestEventTypePeeking:
+    def __init__(self):
+        with open(DATA_FORMATTER_TESTS_STOCKS_FILE_PATH, "r") as f:
+            self.stock_lines = f.readlines()
+        with open(DATA_FORMATTER_TESTS_SENSORS_FILE_PATH, "r") as f:
+            self.sensor_lines = f.readlines()
+
+    def test_peeked_types(self):
+        for data_formatter, lines in [(MetastockDataFormatter(), self.stock_lines),
+                                      (SensorsDataFormatter(), self.sensor_lines)]:
+            for line in lines:
+                assert data_formatter.peek_event_type(line) == Event(line, data_formatter).type, \
+                    "%s: incorrect peeked event type" % (type(data_formatter).__name__,)
+
+    def test_custom_classifier(self):
+        for data_formatter, lines in [(MetastockDataFormatter(_ConstantEventTypeClassifier()), self.stock_lines),
+                                      (SensorsDataFormatter(_ConstantEventTypeClassifier()), self.sensor_lines)]:
+            assert all(data_formatter.peek_event_type(line) is None for line in lines), \
+                "%s: an event type was peeked for a custom classifier" % (type(data_formatter).__name__,)
+
+    def test_skipped_event_serial_numbers(self):
+        """
+        In the data-parallel mode, each raw event is assigned a serial number once by the classifying thread, whether
+        it is parsed or skipped as irrelevant, and once more by the execution unit it is sent to.
+        """
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b")),
+            EqCondition(Variable("a", lambda x: x["Opening Price"]), Variable("b", lambda x: x["Opening Price"])),
+            timedelta(minutes=5))
+        cep = CEP([pattern], parallel_execution_params=DataParallelExecutionParametersHirzelAlgorithm(
+            units_number=2, key="Opening Price"))
+        relevant_event_count = len([line for line in self.stock_lines if line.split(",")[0] in ("AAPL", "AMZN")])
+        counter_before_run = Event.counter
+        cep.run(FileInputStream(DATA_FORMATTER_TESTS_STOCKS_FILE_PATH), Stream(), MetastockDataFormatter())
+        assert 0 < relevant_event_count < len(self.stock_lines) and \
+            Event.counter - counter_before_run == len(self.stock_lines) + relevant_event_count, \
+            "DataParallelExecutionAlgorithm: the skipped events were not accounted for"
+
+    def run_tests(self):
+        self.test_peeked_types()
+        self.test_custom_classifier()
+        self.test_skipped_event_serial_numbers()
@@ -0,0 +1,46 @@
+import os
+import pathlib
+
+from base.Event import Event
+from base.PatternMatch import PatternMatch
+from plugin.stocks.Stocks import MetastockDataFormatter
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+PATTERN_MATCH_TESTS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+
+
+def run_pattern_match_tests():
+    pattern_match_test = TestPatternMatch()
+    pattern_match_test.run_tests()
+    print("Pattern match unit tests executed successfully.")
+
+
+class TestPatternMatch:
+    def __init__(self):
+        data_formatter = MetastockDataFormatter()
+        with open(PATTERN_MATCH_TESTS_FILE_PATH, "r") as f:
+            self.events = [Event(line, data_formatter) for line in f.readlines()[:10]]
+
+    def test_timestamps(self):
+        events = [self.events[5], self.events[2], self.events[7]]
+        pattern_match = PatternMatch(events)
+        assert pattern_match.first_timestamp == min(e.timestamp for e in events) and \
+            pattern_match.last_timestamp == max(e.timestamp for e in events), "PatternMatch: incorrect timestamps"
+        given_timestamps_match = PatternMatch(events, first_timestamp=self.events[0].timestamp,
+                                              last_timestamp=self.events[9].timestamp)
+        assert given_timestamps_match.first_timestamp == self.events[0].timestamp and \
+            given_timestamps_match.last_timestamp == self.events[9].timestamp, \
+            "PatternMatch: the given timestamps were not used"
+
+    def test_compact_representation(self):
+        pattern_match = PatternMatch(self.events[:2])
+        assert not hasattr(pattern_match, "__dict__") and not hasattr(self.events[0], "__dict__"), \
+            "PatternMatch: an attribute dictionary was allocated"
+        pattern_match.add_pattern_id(3)
+        pattern_match.add_pattern_id(3)
+        assert list(pattern_match.pattern_ids) == [3], "PatternMatch: incorrect pattern IDs"
+
+    def run_tests(self):
+        self.test_timestamps()
+        self.test_compact_representation()
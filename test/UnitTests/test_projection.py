@@ -0,0 +1,138 @@
+import os
+import pathlib
+from datetime import timedelta
+
+from CEP import CEP
+from base.Pattern import Pattern
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure
+from condition.BaseRelationCondition import GreaterThanCondition, SmallerThanCondition
+from condition.CompositeCondition import AndCondition
+from condition.Condition import Variable, BinaryCondition
+from plugin.sensors.Sensors import SensorsDataFormatter
+from plugin.stocks.Stocks import MetastockDataFormatter, METASTOCK_MANDATORY_KEYS
+from stream.FileStream import FileInputStream
+from stream.Stream import Stream
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+PROJECTION_TESTS_STOCKS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+PROJECTION_TESTS_SENSORS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/Sensors_short.dat")
+
+
+def run_projection_tests():
+    attribute_names_test = TestAttributeNames()
+    attribute_names_test.run_tests()
+    projection_test = TestProjection()
+    projection_test.run_tests()
+    print("Attribute projection unit tests executed successfully.")
+
+
+"""
+ATTRIBUTE NAMES EXTRACTION
+"""
+
+
+class TestAttributeNames:
+    def test_condition_attribute_names(self):
+        condition = AndCondition(
+            GreaterThanCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Opening Price"])),
+            BinaryCondition(Variable("b", lambda x: x["Volume"] * 2), 100, relation_op=lambda x, y: x > y))
+        assert condition.get_attribute_names() == {"Peak Price", "Opening Price", "Volume"}, \
+            "Condition: incorrect attribute names"
+
+    def test_untraceable_condition(self):
+        condition = AndCondition(
+            GreaterThanCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Opening Price"])),
+            BinaryCondition(Variable("a", lambda x: x["Stock Ticker"].lower()), "goog",
+                            relation_op=lambda x, y: x == y))
+        assert condition.get_attribute_names() is None, "Condition: untraceable attribute getter was not detected"
+
+    def test_opaque_getters(self):
+        for getattr_func in [lambda x: x, lambda x: sum(x.values()), lambda x: (x, x["Volume"]),
+                             lambda x: [x[key] for key in x.keys()], lambda x: len(x)]:
+            assert Variable("a", getattr_func).get_attribute_names() is None, \
+                "Condition: a getter accessing the entire payload was not detected"
+
+    def test_value_dependent_getters(self):
+        for getattr_func in [lambda x: x["Opening Price"] if x["Volume"] > 5 else x["Peak Price"],
+                             lambda x: max(x["Opening Price"], x["Peak Price"]),
+                             lambda x: x["Volume"] if "Volume" in x else 0]:
+            assert Variable("a", getattr_func).get_attribute_names() is None, \
+                "Condition: a value-dependent getter was not detected"
+        assert Variable("a", lambda x: float(x["Volume"]) / x["Peak Price"] >= 2).get_attribute_names() == \
+            {"Volume", "Peak Price"}, "Condition: incorrect attribute names of an arithmetic getter"
+
+    def run_tests(self):
+        self.test_condition_attribute_names()
+        self.test_untraceable_condition()
+        self.test_opaque_getters()
+        self.test_value_dependent_getters()
+
+
+"""
+PROJECTION
+"""
+
+
+class TestProjection:
+    @staticmethod
+    def run_cep(pattern: Pattern, file_path: str, data_formatter, enable_attribute_projection: bool):
+        matches = Stream()
+        CEP([pattern]).run(FileInputStream(file_path), matches, data_formatter, enable_attribute_projection)
+        return list(matches)
+
+    def test_stocks(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("GOOG", "a"), PrimitiveEventStructure("GOOG", "b")),
+            SmallerThanCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])),
+            timedelta(minutes=3))
+        data_formatter = MetastockDataFormatter()
+        expected_matches = self.run_cep(pattern, PROJECTION_TESTS_STOCKS_FILE_PATH, data_formatter, False)
+        actual_matches = self.run_cep(pattern, PROJECTION_TESTS_STOCKS_FILE_PATH, data_formatter, True)
+        assert len(expected_matches) > 0 and len(actual_matches) == len(expected_matches), \
+            "Projection: incorrect number of matches"
+        required_attributes = METASTOCK_MANDATORY_KEYS | {"Peak Price"}
+        for expected_match, actual_match in zip(expected_matches, actual_matches):
+            for expected_event, actual_event in zip(expected_match.events, actual_match.events):
+                assert expected_event.timestamp == actual_event.timestamp and \
+                    expected_event.payload["Peak Price"] == actual_event.payload["Peak Price"], \
+                    "Projection: incorrect match"
+                assert set(actual_event.payload.keys()) - {actual_event.INDEX_ATTRIBUTE_NAME} <= required_attributes, \
+                    "Projection: unnecessary attributes were parsed"
+        # the projection must be reset after the run
+        assert "Volume" in data_formatter.parse_event(FileInputStream(PROJECTION_TESTS_STOCKS_FILE_PATH).first()), \
+            "Projection: the projection was not reset"
+
+    def test_sensors(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("Magnetometer", "a"), PrimitiveEventStructure("Accelerometer", "b")),
+            GreaterThanCondition(Variable("a", lambda x: x["MagX"]), Variable("b", lambda x: x["AccX"])),
+            timedelta(minutes=1))
+        data_formatter = SensorsDataFormatter()
+        expected_matches = self.run_cep(pattern, PROJECTION_TESTS_SENSORS_FILE_PATH, data_formatter, False)
+        actual_matches = self.run_cep(pattern, PROJECTION_TESTS_SENSORS_FILE_PATH, data_formatter, True)
+        assert len(expected_matches) > 0 and len(actual_matches) == len(expected_matches), \
+            "Projection: incorrect number of matches"
+        for expected_match, actual_match in zip(expected_matches, actual_matches):
+            assert [e.timestamp for e in expected_match.events] == [e.timestamp for e in actual_match.events], \
+                "Projection: incorrect match"
+            assert "MagY" not in actual_match.events[0].payload and "AccY" not in actual_match.events[1].payload, \
+                "Projection: unnecessary attributes were parsed"
+
+    def test_opaque_condition(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("GOOG", "b")),
+            BinaryCondition(Variable("a", lambda x: x), Variable("b", lambda x: x),
+                            relation_op=lambda x, y: x["Opening Price"] < y["Opening Price"]),
+            timedelta(minutes=3))
+        data_formatter = MetastockDataFormatter()
+        expected_matches = self.run_cep(pattern, PROJECTION_TESTS_STOCKS_FILE_PATH, data_formatter, False)
+        actual_matches = self.run_cep(pattern, PROJECTION_TESTS_STOCKS_FILE_PATH, data_formatter, True)
+        assert len(expected_matches) > 0 and \
+            sorted(str(match) for match in actual_matches) == sorted(str(match) for match in expected_matches), \
+            "Projection: incorrect matches for a condition accessing the entire payloads"
+
+    def run_tests(self):
+        self.test_stocks()
+        self.test_sensors()
+        self.test_opaque_condition()
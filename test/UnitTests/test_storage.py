@@ -1,8 +1,31 @@
+import os
+import pathlib
+
+from CEP import CEP
+from base.Pattern import Pattern
 from base.PatternMatch import PatternMatch
-from tree.PatternMatchStorage import SortedPatternMatchStorage, UnsortedPatternMatchStorage, EquationSides
+from base.PatternStructure import AndOperator, PrimitiveEventStructure
+from condition.BaseRelationCondition import SmallerThanCondition
+from condition.Condition import Variable
+from evaluation.EvaluationMechanismFactory import TreeBasedEvaluationMechanismParameters
+from plugin.stocks.Stocks import MetastockDataFormatter
+from stream.FileStream import FileInputStream
+from stream.Stream import Stream
+from tree.PatternMatchStorage import SortedPatternMatchStorage, UnsortedPatternMatchStorage, EquationSides, \
+    HashedPatternMatchStorage, ColumnarPatternMatchStorage, TreeStorageParameters
+from tree.CleanUpPolicies import CleanUpPolicies
+from tree.LoadSheddingPolicies import LoadSheddingPolicies
 from datetime import datetime, timedelta
 from condition.Condition import RelopTypes
+from misc.BlockedSortedList import BlockedSortedList
+from misc.ArrivalOrderedBuffer import ArrivalOrderedBuffer
+from misc.BlockedSortedList import RangeView
+from misc.ColumnarSortedList import ColumnarSortedList
+import random
 
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+STORAGE_TESTS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
 
 """
 Event for these tests only
@@ -30,6 +53,19 @@ def run_storage_tests():
     unsorted_storage_test.run_tests()
     sorted_storage_test = TestSortedStorage()
     sorted_storage_test.run_tests()
+    hashed_storage_test = TestHashedStorage()
+    hashed_storage_test.run_tests()
+    blocked_sorted_list_test = TestBlockedSortedList()
+    blocked_sorted_list_test.run_tests()
+    arrival_ordered_buffer_test = TestArrivalOrderedBuffer()
+    arrival_ordered_buffer_test.run_tests()
+    clean_up_policies_test = TestCleanUpPolicies()
+    clean_up_policies_test.run_tests()
+    load_shedding_test = TestLoadShedding()
+    load_shedding_test.run_tests()
+    if ColumnarPatternMatchStorage.is_supported():  # NumPy might not be installed
+        columnar_storage_test = TestColumnarStorage()
+        columnar_storage_test.run_tests()
     print("PatternMatchStorage unit tests executed successfully.")
 
 
@@ -226,6 +262,466 @@ class TestSortedStorage:
                 result_pms[i].first_timestamp <= self.pm_list[2].first_timestamp
             ), "SortedPatternMatchStorage: get_smaller_or_equal returned incorrect pm[i]"
 
+    def test_key_calculated_once(self):
+        calls = []
+
+        def key(pm):
+            calls.append(pm)
+            return pm.first_timestamp
+
+        s = SortedPatternMatchStorage(key, RelopTypes.SmallerEqual, EquationSides.left, True)
+        for i in reversed(range(10)):
+            s.add(self.pm_list[i])
+        result_pms = s.get(self.dt + timedelta(40))
+        assert list(result_pms) == self.pm_list[:5], "SortedPatternMatchStorage: get returned incorrect pms"
+        s._clean_expired_partial_matches(self.dt + timedelta(20))
+        assert list(s.get(self.dt + timedelta(40))) == self.pm_list[2:5], \
+            "SortedPatternMatchStorage: incorrect pms after cleanup"
+        assert len(calls) == 10, "SortedPatternMatchStorage: the key was calculated more than once per pm"
+
     def run_tests(self):
         self.test_add()
         self.test_get()
+        self.test_key_calculated_once()
+
+
+"""
+HASHED STORAGE
+"""
+
+
+class TestHashedStorage:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(10):
+            self.pm_list.append(PatternMatch([Event(i % 3, "type", self.dt + timedelta(i * 10))]))
+
+    def test_get(self):
+        h_s = HashedPatternMatchStorage(lambda x: x.events[0].payload, 0)
+        for pm in self.pm_list:
+            h_s.add(pm)
+        assert len(h_s) == 10, "HashedPatternMatchStorage: incorrect size"
+        assert list(h_s.get(1)) == [self.pm_list[1], self.pm_list[4], self.pm_list[7]], \
+            "HashedPatternMatchStorage: get returned incorrect pms"
+        assert h_s.get(3) == [], "HashedPatternMatchStorage: get returned pms for a missing key"
+        assert self.pm_list[5] in h_s, "HashedPatternMatchStorage: stored pm was not found"
+
+    def test_clean_expired_partial_matches(self):
+        for in_leaf in [True, False]:
+            h_s = HashedPatternMatchStorage(lambda x: x.events[0].payload, 0, in_leaf)
+            for pm in self.pm_list:
+                h_s.add(pm)
+            bucket_iterator = iter(h_s.get(0))
+            h_s._clean_expired_partial_matches(self.dt + timedelta(35))
+            assert list(h_s) == self.pm_list[4:], "HashedPatternMatchStorage: incorrect buffer after cleanup"
+            assert list(h_s.get(0)) == [self.pm_list[6], self.pm_list[9]] and \
+                list(h_s.get(1)) == [self.pm_list[4], self.pm_list[7]] and \
+                list(h_s.get(2)) == [self.pm_list[5], self.pm_list[8]], \
+                "HashedPatternMatchStorage: incorrect buckets after cleanup"
+            assert len(list(bucket_iterator)) == 4, \
+                "HashedPatternMatchStorage: an ongoing iteration was affected by the cleanup"
+            h_s._clean_expired_partial_matches(self.dt + timedelta(100))
+            assert len(h_s) == 0 and h_s.get(0) == [], "HashedPatternMatchStorage: storage was not emptied"
+
+    def test_clean_expired_partial_matches_out_of_order(self):
+        h_s = HashedPatternMatchStorage(lambda x: x.events[0].payload, 0)
+        shuffled_pm_list = self.pm_list[5:] + self.pm_list[:5]
+        for pm in shuffled_pm_list:
+            h_s.add(pm)
+        h_s._clean_expired_partial_matches(self.dt + timedelta(35))
+        assert list(h_s) == self.pm_list[5:] + [self.pm_list[4]], \
+            "HashedPatternMatchStorage: incorrect buffer after cleanup"
+        assert list(h_s.get(1)) == [self.pm_list[7], self.pm_list[4]] and \
+            list(h_s.get(0)) == [self.pm_list[6], self.pm_list[9]], \
+            "HashedPatternMatchStorage: incorrect buckets after cleanup"
+
+    def test_unhashable_keys(self):
+        for in_leaf in [True, False]:
+            h_s = HashedPatternMatchStorage(lambda x: x.events[0].payload, 0, in_leaf)
+            unhashable_pm_list = [PatternMatch([Event([i % 2], "type", self.dt + timedelta(i * 10))])
+                                  for i in range(6)]
+            for pm in unhashable_pm_list:
+                h_s.add(pm)
+            assert len(h_s) == 6, "HashedPatternMatchStorage: incorrect size for unhashable keys"
+            assert list(h_s.get([1])) == unhashable_pm_list[1::2], \
+                "HashedPatternMatchStorage: get returned incorrect pms for an unhashable key"
+            assert unhashable_pm_list[2] in h_s, "HashedPatternMatchStorage: stored pm was not found"
+            h_s._clean_expired_partial_matches(self.dt + timedelta(25))
+            assert list(h_s.get([1])) == [unhashable_pm_list[3], unhashable_pm_list[5]] and len(h_s) == 3, \
+                "HashedPatternMatchStorage: incorrect contents after cleanup"
+
+    def run_tests(self):
+        self.test_get()
+        self.test_clean_expired_partial_matches()
+        self.test_clean_expired_partial_matches_out_of_order()
+        self.test_unhashable_keys()
+
+
+"""
+BLOCKED SORTED LIST
+"""
+
+
+class TestBlockedSortedList:
+    def __init__(self):
+        random.seed(0)
+        self.keys = [random.randint(0, 50) for _ in range(300)]
+
+    def create_list(self):
+        sorted_list = BlockedSortedList(block_size=4)
+        for i, key in enumerate(self.keys):
+            sorted_list.add((key, i), key)
+        return sorted_list
+
+    def test_add(self):
+        sorted_list = self.create_list()
+        expected_items = sorted((key, i) for i, key in enumerate(self.keys))
+        assert len(sorted_list) == len(expected_items), "BlockedSortedList: incorrect size"
+        assert list(sorted_list) == expected_items, "BlockedSortedList: incorrect order"
+        assert sorted_list[17] == expected_items[17] and sorted_list[-1] == expected_items[-1] and \
+            sorted_list[5:9] == expected_items[5:9], "BlockedSortedList: incorrect item access"
+
+    def test_ranges(self):
+        sorted_list = self.create_list()
+        sorted_keys = sorted(self.keys)
+        for key in [-1, 0, 17, 25, 50, 51]:
+            start, end = sorted_list.bisect_left(key), sorted_list.bisect_right(key)
+            assert start == len([k for k in sorted_keys if k < key]) and \
+                end == len([k for k in sorted_keys if k <= key]), "BlockedSortedList: incorrect bisection"
+            view = sorted_list.get_range(start, end)
+            assert len(view) == end - start and [item[0] for item in view] == [key] * (end - start), \
+                "BlockedSortedList: incorrect range view"
+            complement = sorted_list.get_range_complement(start, end)
+            expected_complement = [item for item in sorted_list if item[0] != key]
+            assert len(complement) == len(expected_complement) and list(complement) == expected_complement and \
+                complement[0] == expected_complement[0] and complement[-1] == expected_complement[-1], \
+                "BlockedSortedList: incorrect range complement view"
+
+    def test_removal(self):
+        sorted_list = self.create_list()
+        expected_items = sorted((key, i) for i, key in enumerate(self.keys))
+        iterator = iter(sorted_list)
+        sorted_list.remove_first(100)
+        assert list(sorted_list) == expected_items[100:], "BlockedSortedList: incorrect removal of first items"
+        assert list(iterator) == expected_items, "BlockedSortedList: removal affected an ongoing iteration"
+        sorted_list.filter(lambda item: item[1] % 2 == 0)
+        expected_items = [item for item in expected_items[100:] if item[1] % 2 == 0]
+        assert list(sorted_list) == expected_items, "BlockedSortedList: incorrect filtering"
+        assert sorted_list.bisect_left(30) == len([item for item in expected_items if item[0] < 30]), \
+            "BlockedSortedList: incorrect bisection after removal"
+
+    def run_tests(self):
+        self.test_add()
+        self.test_ranges()
+        self.test_removal()
+
+
+"""
+ARRIVAL ORDERED BUFFER
+"""
+
+
+class TestArrivalOrderedBuffer:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(10):
+            self.pm_list.append(PatternMatch([Event(i, "type", self.dt + timedelta(i * 10))]))
+
+    def test_access(self):
+        buffer = ArrivalOrderedBuffer()
+        for i in range(20):
+            buffer.append(i, i // 2)
+        buffer.remove_first(3)
+        assert len(buffer) == 17 and list(buffer) == list(range(3, 20)), "ArrivalOrderedBuffer: incorrect contents"
+        assert buffer[0] == 3 and buffer[-1] == 19 and buffer[2:5] == [5, 6, 7], \
+            "ArrivalOrderedBuffer: incorrect item access"
+        assert buffer.bisect_left(4) == 5 and buffer.bisect_right(4) == 7 and buffer.bisect_left(0) == 0, \
+            "ArrivalOrderedBuffer: incorrect bisection"
+        assert list(buffer.get_range(5, 7)) == [8, 9] and \
+            list(buffer.get_range_complement(1, 16)) == [3, 19], "ArrivalOrderedBuffer: incorrect range view"
+        buffer[0] = (30, 1)
+        del buffer[1]
+        assert list(buffer)[:3] == [30, 5, 6] and len(buffer) == 16, "ArrivalOrderedBuffer: incorrect modification"
+
+    def test_removal(self):
+        buffer = ArrivalOrderedBuffer()
+        for i in range(10):
+            buffer.append(i, i)
+        iterator = iter(buffer)
+        buffer.remove_while(lambda item: item < 6)
+        assert list(buffer) == [6, 7, 8, 9], "ArrivalOrderedBuffer: incorrect removal of first items"
+        assert list(iterator) == list(range(10)), "ArrivalOrderedBuffer: removal affected an ongoing iteration"
+        buffer.append(10, 10)
+        buffer.remove_while(lambda item: item < 100)
+        assert len(buffer) == 0 and list(buffer) == [], "ArrivalOrderedBuffer: incorrect removal of all items"
+
+    def test_storage_cleanup(self):
+        s = SortedPatternMatchStorage(lambda x: x.first_timestamp, RelopTypes.Greater, EquationSides.left, 100,
+                                      True, True, True)
+        for pm in self.pm_list:
+            s.add(pm)
+        # an arrival-ordered storage is cleaned regardless of the cleanup interval
+        s.try_clean_expired_partial_matches(self.dt + timedelta(35))
+        assert list(s) == self.pm_list[4:], "SortedPatternMatchStorage: incorrect arrival-ordered cleanup"
+        assert list(s.get(self.dt + timedelta(60))) == self.pm_list[7:], \
+            "SortedPatternMatchStorage: incorrect get after arrival-ordered cleanup"
+
+    def run_tests(self):
+        self.test_access()
+        self.test_removal()
+        self.test_storage_cleanup()
+
+
+"""
+CLEANUP POLICIES
+"""
+
+
+class TestCleanUpPolicies:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(10):
+            self.pm_list.append(PatternMatch([Event(i, "type", self.dt + timedelta(i * 10))]))
+
+    def test_fixed_interval(self):
+        s = UnsortedPatternMatchStorage(4)
+        for pm in self.pm_list[:3]:
+            s.add(pm)
+        s.try_clean_expired_partial_matches(self.dt + timedelta(15))
+        assert len(s) == 3 and s.get_clean_up_statistics().clean_up_count == 0, \
+            "UnsortedPatternMatchStorage: cleanup performed before the interval has passed"
+        s.add(self.pm_list[3])
+        s.try_clean_expired_partial_matches(self.dt + timedelta(15))
+        statistics = s.get_clean_up_statistics()
+        assert len(s) == 2 and statistics.clean_up_count == 1 and statistics.examined_count == 4 and \
+            statistics.removed_count == 2 and statistics.peak_size == 4, \
+            "UnsortedPatternMatchStorage: incorrect fixed interval cleanup"
+
+    def test_adaptive(self):
+        s = UnsortedPatternMatchStorage(1)
+        s.set_clean_up_policy(CleanUpPolicies.ADAPTIVE, 0.25)
+        for pm in reversed(self.pm_list):
+            s.add(pm)
+        # only 1 of the 10 matches is expected to have expired
+        s.try_clean_expired_partial_matches(self.dt + timedelta(5))
+        assert len(s) == 10 and s.get_clean_up_statistics().clean_up_count == 0, \
+            "UnsortedPatternMatchStorage: adaptive cleanup performed too early"
+        s.try_clean_expired_partial_matches(self.dt + timedelta(35))
+        assert list(s) == list(reversed(self.pm_list[4:])) and s.get_clean_up_statistics().clean_up_count == 1, \
+            "UnsortedPatternMatchStorage: incorrect adaptive cleanup"
+        s.try_clean_expired_partial_matches(self.dt + timedelta(45))
+        assert len(s) == 6 and s.get_clean_up_statistics().clean_up_count == 1, \
+            "UnsortedPatternMatchStorage: adaptive cleanup performed too early"
+        s.try_clean_expired_partial_matches(self.dt + timedelta(100))
+        statistics = s.get_clean_up_statistics()
+        assert len(s) == 0 and statistics.clean_up_count == 2 and statistics.removed_count == 10, \
+            "UnsortedPatternMatchStorage: incorrect adaptive cleanup"
+
+    def run_tests(self):
+        self.test_fixed_interval()
+        self.test_adaptive()
+
+
+"""
+LOAD SHEDDING
+"""
+
+
+class TestLoadShedding:
+    def __init__(self):
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(30):
+            self.pm_list.append(PatternMatch([Event(i % 3, "type", self.dt + timedelta(i))], probability=(i % 10) / 10))
+
+    def create_storages(self):
+        return [UnsortedPatternMatchStorage(100),
+                SortedPatternMatchStorage(lambda x: x.events[0].payload, RelopTypes.Greater, EquationSides.left, 100),
+                SortedPatternMatchStorage(lambda x: x.first_timestamp, RelopTypes.Greater, EquationSides.left, 100,
+                                          True, True),
+                HashedPatternMatchStorage(lambda x: x.events[0].payload, 100),
+                HashedPatternMatchStorage(lambda x: x.events[0].payload, 100, True)]
+
+    def test_drop_oldest(self):
+        for s in self.create_storages():
+            s.set_load_shedding_policy(20, LoadSheddingPolicies.DROP_OLDEST)
+            for pm in self.pm_list:
+                s.add(pm)
+            # whenever the storage is full, the oldest 10% of its budget are dropped
+            assert len(s) == 20 and s.get_shed_count() == 10, "%s: incorrect load shedding" % (type(s).__name__,)
+            assert sorted(s, key=lambda pm: pm.first_timestamp) == self.pm_list[10:], "%s: incorrect matches were shed" % (type(s).__name__,)
+        s = HashedPatternMatchStorage(lambda x: x.events[0].payload, 100)
+        s.set_load_shedding_policy(20, LoadSheddingPolicies.DROP_OLDEST)
+        for pm in self.pm_list:
+            s.add(pm)
+        assert list(s.get(0)) == [pm for pm in self.pm_list[10:] if pm.events[0].payload == 0], \
+            "HashedPatternMatchStorage: incorrect buckets after load shedding"
+
+    def test_drop_lowest_probability(self):
+        s = UnsortedPatternMatchStorage(100)
+        s.set_load_shedding_policy(20, LoadSheddingPolicies.DROP_LOWEST_PROBABILITY)
+        for pm in self.pm_list:
+            s.add(pm)
+        assert len(s) == 20 and s.get_shed_count() == 10, "UnsortedPatternMatchStorage: incorrect load shedding"
+        assert min(pm.probability for pm in s) >= 0.3 and s[-1] == self.pm_list[-1], \
+            "UnsortedPatternMatchStorage: incorrect matches were shed"
+
+    def test_random_sampling(self):
+        random.seed(0)
+        for s in self.create_storages():
+            s.set_load_shedding_policy(20, LoadSheddingPolicies.RANDOM_SAMPLING)
+            for pm in self.pm_list:
+                s.add(pm)
+            assert len(s) == 20 and s.get_shed_count() == 10 and all(pm in self.pm_list for pm in s), \
+                "%s: incorrect load shedding" % (type(s).__name__,)
+
+    def run_tests(self):
+        self.test_drop_oldest()
+        self.test_drop_lowest_probability()
+        self.test_random_sampling()
+
+
+"""
+COLUMNAR STORAGE
+"""
+
+
+class TestColumnarStorage:
+    def __init__(self):
+        random.seed(0)
+        self.dt = datetime(2020, 1, 1)
+        self.pm_list = []
+        for i in range(100):
+            self.pm_list.append(PatternMatch([Event(random.randint(0, 20), "type", self.dt + timedelta(i))]))
+
+    def test_get(self):
+        for rel_op in [RelopTypes.Equal, RelopTypes.NotEqual, RelopTypes.Greater, RelopTypes.Smaller,
+                       RelopTypes.GreaterEqual, RelopTypes.SmallerEqual]:
+            for equation_side in [EquationSides.left, EquationSides.right]:
+                c_s = ColumnarPatternMatchStorage(lambda x: x.events[0].payload, rel_op, equation_side, 10)
+                s = SortedPatternMatchStorage(lambda x: x.events[0].payload, rel_op, equation_side, 10)
+                for pm in self.pm_list:
+                    c_s.add(pm)
+                    s.add(pm)
+                assert list(c_s) == list(s), "ColumnarPatternMatchStorage: incorrect order"
+                for value in [-1, 0, 7, 20, 21, 3.5]:
+                    assert list(c_s.get(value)) == list(s.get(value)), \
+                        "ColumnarPatternMatchStorage: get returned incorrect pms"
+
+    def test_clean_expired_partial_matches(self):
+        c_s = ColumnarPatternMatchStorage(lambda x: x.events[0].payload, RelopTypes.Greater, EquationSides.left, 10)
+        for pm in self.pm_list:
+            c_s.add(pm)
+        c_s._clean_expired_partial_matches(self.dt + timedelta(50))
+        expected_pms = sorted(self.pm_list[50:], key=lambda pm: pm.events[0].payload)
+        assert list(c_s) == expected_pms, "ColumnarPatternMatchStorage: incorrect cleanup"
+        assert list(c_s.get(10)) == [pm for pm in expected_pms if pm.events[0].payload > 10], \
+            "ColumnarPatternMatchStorage: get returned incorrect pms after cleanup"
+
+    def test_arrival_order(self):
+        c_s = ColumnarPatternMatchStorage(lambda x: x.first_timestamp, RelopTypes.Smaller, EquationSides.left, 10,
+                                          True, True)
+        for pm in self.pm_list:
+            c_s.add(pm)
+        c_s._clean_expired_partial_matches(self.dt + timedelta(30))
+        assert list(c_s) == self.pm_list[30:], "ColumnarPatternMatchStorage: incorrect arrival-ordered cleanup"
+        assert list(c_s.get(self.dt + timedelta(40))) == self.pm_list[30:40], \
+            "ColumnarPatternMatchStorage: get returned incorrect pms for timestamp keys"
+        del c_s[0]
+        c_s.add(self.pm_list[-1])
+        assert list(c_s) == self.pm_list[31:] + [self.pm_list[-1]] and \
+            list(c_s.get(self.dt + timedelta(32))) == [self.pm_list[31]], \
+            "ColumnarPatternMatchStorage: incorrect removal"
+
+    def test_views(self):
+        c_s = ColumnarPatternMatchStorage(lambda x: x.events[0].payload, RelopTypes.NotEqual, EquationSides.left, 10)
+        for pm in self.pm_list:
+            c_s.add(pm)
+        assert isinstance(c_s.get(7), RangeView), "ColumnarPatternMatchStorage: get copied the pattern matches"
+        assert self.pm_list[0] in c_s, "ColumnarPatternMatchStorage: a stored pattern match was not found"
+
+    def test_non_numeric_keys(self):
+        for in_leaf in [True, False]:
+            c_s = ColumnarPatternMatchStorage(lambda x: x.events[0].payload, RelopTypes.Smaller, EquationSides.left,
+                                              10, False, in_leaf)
+            s = SortedPatternMatchStorage(lambda x: x.events[0].payload, RelopTypes.Smaller, EquationSides.left, 10)
+            string_pm_list = [PatternMatch([Event("key%02d" % (pm.events[0].payload,), "type", pm.first_timestamp)])
+                              for pm in self.pm_list]
+            for pm in string_pm_list:
+                c_s.add(pm)
+                s.add(pm)
+            assert list(c_s) == list(s) and list(c_s.get("key10")) == list(s.get("key10")), \
+                "ColumnarPatternMatchStorage: incorrect pms for non-numeric keys"
+            assert string_pm_list[0] in c_s, "ColumnarPatternMatchStorage: a stored pattern match was not found"
+            c_s._clean_expired_partial_matches(self.dt + timedelta(50))
+            s._clean_expired_partial_matches(self.dt + timedelta(50))
+            assert list(c_s) == list(s), "ColumnarPatternMatchStorage: incorrect cleanup for non-numeric keys"
+
+    def test_non_numeric_pattern(self):
+        pattern = Pattern(
+            AndOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("GOOG", "b")),
+            SmallerThanCondition(Variable("a", lambda x: x["Stock Ticker"]),
+                                 Variable("b", lambda x: x["Stock Ticker"])),
+            timedelta(minutes=5))
+        matches_by_storage = []
+        for use_columnar_storage in [True, False]:
+            storage_params = TreeStorageParameters(sort_storage=True, use_columnar_storage=use_columnar_storage)
+            matches = Stream()
+            CEP([pattern], TreeBasedEvaluationMechanismParameters(storage_params=storage_params)).run(
+                FileInputStream(STORAGE_TESTS_FILE_PATH), matches, MetastockDataFormatter())
+            matches_by_storage.append(sorted(str(match) for match in matches))
+        assert len(matches_by_storage[1]) > 0 and matches_by_storage[0] == matches_by_storage[1], \
+            "ColumnarPatternMatchStorage: incorrect matches for non-numeric keys"
+
+    def test_sorted_list(self):
+        columnar_list = ColumnarSortedList(block_size=4)
+        blocked_list = BlockedSortedList(block_size=4)
+        for i in range(200):
+            key = random.randint(0, 50)
+            columnar_list.add(i, key, i)
+            blocked_list.add(i, key)
+        assert list(columnar_list) == list(blocked_list), "ColumnarSortedList: incorrect order"
+        for key in [-1, 0, 25, 50, 51, 24.5]:
+            assert columnar_list.bisect_left(key) == blocked_list.bisect_left(key) and \
+                columnar_list.bisect_right(key) == blocked_list.bisect_right(key), "ColumnarSortedList: incorrect search"
+        assert list(columnar_list.get_range(10, 100)) == list(blocked_list.get_range(10, 100)) and \
+            list(columnar_list.get_range_complement(10, 190)) == list(blocked_list.get_range_complement(10, 190)), \
+            "ColumnarSortedList: incorrect views"
+        columnar_list.remove_expired(100)
+        blocked_list.filter(lambda i: i >= 100)
+        assert list(columnar_list) == list(blocked_list), "ColumnarSortedList: incorrect removal of expired items"
+        columnar_list.filter(lambda i: i % 2 == 0)
+        blocked_list.filter(lambda i: i % 2 == 0)
+        del columnar_list[3]
+        del blocked_list[3]
+        columnar_list.add(-1, 20.5, 0.5)
+        blocked_list.add(-1, 20.5)
+        assert list(columnar_list) == list(blocked_list) and columnar_list.bisect_left(20.5) == \
+            blocked_list.bisect_left(20.5), "ColumnarSortedList: incorrect order after the keys became non-integer"
+
+    def test_timestamp_types(self):
+        columnar_list = ColumnarSortedList(block_size=4)
+        for i in range(10):
+            columnar_list.append(i, i, i)
+        # both the keys and the timestamps must be converted once a non-integer value is added
+        columnar_list.append(10, 10, 10.5)
+        assert columnar_list.bisect_timestamp_left(10.25) == 10 and columnar_list.bisect_timestamp_left(10.5) == 10, \
+            "ColumnarSortedList: a non-integer timestamp was truncated"
+        columnar_list.remove_expired(10.25)
+        assert list(columnar_list) == [10], "ColumnarSortedList: a non-integer timestamp was truncated"
+        columnar_list.remove_first(1)
+        assert len(columnar_list) == 0 and columnar_list.bisect_timestamp_left(0) == 0, \
+            "ColumnarSortedList: incorrect removal"
+
+    def run_tests(self):
+        self.test_get()
+        self.test_clean_expired_partial_matches()
+        self.test_arrival_order()
+        self.test_views()
+        self.test_non_numeric_keys()
+        self.test_non_numeric_pattern()
+        self.test_sorted_list()
+        self.test_timestamp_types()
@@ -0,0 +1,238 @@
+import os
+import pathlib
+from datetime import timedelta
+
+from misc.TimestampUnits import TimestampUnits
+from plugin.sensors.Sensors import SensorsDataFormatter, SENSORS_TIMESTAMP_KEY, SENSORS_KEYS_DICT
+from plugin.stocks.Stocks import MetastockDataFormatter
+from stream.BinaryFileStream import BinaryFileInputStream, BinaryEventFileHeader, convert_to_binary_event_file, \
+    MAX_STRING_TABLE_VALUES_PER_ATTRIBUTE
+from stream.FileStream import FileInputStream, FileOutputStream
+from stream.Stream import Stream, ThreadSafeStream
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+STREAM_TESTS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+STREAM_TESTS_OUTPUT_DIRECTORY = os.path.join(absolutePath, "test/Matches")
+STREAM_TESTS_OUTPUT_FILE_NAME = "FileOutputStreamUnitTest.txt"
+STREAM_TESTS_SENSORS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/Sensors_short.dat")
+STREAM_TESTS_LONG_SENSORS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/Sensors.dat")
+STREAM_TESTS_BINARY_FILE_NAME = "BinaryFileStreamUnitTest.bin"
+
+
+def run_stream_tests():
+    file_input_stream_test = TestFileInputStream()
+    file_input_stream_test.run_tests()
+    file_output_stream_test = TestFileOutputStream()
+    file_output_stream_test.run_tests()
+    binary_file_stream_test = TestBinaryFileStream()
+    binary_file_stream_test.run_tests()
+    stream_test = TestStream()
+    stream_test.run_tests()
+    print("Stream unit tests executed successfully.")
+
+
+"""
+FILE INPUT STREAM
+"""
+
+
+class TestFileInputStream:
+    def __init__(self):
+        with open(STREAM_TESTS_FILE_PATH, "r") as f:
+            self.lines = f.readlines()
+
+    def test_read(self):
+        stream = FileInputStream(STREAM_TESTS_FILE_PATH, chunk_size=7)
+        assert list(stream) == self.lines, "FileInputStream: lines were not read in order"
+        assert list(stream) == [], "FileInputStream: exhausted stream returned lines"
+
+    def test_first_last_count(self):
+        stream = FileInputStream(STREAM_TESTS_FILE_PATH, chunk_size=7)
+        assert stream.first() == self.lines[0], "FileInputStream: incorrect first line"
+        assert stream.last() == self.lines[-1], "FileInputStream: incorrect last line"
+        assert stream.count() == len(self.lines), "FileInputStream: incorrect line count"
+        assert next(stream) == self.lines[0], "FileInputStream: first() consumed a line"
+
+    def test_duplicate(self):
+        stream = FileInputStream(STREAM_TESTS_FILE_PATH, chunk_size=7)
+        for _ in range(10):
+            next(stream)
+        duplicate = stream.duplicate()
+        assert list(duplicate) == self.lines[10:], "FileInputStream: duplicate returned incorrect lines"
+        assert list(stream) == self.lines[10:], "FileInputStream: duplicate consumed lines of the original stream"
+
+    def run_tests(self):
+        self.test_read()
+        self.test_first_last_count()
+        self.test_duplicate()
+
+
+"""
+FILE OUTPUT STREAM
+"""
+
+
+class TestFileOutputStream:
+    def __init__(self):
+        self.items = ["line %d\n" % (i,) for i in range(100)]
+        self.path = os.path.join(STREAM_TESTS_OUTPUT_DIRECTORY, STREAM_TESTS_OUTPUT_FILE_NAME)
+
+    def read_output(self):
+        with open(self.path, "r") as f:
+            return f.read()
+
+    def test_flush_by_item_count(self):
+        stream = FileOutputStream(STREAM_TESTS_OUTPUT_DIRECTORY, STREAM_TESTS_OUTPUT_FILE_NAME,
+                                  flush_item_count=10, flush_byte_count=None, flush_interval=None)
+        for item in self.items[:25]:
+            stream.add_item(item)
+        assert stream.count() == 5, "FileOutputStream: buffer was not flushed after 10 items"
+        stream.close()
+        assert self.read_output() == "".join(self.items[:25]), "FileOutputStream: incorrect output"
+
+    def test_flush_by_byte_count(self):
+        stream = FileOutputStream(STREAM_TESTS_OUTPUT_DIRECTORY, STREAM_TESTS_OUTPUT_FILE_NAME,
+                                  flush_item_count=None, flush_byte_count=len(self.items[0]) * 3, flush_interval=None)
+        for item in self.items[:4]:
+            stream.add_item(item)
+        assert stream.count() == 1, "FileOutputStream: buffer was not flushed after reaching the size limit"
+        stream.close()
+        assert self.read_output() == "".join(self.items[:4]), "FileOutputStream: incorrect output"
+
+    def test_flush_by_interval(self):
+        stream = FileOutputStream(STREAM_TESTS_OUTPUT_DIRECTORY, STREAM_TESTS_OUTPUT_FILE_NAME,
+                                  flush_item_count=None, flush_byte_count=None, flush_interval=timedelta(0))
+        stream.add_item(self.items[0])
+        assert stream.count() == 0, "FileOutputStream: buffer was not flushed after the interval passed"
+        stream.close()
+        assert self.read_output() == self.items[0], "FileOutputStream: incorrect output"
+
+    def test_async(self):
+        stream = FileOutputStream(STREAM_TESTS_OUTPUT_DIRECTORY, STREAM_TESTS_OUTPUT_FILE_NAME, is_async=True,
+                                  flush_item_count=3, flush_byte_count=None, flush_interval=None)
+        for item in self.items:
+            stream.add_item(item)
+        stream.close()
+        assert self.read_output() == "".join(self.items), "FileOutputStream: incorrect output of the background writer"
+
+    def test_async_failure(self):
+        stream = FileOutputStream(STREAM_TESTS_OUTPUT_DIRECTORY, STREAM_TESTS_OUTPUT_FILE_NAME, is_async=True,
+                                  flush_item_count=1, flush_byte_count=None, flush_interval=None)
+        # make the background writer fail on its next write
+        stream._FileOutputStream__output_file.close()
+        error = None
+        try:
+            for item in self.items:
+                stream.add_item(item)
+        except Exception as e:
+            error = e
+        assert error is not None and isinstance(error.__cause__, ValueError), \
+            "FileOutputStream: the failure of the background writer was not reported"
+        for operation in [stream.flush, stream.close]:
+            try:
+                operation()
+            except Exception:
+                continue
+            assert False, "FileOutputStream: the failure of the background writer was not reported"
+
+    def run_tests(self):
+        self.test_flush_by_item_count()
+        self.test_flush_by_byte_count()
+        self.test_flush_by_interval()
+        self.test_async()
+        self.test_async_failure()
+        os.remove(self.path)
+
+
+"""
+BINARY FILE STREAM
+"""
+
+
+class TestBinaryFileStream:
+    def __init__(self):
+        self.path = os.path.join(STREAM_TESTS_OUTPUT_DIRECTORY, STREAM_TESTS_BINARY_FILE_NAME)
+
+    def test_conversion(self, text_file_path: str, data_formatter):
+        convert_to_binary_event_file(text_file_path, self.path, data_formatter)
+        with open(text_file_path, "r") as f:
+            expected_payloads = [data_formatter.parse_event(line) for line in f]
+        stream = BinaryFileInputStream(self.path)
+        binary_data_formatter = stream.create_data_formatter(data_formatter)
+        assert stream.count() == len(expected_payloads), "BinaryFileInputStream: incorrect record count"
+        assert binary_data_formatter.parse_event(stream.last()) == expected_payloads[-1], \
+            "BinaryFileInputStream: incorrect last record"
+        for _ in range(3):
+            next(stream)
+        duplicate = stream.duplicate()
+        payloads = [binary_data_formatter.parse_event(record) for record in duplicate]
+        assert payloads == expected_payloads[3:], "BinaryDataFormatter: incorrect payloads"
+        stream.close()
+        first_payload = expected_payloads[0]
+        assert binary_data_formatter.get_event_type(first_payload) == data_formatter.get_event_type(first_payload) \
+            and binary_data_formatter.get_event_timestamp(first_payload) == \
+            data_formatter.get_event_timestamp(first_payload), "BinaryDataFormatter: incorrect type or timestamp"
+
+    def test_timestamps(self, text_file_path: str, data_formatter_type: type, timestamp_unit: TimestampUnits):
+        convert_to_binary_event_file(text_file_path, self.path, data_formatter_type())
+        data_formatter = data_formatter_type(timestamp_unit=timestamp_unit)
+        with open(text_file_path, "r") as f:
+            expected_timestamps = [data_formatter.get_event_timestamp(data_formatter.parse_event(line)) for line in f]
+        stream = BinaryFileInputStream(self.path)
+        binary_data_formatter = stream.create_data_formatter(data_formatter)
+        timestamps = []
+        for record in stream:
+            payload = binary_data_formatter.parse_event(record)
+            # the timestamp must be decoded from the record rather than by the base data formatter
+            payload.clear()
+            timestamps.append(binary_data_formatter.get_event_timestamp(payload))
+        stream.close()
+        assert timestamps == expected_timestamps, "BinaryDataFormatter: incorrect timestamps"
+
+    def test_string_table(self):
+        convert_to_binary_event_file(STREAM_TESTS_LONG_SENSORS_FILE_PATH, self.path, SensorsDataFormatter())
+        with open(self.path, "rb") as f:
+            header = BinaryEventFileHeader.read(f)
+        with open(STREAM_TESTS_LONG_SENSORS_FILE_PATH, "r") as f:
+            raw_timestamps = {SensorsDataFormatter().parse_event(line)[SENSORS_TIMESTAMP_KEY] for line in f}
+        assert len(raw_timestamps) > MAX_STRING_TABLE_VALUES_PER_ATTRIBUTE and \
+            len(raw_timestamps & set(header.strings)) == 0, \
+            "BinaryFileInputStream: high-cardinality strings were stored in the string table"
+        assert set(header.strings) == set(SENSORS_KEYS_DICT.keys()), "BinaryFileInputStream: incorrect string table"
+
+    def run_tests(self):
+        self.test_conversion(STREAM_TESTS_FILE_PATH, MetastockDataFormatter())
+        self.test_conversion(STREAM_TESTS_SENSORS_FILE_PATH, SensorsDataFormatter())
+        self.test_timestamps(STREAM_TESTS_FILE_PATH, MetastockDataFormatter, TimestampUnits.DATETIME)
+        self.test_timestamps(STREAM_TESTS_SENSORS_FILE_PATH, SensorsDataFormatter, TimestampUnits.DATETIME)
+        self.test_timestamps(STREAM_TESTS_SENSORS_FILE_PATH, SensorsDataFormatter, TimestampUnits.MILLISECONDS)
+        self.test_string_table()
+        os.remove(self.path)
+
+
+"""
+STREAM
+"""
+
+
+class TestStream:
+    def __init__(self):
+        self.items = list(range(10))
+
+    def test_batches(self, stream: Stream):
+        stream.add_items(self.items[:5])
+        for item in self.items[5:]:
+            stream.add_item(item)
+        stream.close()
+        assert stream.count() == 10, "%s: incorrect size" % (type(stream).__name__,)
+        assert stream.first() == 0 and stream.last() == 9, "%s: incorrect edges" % (type(stream).__name__,)
+        duplicate = stream.duplicate()
+        assert stream.get_batch(4) == self.items[:4], "%s: incorrect first batch" % (type(stream).__name__,)
+        assert stream.get_batch(100) == self.items[4:], "%s: incorrect last batch" % (type(stream).__name__,)
+        assert stream.get_batch(100) == [], "%s: closed stream returned items" % (type(stream).__name__,)
+        assert list(duplicate) == self.items, "%s: incorrect duplicate" % (type(stream).__name__,)
+
+    def run_tests(self):
+        self.test_batches(Stream())
+        self.test_batches(ThreadSafeStream())
@@ -0,0 +1,159 @@
+import os
+import pathlib
+from datetime import datetime, timedelta
+
+from CEP import CEP
+from base.Pattern import Pattern
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure
+from condition.BaseRelationCondition import SmallerThanCondition
+from condition.Condition import Variable
+from evaluation.EvaluationMechanismFactory import TreeBasedEvaluationMechanismParameters
+from misc.TimestampCache import TimestampCache
+from misc.TimestampUnits import TimestampUnits, EPOCH, convert_time_window, convert_timestamp, convert_time_fields
+from plugin.sensors.Sensors import SensorsDataFormatter, SENSORS_TIMESTAMP_KEY
+from plugin.stocks.Stocks import MetastockDataFormatter
+from stream.FileStream import FileInputStream
+from stream.Stream import Stream
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+TIMESTAMP_TESTS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+TIMESTAMP_TESTS_SENSORS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/Sensors_short.dat")
+
+
+def run_timestamp_tests():
+    conversion_test = TestTimestampConversion()
+    conversion_test.run_tests()
+    integer_timestamps_test = TestIntegerTimestamps()
+    integer_timestamps_test.run_tests()
+    timestamp_cache_test = TestTimestampCache()
+    timestamp_cache_test.run_tests()
+    print("Timestamp unit tests executed successfully.")
+
+
+"""
+CONVERSION
+"""
+
+
+class TestTimestampConversion:
+    def test_time_window(self):
+        window = timedelta(days=1, minutes=3, microseconds=1500)
+        assert convert_time_window(window, TimestampUnits.DATETIME) == window, "Conversion: datetime window changed"
+        assert convert_time_window(window, TimestampUnits.SECONDS) == 86580, "Conversion: incorrect seconds"
+        assert convert_time_window(window, TimestampUnits.MILLISECONDS) == 86580001, \
+            "Conversion: incorrect milliseconds"
+        assert convert_time_window(window, TimestampUnits.NANOSECONDS) == 86580001500000, \
+            "Conversion: incorrect nanoseconds"
+        assert convert_time_window(None, TimestampUnits.SECONDS) is None, "Conversion: missing window was converted"
+
+    def test_timestamp(self):
+        timestamp = EPOCH + timedelta(seconds=5, microseconds=7)
+        assert convert_timestamp(timestamp, TimestampUnits.MICROSECONDS) == 5000007, \
+            "Conversion: incorrect timestamp"
+
+    def test_time_fields(self):
+        time_fields = (2021, 6, 27, 18, 54, 8)
+        for timestamp_unit in TimestampUnits:
+            assert convert_time_fields(time_fields, timestamp_unit) == \
+                convert_timestamp(datetime(*time_fields), timestamp_unit), "Conversion: incorrect time fields"
+
+    def run_tests(self):
+        self.test_time_window()
+        self.test_timestamp()
+        self.test_time_fields()
+
+
+"""
+INTEGER TIMESTAMPS
+"""
+
+
+class TestIntegerTimestamps:
+    def __init__(self):
+        self.pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("GOOG", "a"), PrimitiveEventStructure("GOOG", "b")),
+            SmallerThanCondition(Variable("a", lambda x: x["Peak Price"]), Variable("b", lambda x: x["Peak Price"])),
+            timedelta(minutes=3))
+
+    def run_cep(self, timestamp_unit: TimestampUnits, data_formatter_timestamp_unit: TimestampUnits):
+        matches = Stream()
+        eval_mechanism_params = TreeBasedEvaluationMechanismParameters(timestamp_unit=timestamp_unit)
+        CEP([self.pattern], eval_mechanism_params).run(FileInputStream(TIMESTAMP_TESTS_FILE_PATH), matches,
+                                                       MetastockDataFormatter(
+                                                           timestamp_unit=data_formatter_timestamp_unit))
+        return list(matches)
+
+    def test_milliseconds(self):
+        expected_matches = self.run_cep(TimestampUnits.DATETIME, TimestampUnits.DATETIME)
+        actual_matches = self.run_cep(TimestampUnits.MILLISECONDS, TimestampUnits.MILLISECONDS)
+        assert len(expected_matches) > 0 and len(actual_matches) == len(expected_matches), \
+            "Integer timestamps: incorrect number of matches"
+        for expected_match, actual_match in zip(expected_matches, actual_matches):
+            assert [convert_timestamp(e.timestamp, TimestampUnits.MILLISECONDS) for e in expected_match.events] == \
+                [e.timestamp for e in actual_match.events], "Integer timestamps: incorrect match"
+
+    def test_unit_mismatch(self):
+        try:
+            self.run_cep(TimestampUnits.MILLISECONDS, TimestampUnits.DATETIME)
+        except Exception as e:
+            assert "timestamp unit" in str(e), "Integer timestamps: unexpected error"
+        else:
+            assert False, "Integer timestamps: timestamp unit mismatch was not detected"
+
+    def test_sensors_data_formatter(self):
+        with open(TIMESTAMP_TESTS_SENSORS_FILE_PATH, "r") as f:
+            lines = f.readlines()
+        for timestamp_unit in TimestampUnits:
+            data_formatter = SensorsDataFormatter(timestamp_unit=timestamp_unit)
+            for line in lines:
+                payload = data_formatter.parse_event(line)
+                expected_timestamp = datetime.strptime(payload[SENSORS_TIMESTAMP_KEY], "%m/%d/%Y %H:%M:%S")
+                assert data_formatter.get_event_timestamp(payload) == \
+                    convert_timestamp(expected_timestamp, timestamp_unit), "Integer timestamps: incorrect timestamp"
+
+    def run_tests(self):
+        self.test_milliseconds()
+        self.test_unit_mismatch()
+        self.test_sensors_data_formatter()
+
+
+"""
+TIMESTAMP CACHE
+"""
+
+
+class TestTimestampCache:
+    def test_eviction(self):
+        decoded = []
+
+        def decode(raw_timestamp):
+            decoded.append(raw_timestamp)
+            return raw_timestamp * 2
+
+        cache = TimestampCache(decode, max_size=2)
+        results = [cache.get(raw_timestamp) for raw_timestamp in [1, 1, 2, 1, 3, 2, 1]]
+        assert results == [2, 2, 4, 2, 6, 4, 2], "TimestampCache: incorrect decoded values"
+        # 2 is the least recently used entry when 3 is inserted, and then 1 is evicted when 2 is inserted again
+        assert decoded == [1, 2, 3, 2, 1], "TimestampCache: incorrect eviction order"
+        assert cache.get_hits() == 2 and cache.get_misses() == 5, "TimestampCache: incorrect counters"
+        cache.clear()
+        assert cache.get_hit_rate() is None, "TimestampCache: counters were not reset"
+
+    def test_data_formatter(self):
+        data_formatter = MetastockDataFormatter(timestamp_unit=TimestampUnits.SECONDS)
+        with open(TIMESTAMP_TESTS_FILE_PATH, "r") as f:
+            payloads = [data_formatter.parse_event(line) for line in f]
+        timestamps = [data_formatter.get_event_timestamp(payload) for payload in payloads]
+        expected_timestamps = [convert_timestamp(MetastockDataFormatter().get_event_timestamp(payload),
+                                                 TimestampUnits.SECONDS) for payload in payloads]
+        assert timestamps == expected_timestamps, "TimestampCache: incorrect timestamps"
+        cache = data_formatter.get_timestamp_cache()
+        distinct_timestamps_number = len(set(timestamps))
+        assert cache.get_misses() == distinct_timestamps_number and \
+            cache.get_hits() == len(timestamps) - distinct_timestamps_number, \
+            "TimestampCache: incorrect data formatter counters"
+
+    def run_tests(self):
+        self.test_eviction()
+        self.test_data_formatter()
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from misc.Utils import merge_according_to
+from tree.nodes.Node import PrimitiveEventDefinition, PatternParameters
+from tree.nodes.SeqNode import SeqNode
+
+
+def run_tree_node_tests():
+    seq_node_test = TestSeqNode()
+    seq_node_test.run_tests()
+    print("Tree node unit tests executed successfully.")
+
+
+class TestSeqNode:
+    def __init__(self):
+        self.node = SeqNode(PatternParameters(timedelta(minutes=5), None))
+        # pairs of the indices of the events in the two merged partial matches
+        self.index_pairs = [([0, 1], [2, 3]),  # the first partial match precedes the second one
+                            ([2, 3], [0, 1]),  # the second partial match precedes the first one
+                            ([0, 2], [1, 3, 4]),  # the partial matches are interleaved
+                            ([1], [0, 2])]
+
+    @staticmethod
+    def create_event_definitions(indices):
+        return [PrimitiveEventDefinition("type%d" % (index,), "e%d" % (index,), index) for index in indices]
+
+    def test_merge_order(self):
+        for first_indices, second_indices in self.index_pairs:
+            first_event_defs = self.create_event_definitions(first_indices)
+            second_event_defs = self.create_event_definitions(second_indices)
+            first_events = ["event%d" % (index,) for index in first_indices]
+            second_events = ["event%d" % (index,) for index in second_indices]
+            expected_events = merge_according_to(first_event_defs, second_event_defs, first_events, second_events,
+                                                 key=lambda x: x.index)
+            for _ in range(2):
+                # the second merge uses the cached merge type
+                merged_events = self.node._merge_events_for_new_match(first_event_defs, second_event_defs,
+                                                                      first_events, second_events)
+                assert merged_events == expected_events, "SeqNode: incorrect order of merged events"
+
+    def test_merge_type_cache(self):
+        """
+        Merges the events of short-lived definition lists, such that an ID of a discarded list could be reused by a
+        new list requiring a different merge type.
+        """
+        for i in range(100):
+            first_indices, second_indices = self.index_pairs[i % len(self.index_pairs)]
+            first_events = ["event%d" % (index,) for index in first_indices]
+            second_events = ["event%d" % (index,) for index in second_indices]
+            merged_events = self.node._merge_events_for_new_match(self.create_event_definitions(first_indices),
+                                                                  self.create_event_definitions(second_indices),
+                                                                  first_events, second_events)
+            assert merged_events == ["event%d" % (index,) for index in sorted(first_indices + second_indices)], \
+                "SeqNode: incorrect order of merged events for new definition lists"
+
+    def run_tests(self):
+        self.test_merge_order()
+        self.test_merge_type_cache()
@@ -9,6 +9,13 @@ from test.StorageTests import *
 import test.EventProbabilityTests
 from test.NestedTests import *
 from test.UnitTests.test_storage import run_storage_tests
+from test.UnitTests.test_stream import run_stream_tests
+from test.UnitTests.test_projection import run_projection_tests
+from test.UnitTests.test_timestamps import run_timestamp_tests
+from test.UnitTests.test_pattern_match import run_pattern_match_tests
+from test.UnitTests.test_conditions import run_condition_tests
+from test.UnitTests.test_tree_nodes import run_tree_node_tests
+from test.UnitTests.test_data_formatters import run_data_formatter_tests
 from test.UnitTests.RuleTransformationTests import ruleTransformationTests
 from test.ParallelTests import *
 
@@ -133,6 +140,27 @@ freezePolicy2PatternSearchTest()
 sortedStorageTest()
 run_storage_tests()
 
+# stream tests
+run_stream_tests()
+
+# attribute projection tests
+run_projection_tests()
+
+# timestamp representation tests
+run_timestamp_tests()
+
+# pattern match representation tests
+run_pattern_match_tests()
+
+# condition evaluation tests
+run_condition_tests()
+
+# tree node tests
+run_tree_node_tests()
+
+# data formatter tests
+run_data_formatter_tests()
+
 # multi-pattern tests
 leafIsRoot()
 distinctPatterns()
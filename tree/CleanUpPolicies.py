@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class CleanUpPolicies(Enum):
+    """
+    The policies for scheduling the removal of expired partial matches from the storage of a node.
+    FIXED_INTERVAL - a cleanup is performed once in a fixed number of partial match additions;
+    ADAPTIVE - a cleanup is performed once the estimated fraction of expired partial matches in the storage exceeds
+    a predefined threshold.
+    """
+    FIXED_INTERVAL = 0,
+    ADAPTIVE = 1
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class LoadSheddingPolicies(Enum):
+    """
+    The policies for selecting the partial matches to be dropped once the storage of a node reaches its budget.
+    DROP_OLDEST - the partial matches with the earliest timestamps are dropped first;
+    DROP_LOWEST_PROBABILITY - the partial matches with the lowest probabilities are dropped first (partial matches
+    without a probability are considered certain);
+    RANDOM_SAMPLING - the partial matches to be dropped are selected uniformly at random.
+    """
+    DROP_OLDEST = 0,
+    DROP_LOWEST_PROBABILITY = 1,
+    RANDOM_SAMPLING = 2
@@ -1,6 +1,8 @@
 from typing import Dict
 
 from base.Pattern import Pattern
+from misc import DefaultConfig
+from misc.TimestampUnits import TimestampUnits, convert_time_window
 from plan.TreePlan import TreePlan
 from tree.PatternMatchStorage import TreeStorageParameters
 from base.PatternMatch import PatternMatch
@@ -13,14 +15,17 @@ class MultiPatternTree:
     Represents a multi-pattern evaluation tree.
     """
     def __init__(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
-                 storage_params: TreeStorageParameters):
+                 storage_params: TreeStorageParameters,
+                 timestamp_unit: TimestampUnits = DefaultConfig.DEFAULT_TIMESTAMP_UNIT):
         self.__id_to_output_node_map = {}
         self.__id_to_pattern_map = {}
+        # the time windows of the patterns in the timestamp representation of the evaluation mechanism
+        self.__id_to_window_map = {}
         self.__output_nodes = []
-        self.__construct_multi_pattern_tree(pattern_to_tree_plan_map, storage_params)
+        self.__construct_multi_pattern_tree(pattern_to_tree_plan_map, storage_params, timestamp_unit)
 
     def __construct_multi_pattern_tree(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
-                                       storage_params: TreeStorageParameters):
+                                       storage_params: TreeStorageParameters, timestamp_unit: TimestampUnits):
         """
         Constructs a multi-pattern evaluation tree.
         It is assumed that each pattern appears only once in patterns (which is a legitimate assumption).
@@ -29,9 +34,10 @@ class MultiPatternTree:
         plan_nodes_to_nodes_map = {}  # a cache for already created subtrees
         for pattern, plan in pattern_to_tree_plan_map.items():
             pattern.id = i
-            new_tree_root = Tree(plan, pattern, storage_params, plan_nodes_to_nodes_map).get_root()
+            new_tree_root = Tree(plan, pattern, storage_params, plan_nodes_to_nodes_map, timestamp_unit).get_root()
             self.__id_to_output_node_map[pattern.id] = new_tree_root
             self.__id_to_pattern_map[pattern.id] = pattern
+            self.__id_to_window_map[pattern.id] = convert_time_window(pattern.window, timestamp_unit)
             self.__output_nodes.append(new_tree_root)
             i += 1
 
@@ -49,7 +55,7 @@ class MultiPatternTree:
         Returns True if the given match satisfies the window/confidence constraints of the given pattern
         and False otherwise.
         """
-        if match.last_timestamp - match.first_timestamp > pattern.window:
+        if match.last_timestamp - match.first_timestamp > self.__id_to_window_map[pattern.id]:
             return False
         return pattern.confidence is None or match.probability is None or match.probability >= pattern.confidence
 
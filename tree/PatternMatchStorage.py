@@ -1,9 +1,42 @@
+import heapq
+import random
+from typing import Iterable
+
 from base.PatternMatch import PatternMatch
 from misc import DefaultConfig
-from misc.Utils import get_first_index, get_last_index
+from misc.ArrivalOrderedBuffer import ArrivalOrderedBuffer
+from misc.BlockedSortedList import BlockedSortedList
+from misc.ColumnarSortedList import ColumnarSortedList
+from misc.TimestampUnits import TimestampUnits, convert_timestamp
 from datetime import datetime
 from misc.Utils import find_partial_match_by_timestamp
 from condition.Condition import RelopTypes, EquationSides
+from tree.CleanUpPolicies import CleanUpPolicies
+from tree.LoadSheddingPolicies import LoadSheddingPolicies
+
+try:
+    import numpy
+except ImportError:  # NumPy might not be installed
+    numpy = None
+
+
+class CleanUpStatistics:
+    """
+    Counters reflecting the trade-off between the cost of the cleanups of a storage and its memory consumption.
+    """
+    def __init__(self):
+        # the number of performed cleanups
+        self.clean_up_count = 0
+        # the number of pattern matches examined during the cleanups (an estimation of their total cost)
+        self.examined_count = 0
+        # the number of expired pattern matches removed during the cleanups
+        self.removed_count = 0
+        # the largest number of pattern matches stored right before a cleanup
+        self.peak_size = 0
+
+    def __repr__(self):
+        return "cleanups: %d, examined: %d, removed: %d, peak size: %d" % \
+               (self.clean_up_count, self.examined_count, self.removed_count, self.peak_size)
 
 
 class PatternMatchStorage:
@@ -23,6 +56,16 @@ class PatternMatchStorage:
         self._sorted_by_arrival_order = sorted_by_arrival_order
         self._clean_up_interval = clean_up_interval
         self._access_count = 0
+        self.__clean_up_policy = DefaultConfig.CLEANUP_POLICY
+        self.__clean_up_expired_fraction = DefaultConfig.CLEANUP_EXPIRED_FRACTION
+        # lower and upper bounds for the first timestamps of the stored pattern matches (only used by the adaptive
+        # cleanup policy)
+        self.__oldest_timestamp = None
+        self.__newest_timestamp = None
+        self.__clean_up_statistics = CleanUpStatistics()
+        self.__max_size = None
+        self.__load_shedding_policy = DefaultConfig.LOAD_SHEDDING_POLICY
+        self.__shed_count = 0
 
     def get_key_function(self):
         """
@@ -67,15 +110,101 @@ class PatternMatchStorage:
         """
         return item in self._partial_matches
 
+    def set_clean_up_policy(self, clean_up_policy: CleanUpPolicies, clean_up_expired_fraction: float = None):
+        """
+        Sets the policy for scheduling the cleanups of this storage.
+        """
+        self.__clean_up_policy = clean_up_policy
+        if clean_up_expired_fraction is not None:
+            self.__clean_up_expired_fraction = clean_up_expired_fraction
+
+    def set_load_shedding_policy(self, max_size: int or None, load_shedding_policy: LoadSheddingPolicies = None):
+        """
+        Limits the number of pattern matches in this storage to the given size (None for no limit). Once the limit is
+        reached, the pattern matches selected by the given policy are dropped to make room for the new ones.
+        """
+        self.__max_size = max_size
+        if load_shedding_policy is not None:
+            self.__load_shedding_policy = load_shedding_policy
+
+    def get_shed_count(self):
+        """
+        Returns the number of pattern matches dropped from this storage due to load shedding so far.
+        """
+        return self.__shed_count
+
+    def get_clean_up_statistics(self):
+        """
+        Returns the counters describing the cleanups performed on this storage so far.
+        """
+        return self.__clean_up_statistics
+
     def try_clean_expired_partial_matches(self, earliest_timestamp: datetime):
         """
-        If the number of storage accesses exceeded a predefined threshold, perform a costly operation of removing
-        expired partial matches.
+        If the cleanup policy deems it worthwhile, perform a costly operation of removing expired partial matches.
         """
-        if self._access_count < self._clean_up_interval:
+        if self.__clean_up_policy == CleanUpPolicies.ADAPTIVE:
+            if not self.__is_adaptive_clean_up_required(earliest_timestamp):
+                return
+        elif self._access_count < self._clean_up_interval:
             return
+        self._clean_up(earliest_timestamp)
+
+    def __is_adaptive_clean_up_required(self, earliest_timestamp: datetime):
+        """
+        Estimates the fraction of the expired pattern matches in the storage given the time elapsed since the oldest
+        stored match, assuming the first timestamps of the matches to be uniformly distributed. Returns True if the
+        estimated fraction exceeds the threshold and at least one match is expected to be removed, and False otherwise.
+        """
+        oldest_timestamp, newest_timestamp = self.__oldest_timestamp, self.__newest_timestamp
+        if oldest_timestamp is None or oldest_timestamp >= earliest_timestamp:
+            # no pattern match has expired yet
+            return False
+        if newest_timestamp < earliest_timestamp:
+            expired_fraction = 1.0
+        else:
+            expired_fraction = (earliest_timestamp - oldest_timestamp) / (newest_timestamp - oldest_timestamp)
+        return expired_fraction >= self.__clean_up_expired_fraction and expired_fraction * len(self) >= 1
+
+    def _clean_up(self, earliest_timestamp: datetime):
+        """
+        Removes the expired partial matches and updates the cleanup statistics.
+        """
+        size_before_clean_up = len(self)
         self._clean_expired_partial_matches(earliest_timestamp)
         self._access_count = 0
+        size_after_clean_up = len(self)
+        removed_count = size_before_clean_up - size_after_clean_up
+        statistics = self.__clean_up_statistics
+        statistics.clean_up_count += 1
+        # in an arrival-ordered storage, only the expired matches and the first non-expired one are examined
+        statistics.examined_count += min(removed_count + 1, size_before_clean_up) \
+            if self._sorted_by_arrival_order else size_before_clean_up
+        statistics.removed_count += removed_count
+        statistics.peak_size = max(statistics.peak_size, size_before_clean_up)
+        if size_after_clean_up == 0:
+            self.__oldest_timestamp = self.__newest_timestamp = None
+        elif self.__oldest_timestamp is not None:
+            # all the remaining matches are known to be no older than the given timestamp
+            self.__oldest_timestamp = max(self.__oldest_timestamp, earliest_timestamp)
+
+    def _register_addition(self, pm: PatternMatch):
+        """
+        Updates the counters used for scheduling the cleanups upon the addition of a new pattern match, and sheds
+        the load if the storage has reached its size limit. Must be invoked before the pattern match is actually added.
+        """
+        self._access_count += 1
+        if self.__max_size is not None and len(self) >= self.__max_size:
+            self.__shed_load()
+        if self.__clean_up_policy != CleanUpPolicies.ADAPTIVE:
+            return
+        first_timestamp = pm.first_timestamp
+        if self.__oldest_timestamp is None:
+            self.__oldest_timestamp = self.__newest_timestamp = first_timestamp
+        elif first_timestamp < self.__oldest_timestamp:
+            self.__oldest_timestamp = first_timestamp
+        elif first_timestamp > self.__newest_timestamp:
+            self.__newest_timestamp = first_timestamp
 
     def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
         """
@@ -88,6 +217,45 @@ class PatternMatchStorage:
             self._partial_matches = list(filter(lambda pm: pm.first_timestamp >= earliest_timestamp,
                                                 self._partial_matches))
 
+    def __shed_load(self):
+        """
+        Drops a batch of pattern matches according to the load shedding policy, such that the storage is kept within
+        its size limit while the shedding cost is amortized over multiple additions.
+        """
+        size = len(self)
+        batch_size = max(1, int(self.__max_size * DefaultConfig.LOAD_SHEDDING_BATCH_FRACTION))
+        count = min(size - self.__max_size + batch_size, size)
+        if count <= 0:
+            return
+        if self.__load_shedding_policy == LoadSheddingPolicies.DROP_OLDEST:
+            if self._sorted_by_arrival_order:
+                self._remove_first_partial_matches(count)
+                self.__shed_count += count
+                return
+            matches_to_drop = heapq.nsmallest(count, self, key=lambda pm: pm.first_timestamp)
+        elif self.__load_shedding_policy == LoadSheddingPolicies.DROP_LOWEST_PROBABILITY:
+            matches_to_drop = heapq.nsmallest(count, self,
+                                              key=lambda pm: 1.0 if pm.probability is None else pm.probability)
+        elif self.__load_shedding_policy == LoadSheddingPolicies.RANDOM_SAMPLING:
+            matches_to_drop = random.sample(list(self), count)
+        else:
+            raise Exception("Unknown load shedding policy: %s" % (self.__load_shedding_policy,))
+        ids_to_drop = {id(pm) for pm in matches_to_drop}
+        self._retain_partial_matches(lambda pm: id(pm) not in ids_to_drop)
+        self.__shed_count += count
+
+    def _remove_first_partial_matches(self, count: int):
+        """
+        Removes the given number of pattern matches from the beginning of the storage.
+        """
+        self._partial_matches = self._partial_matches[count:]
+
+    def _retain_partial_matches(self, predicate: callable):
+        """
+        Removes all the pattern matches not satisfying the given predicate.
+        """
+        self._partial_matches = [pm for pm in self._partial_matches if predicate(pm)]
+
     def get_internal_buffer(self):
         """
         Returns the internal buffer actually storing the pattern matches.
@@ -102,7 +270,9 @@ class PatternMatchStorage:
 
     def get(self, value: int or float):
         """
-        Returns a list of pattern matches corresponding to the given value.
+        Returns the pattern matches corresponding to the given value.
+        To avoid copying, the returned object may be the internal buffer of the storage or a read-only view of its
+        parts, which supports iteration, len() and indexing. It should be consumed before the storage is modified.
         """
         raise NotImplementedError()
 
@@ -110,12 +280,28 @@ class PatternMatchStorage:
 class SortedPatternMatchStorage(PatternMatchStorage):
     """
     This class stores the pattern matches sorted in increasing order according to a predefined function (key).
+    The pattern matches are stored in a BlockedSortedList, such that an insertion only shifts the contents of a single
+    block. The key of each pattern match is only calculated once, upon insertion, and is kept alongside it, such that
+    all searches are performed by binary search over the precalculated keys.
+    Range queries return views of the internal buffer rather than copies.
+    If the pattern matches arrive in the order of their keys, which is the case in the leaves, they are stored in an
+    ArrivalOrderedBuffer instead. Since the expired matches are then always located at the beginning of the buffer,
+    they can be removed upon every cleanup attempt at a constant amortized cost (if eager_clean_up is enabled), such
+    that the memory consumption follows the actual contents of the time window.
     """
     def __init__(self, get_match_key: callable, rel_op: RelopTypes, equation_side: EquationSides,
-                 clean_up_interval: int, sort_by_first_timestamp=False, in_leaf=False):
+                 clean_up_interval: int, sort_by_first_timestamp=False, in_leaf=False, eager_clean_up=False):
         super().__init__(get_match_key, in_leaf and sort_by_first_timestamp, clean_up_interval)
+        self._partial_matches = ArrivalOrderedBuffer() if self._sorted_by_arrival_order else BlockedSortedList()
+        self.__eager_clean_up = eager_clean_up and self._sorted_by_arrival_order
         self.__get_function = self.__generate_get_function(rel_op, equation_side)
 
+    def __setitem__(self, index, item):
+        """
+        Implements list-style "set item" semantics. The sorting order is the responsibility of the caller.
+        """
+        self._partial_matches[index] = (item, self._get_key(item))
+
     def __contains__(self, item):
         """
         Returns True if the given item is stored and False otherwise.
@@ -127,14 +313,12 @@ class SortedPatternMatchStorage(PatternMatchStorage):
         """
         Efficiently inserts the new pattern match to the storage according to its key.
         """
-        self._access_count += 1
+        self._register_addition(pm)
         if self._sorted_by_arrival_order:
             # no need for artificially sorting
-            self._partial_matches.append(pm)
+            self._partial_matches.append(pm, self._get_key(pm))
             return
-        index = get_last_index(self._partial_matches, self._get_key(pm), self._get_key)
-        index = 0 if index == -1 else index
-        self._partial_matches.insert(index, pm)
+        self._partial_matches.add(pm, self._get_key(pm))
 
     def get(self, value: int or float):
         """
@@ -144,81 +328,78 @@ class SortedPatternMatchStorage(PatternMatchStorage):
             return []
         return self.__get_function(value)
 
-    def __get_equal(self, value: int or float):
+    def try_clean_expired_partial_matches(self, earliest_timestamp: datetime):
         """
-        Returns the pattern matches whose keys are equal to the given value.
+        If eager cleanup is enabled, the storage is cleaned upon every attempt, as only the expired matches at the
+        beginning of the arrival-ordered buffer are examined. Otherwise, the cleanup is performed periodically.
         """
-        left_index = get_first_index(self._partial_matches, value, self._get_key)
-        if left_index == len(self._partial_matches) or left_index == -1 or \
-                self._get_key(self._partial_matches[left_index]) != value:
-            return []
-        right_index = get_last_index(self._partial_matches, value, self._get_key)
-        return self._partial_matches[left_index: right_index + 1]
+        if self.__eager_clean_up:
+            self._clean_up(earliest_timestamp)
+            return
+        super().try_clean_expired_partial_matches(earliest_timestamp)
 
-    def __get_unequal(self, value: int or float):
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
         """
-        Returns the pattern matches whose keys are not equal to the given value.
+        Removes the expired pattern matches along with their keys.
+        """
+        if self._sorted_by_arrival_order:
+            self._partial_matches.remove_while(lambda pm: pm.first_timestamp < earliest_timestamp)
+        else:
+            self._partial_matches.filter(lambda pm: pm.first_timestamp >= earliest_timestamp)
+
+    def _remove_first_partial_matches(self, count: int):
+        self._partial_matches.remove_first(count)
+
+    def _retain_partial_matches(self, predicate: callable):
+        self._partial_matches.filter(predicate)
+
+    def __get_range(self, start: int, end: int):
         """
-        left_index = get_first_index(self._partial_matches, value, self._get_key)
-        if left_index == len(self._partial_matches) or left_index == -1 or \
-                self._get_key(self._partial_matches[left_index]) != value:
+        Returns the pattern matches in the given range of positions. The internal buffer is returned as is if the
+        range spans the entire storage.
+        """
+        if start == 0 and end == len(self._partial_matches):
             return self._partial_matches
-        right_index = get_last_index(self._partial_matches, value, self._get_key)
-        return self._partial_matches[:left_index] + self._partial_matches[right_index + 1:]
+        return self._partial_matches.get_range(start, end)
 
-    def __get_greater_aux(self, value: int or float, return_equal: bool):
+    def __get_equal(self, value: int or float):
         """
-        An auxiliary method for implementing "greater than" or "greater than or equal to" conditions.
+        Returns the pattern matches whose keys are equal to the given value.
         """
-        right_index = get_first_index(self._partial_matches, value, self._get_key) if return_equal \
-            else get_last_index(self._partial_matches, value, self._get_key)
-        if right_index == len(self._partial_matches):
-            return []
-        if right_index == -1:
+        return self.__get_range(self._partial_matches.bisect_left(value), self._partial_matches.bisect_right(value))
+
+    def __get_unequal(self, value: int or float):
+        """
+        Returns the pattern matches whose keys are not equal to the given value.
+        """
+        left_index, right_index = self._partial_matches.bisect_left(value), self._partial_matches.bisect_right(value)
+        if left_index == right_index:
             return self._partial_matches
-        # in case value doesn't exist right_index will point on the first one greater than it
-        if self._get_key(self._partial_matches[right_index]) != value:
-            return self._partial_matches[right_index:]
-        return self._partial_matches[right_index:] if return_equal else self._partial_matches[right_index + 1:]
+        return self._partial_matches.get_range_complement(left_index, right_index)
 
     def __get_greater(self, value: int or float):
         """
         Returns the pattern matches whose keys are greater than the given value.
         """
-        return self.__get_greater_aux(value, False)
+        return self.__get_range(self._partial_matches.bisect_right(value), len(self._partial_matches))
 
     def __get_greater_or_equal(self, value: int or float):
         """
         Returns the pattern matches whose keys are greater than or equal to the given value.
         """
-        return self.__get_greater_aux(value, True)
-
-    def __get_smaller_aux(self, value: int or float, return_equal: bool):
-        """
-        An auxiliary method for implementing "smaller than" or "smaller than or equal to" conditions.
-        """
-        left_index = get_last_index(self._partial_matches, value, self._get_key) if return_equal \
-            else get_first_index(self._partial_matches, value, self._get_key)
-        if left_index == len(self._partial_matches):
-            return self._partial_matches
-        if left_index == -1:
-            return []
-        # in case value doesn't exist left_index will point on the first one smaller than it
-        if self._get_key(self._partial_matches[left_index]) != value:
-            return self._partial_matches[: left_index + 1]
-        return self._partial_matches[:left_index + 1] if return_equal else self._partial_matches[:left_index]
+        return self.__get_range(self._partial_matches.bisect_left(value), len(self._partial_matches))
 
     def __get_smaller(self, value: int or float):
         """
         Returns the pattern matches whose keys are smaller than the given value.
         """
-        return self.__get_smaller_aux(value, False)
+        return self.__get_range(0, self._partial_matches.bisect_left(value))
 
     def __get_smaller_or_equal(self, value: int or float):
         """
         Returns the pattern matches whose keys are smaller than or equal to the given value.
         """
-        return self.__get_smaller_aux(value, True)
+        return self.__get_range(0, self._partial_matches.bisect_right(value))
 
     def __get_all(self, value: int or float):
         """
@@ -261,7 +442,7 @@ class UnsortedPatternMatchStorage(PatternMatchStorage):
         """
         Appends the given pattern match to the match buffer.
         """
-        self._access_count += 1
+        self._register_addition(pm)
         self._partial_matches.append(pm)
 
     def get(self, value: int or float):
@@ -271,13 +452,300 @@ class UnsortedPatternMatchStorage(PatternMatchStorage):
         return self._partial_matches
 
 
+class HashedPatternMatchStorage(PatternMatchStorage):
+    """
+    This class stores the pattern matches in buckets according to a predefined function (key), enabling to retrieve
+    the pattern matches whose keys are equal to a given value in constant time. It is used for equality conditions.
+    All the stored pattern matches are kept in their arrival order in a single buffer, and each bucket preserves the
+    arrival order of its own pattern matches. Hence, removing the oldest pattern matches only requires trimming the
+    beginning of the buckets of their keys, while the rest of the buckets are not examined. In the leaves, where the
+    matches arrive in the order of their timestamps, the expired matches are located by a binary search over the buffer.
+    If a key turns out to be unhashable, the storage falls back to a SortedPatternMatchStorage for the rest of its
+    lifetime.
+    """
+    def __init__(self, get_match_key: callable, clean_up_interval: int, in_leaf=False):
+        super().__init__(get_match_key, in_leaf, clean_up_interval)
+        self._partial_matches = ArrivalOrderedBuffer()
+        self.__buckets = {}
+        self.__sorted_storage = None
+
+    def __setitem__(self, index, item):
+        """
+        Implements list-style "set item" semantics. Keeping the buckets consistent is the responsibility of the caller.
+        """
+        if self.__sorted_storage is not None:
+            self.__sorted_storage[index] = item
+            return
+        self._partial_matches[index] = (item, item.first_timestamp)
+
+    def __contains__(self, item):
+        """
+        Returns True if the given item is stored and False otherwise.
+        Only searches in the bucket corresponding to the key of the item.
+        """
+        if self.__sorted_storage is None:
+            try:
+                return item in self.__buckets.get(self._get_key(item), ())
+            except TypeError:
+                # the key is unhashable
+                self.__fall_back_to_sorted_storage()
+        return item in self.__sorted_storage
+
+    def add(self, pm: PatternMatch):
+        """
+        Appends the given pattern match to the match buffer and to the bucket corresponding to its key.
+        """
+        self._register_addition(pm)
+        if self.__sorted_storage is None:
+            key = self._get_key(pm)
+            try:
+                bucket = self.__buckets.get(key)
+            except TypeError:
+                # the key is unhashable
+                self.__fall_back_to_sorted_storage()
+            else:
+                if bucket is None:
+                    bucket = self.__buckets[key] = ArrivalOrderedBuffer()
+                bucket.append(pm, pm.first_timestamp)
+                self._partial_matches.append(pm, pm.first_timestamp)
+                return
+        self.__sorted_storage.add(pm)
+
+    def get(self, value: int or float):
+        """
+        Returns the pattern matches whose keys are equal to the given value.
+        """
+        if self.__sorted_storage is None:
+            try:
+                return self.__buckets.get(value, [])
+            except TypeError:
+                # the value is unhashable
+                self.__fall_back_to_sorted_storage()
+        return self.__sorted_storage.get(value)
+
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        In addition to the match buffer, removes the expired pattern matches from the buckets of their keys, discarding
+        the buckets left empty.
+        """
+        if self.__sorted_storage is not None:
+            self.__sorted_storage._clean_expired_partial_matches(earliest_timestamp)
+            return
+        if self._sorted_by_arrival_order:
+            count = self._partial_matches.bisect_left(earliest_timestamp)
+            if count == 0:
+                return
+            expired_keys = {self._get_key(pm) for pm in self._partial_matches.iterate_range(0, count)}
+            self._partial_matches.remove_first(count)
+            for key in expired_keys:
+                bucket = self.__buckets[key]
+                bucket.remove_first(bucket.bisect_left(earliest_timestamp))
+                if len(bucket) == 0:
+                    del self.__buckets[key]
+            return
+        # the expired matches might be located anywhere in the buffer
+        expired_keys = {self._get_key(pm) for pm in self._partial_matches if pm.first_timestamp < earliest_timestamp}
+        if len(expired_keys) == 0:
+            return
+        self.__retain_partial_matches_by_keys(lambda pm: pm.first_timestamp >= earliest_timestamp, expired_keys)
+
+    def _remove_first_partial_matches(self, count: int):
+        """
+        In addition to the match buffer, removes the pattern matches from the beginning of the buckets of their keys.
+        """
+        if self.__sorted_storage is not None:
+            self.__sorted_storage._remove_first_partial_matches(count)
+            return
+        counts_by_key = {}
+        for pm in self._partial_matches.iterate_range(0, count):
+            key = self._get_key(pm)
+            counts_by_key[key] = counts_by_key.get(key, 0) + 1
+        self._partial_matches.remove_first(count)
+        for key, key_count in counts_by_key.items():
+            bucket = self.__buckets[key]
+            bucket.remove_first(key_count)
+            if len(bucket) == 0:
+                del self.__buckets[key]
+
+    def _retain_partial_matches(self, predicate: callable):
+        """
+        In addition to the match buffer, removes the pattern matches not satisfying the given predicate from the
+        buckets, discarding the buckets left empty.
+        """
+        if self.__sorted_storage is not None:
+            self.__sorted_storage._retain_partial_matches(predicate)
+            return
+        self.__retain_partial_matches_by_keys(predicate, list(self.__buckets.keys()))
+
+    def __retain_partial_matches_by_keys(self, predicate: callable, keys: Iterable):
+        """
+        Removes the pattern matches not satisfying the given predicate from the match buffer and from the buckets of
+        the given keys, discarding the buckets left empty.
+        """
+        self._partial_matches.filter(predicate)
+        for key in keys:
+            bucket = self.__buckets[key]
+            bucket.filter(predicate)
+            if len(bucket) == 0:
+                del self.__buckets[key]
+
+    def __fall_back_to_sorted_storage(self):
+        """
+        Moves the stored pattern matches into a SortedPatternMatchStorage, which only requires the keys to be
+        comparable, and delegates all the subsequent operations to it.
+        """
+        sorted_storage = SortedPatternMatchStorage(self._get_key, RelopTypes.Equal, EquationSides.left,
+                                                   self._clean_up_interval)
+        for pm in self._partial_matches:
+            sorted_storage.add(pm)
+        self._partial_matches = sorted_storage.get_internal_buffer()
+        # the buffer is now sorted by the keys rather than by the arrival order
+        self._sorted_by_arrival_order = False
+        self.__buckets = {}
+        self.__sorted_storage = sorted_storage
+
+
+class ColumnarPatternMatchStorage(SortedPatternMatchStorage):
+    """
+    This class stores the pattern matches sorted in increasing order according to a predefined numeric function (key),
+    similarly to SortedPatternMatchStorage. The pattern matches are stored in a ColumnarSortedList, keeping the keys and
+    the first timestamps of each block of pattern matches in contiguous NumPy arrays, such that searches are performed
+    by numpy.searchsorted and the expired pattern matches are located by vectorized comparisons. As in the sorted
+    storage, an insertion only shifts the contents of a single block and range queries return views of the internal
+    buffer rather than copies.
+    Timestamps (and keys) given as datetime objects are stored as integer microseconds since the epoch. If a key
+    turns out to be non-numeric, the storage falls back to the buffer of SortedPatternMatchStorage for the rest of its
+    lifetime.
+    This storage is only available if NumPy is installed.
+    """
+    def __init__(self, get_match_key: callable, rel_op: RelopTypes, equation_side: EquationSides,
+                 clean_up_interval: int, sort_by_first_timestamp=False, in_leaf=False):
+        if numpy is None:
+            raise Exception("NumPy is required for the columnar pattern match storage")
+        super().__init__(get_match_key, rel_op, equation_side, clean_up_interval, sort_by_first_timestamp, in_leaf)
+        self._partial_matches = ColumnarSortedList()
+        self.__is_columnar = True
+
+    @staticmethod
+    def is_supported():
+        """
+        Returns True if NumPy is available and False otherwise.
+        """
+        return numpy is not None
+
+    def __setitem__(self, index: int, item: PatternMatch):
+        """
+        Implements list-style "set item" semantics. The sorting order is the responsibility of the caller.
+        """
+        if self.__is_columnar:
+            key = self.__to_number(self._get_key(item))
+            if self.__is_numeric(key):
+                self._partial_matches[index] = (item, key, self.__to_number(item.first_timestamp))
+                return
+            self.__fall_back_to_sorted_buffer()
+        super().__setitem__(index, item)
+
+    def __contains__(self, item: PatternMatch):
+        """
+        Returns True if the given item is stored and False otherwise.
+        Only searches among the pattern matches whose keys are equal to the key of the given item.
+        """
+        if self.__is_columnar:
+            key = self.__to_number(self._get_key(item))
+            if self.__is_numeric(key):
+                return item in self._partial_matches.get_range(self._partial_matches.bisect_left(key),
+                                                               self._partial_matches.bisect_right(key))
+            self.__fall_back_to_sorted_buffer()
+        return super().__contains__(item)
+
+    def add(self, pm: PatternMatch):
+        """
+        Inserts the new pattern match to the storage according to its key.
+        """
+        if self.__is_columnar:
+            key = self.__to_number(self._get_key(pm))
+            if self.__is_numeric(key):
+                self._register_addition(pm)
+                first_timestamp = self.__to_number(pm.first_timestamp)
+                if self._sorted_by_arrival_order:
+                    # no need for artificially sorting
+                    self._partial_matches.append(pm, key, first_timestamp)
+                    return
+                self._partial_matches.add(pm, key, first_timestamp)
+                return
+            self.__fall_back_to_sorted_buffer()
+        super().add(pm)
+
+    def get(self, value: int or float or datetime):
+        """
+        Converts the given value into the representation of the stored keys and extracts the required pattern matches.
+        """
+        if self.__is_columnar:
+            number = self.__to_number(value)
+            if self.__is_numeric(number):
+                return super().get(number)
+            self.__fall_back_to_sorted_buffer()
+        return super().get(value)
+
+    def _clean_expired_partial_matches(self, earliest_timestamp: datetime):
+        """
+        Removes the expired pattern matches along with their keys and timestamps.
+        """
+        if not self.__is_columnar:
+            super()._clean_expired_partial_matches(earliest_timestamp)
+            return
+        earliest_timestamp = self.__to_number(earliest_timestamp)
+        if self._sorted_by_arrival_order:
+            self._partial_matches.remove_first(self._partial_matches.bisect_timestamp_left(earliest_timestamp))
+        else:
+            self._partial_matches.remove_expired(earliest_timestamp)
+
+    def __fall_back_to_sorted_buffer(self):
+        """
+        Moves the stored pattern matches into the buffer used by SortedPatternMatchStorage, which only requires the
+        keys to be comparable, and stores all the subsequent pattern matches in it.
+        """
+        if self._sorted_by_arrival_order:
+            sorted_buffer = ArrivalOrderedBuffer()
+            for pm in self._partial_matches:
+                sorted_buffer.append(pm, self._get_key(pm))
+        else:
+            sorted_buffer = BlockedSortedList()
+            for pm in self._partial_matches:
+                sorted_buffer.add(pm, self._get_key(pm))
+        self._partial_matches = sorted_buffer
+        self.__is_columnar = False
+
+    @staticmethod
+    def __is_numeric(value):
+        """
+        Returns True if the given value can be stored in the arrays of the columnar sorted list and False otherwise.
+        """
+        return not isinstance(value, bool) and isinstance(value, (int, float))
+
+    @staticmethod
+    def __to_number(value: int or float or datetime):
+        """
+        Converts a datetime value into an integer number of microseconds since the epoch. Numbers are returned as is.
+        """
+        if isinstance(value, datetime):
+            return convert_timestamp(value, TimestampUnits.MICROSECONDS)
+        return value
+
+
 class TreeStorageParameters:
     """
     Parameters for the evaluation tree to specify how to store the data.
     """
     def __init__(self, sort_storage: bool = DefaultConfig.SHOULD_SORT_STORAGE, attributes_priorities: dict = None,
                  clean_up_interval: int = DefaultConfig.CLEANUP_INTERVAL,
-                 prioritize_sorting_by_timestamp: bool = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP):
+                 prioritize_sorting_by_timestamp: bool = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP,
+                 eager_clean_up: bool = DefaultConfig.EAGER_ARRIVAL_ORDERED_STORAGE_CLEANUP,
+                 clean_up_policy: CleanUpPolicies = DefaultConfig.CLEANUP_POLICY,
+                 clean_up_expired_fraction: float = DefaultConfig.CLEANUP_EXPIRED_FRACTION,
+                 max_partial_matches: int = DefaultConfig.MAX_PARTIAL_MATCHES_PER_NODE,
+                 load_shedding_policy: LoadSheddingPolicies = DefaultConfig.LOAD_SHEDDING_POLICY,
+                 use_columnar_storage: bool = DefaultConfig.USE_COLUMNAR_STORAGE):
         if sort_storage is None:
             sort_storage = DefaultConfig.SHOULD_SORT_STORAGE
         if attributes_priorities is None:
@@ -286,6 +754,20 @@ class TreeStorageParameters:
             raise Exception('cleanup interval should be positive.')
         if prioritize_sorting_by_timestamp is None:
             prioritize_sorting_by_timestamp = DefaultConfig.PRIORITIZE_SORTING_BY_TIMESTAMP
+        if eager_clean_up is None:
+            eager_clean_up = DefaultConfig.EAGER_ARRIVAL_ORDERED_STORAGE_CLEANUP
+        if clean_up_policy is None:
+            clean_up_policy = DefaultConfig.CLEANUP_POLICY
+        if clean_up_expired_fraction is None:
+            clean_up_expired_fraction = DefaultConfig.CLEANUP_EXPIRED_FRACTION
+        if not 0 < clean_up_expired_fraction <= 1:
+            raise Exception('cleanup expired fraction should be in the range (0, 1].')
+        if max_partial_matches is not None and max_partial_matches <= 0:
+            raise Exception('the maximal number of partial matches should be positive.')
+        if load_shedding_policy is None:
+            load_shedding_policy = DefaultConfig.LOAD_SHEDDING_POLICY
+        if use_columnar_storage is None:
+            use_columnar_storage = DefaultConfig.USE_COLUMNAR_STORAGE
 
         # True if the user is willing to use non-default sorted storage and False otherwise
         self.sort_storage = sort_storage
@@ -293,6 +775,25 @@ class TreeStorageParameters:
         # An array of event attribute names according to their priority of being used for sorting the storage
         self.attributes_priorities = attributes_priorities
 
-        # The number of partial match additions after which a cleanup operation will be applied
+        # The number of partial match additions after which a cleanup operation will be applied (only used by the
+        # fixed interval cleanup policy)
         self.clean_up_interval = clean_up_interval
         self.prioritize_sorting_by_timestamp = prioritize_sorting_by_timestamp
+
+        # True if the arrival-ordered storages (e.g., the ones of the leaves) should remove the expired pattern matches
+        # upon every insertion rather than once in clean_up_interval insertions
+        self.eager_clean_up = eager_clean_up
+
+        # The policy for scheduling the storage cleanups and the estimated fraction of the expired partial matches
+        # triggering a cleanup under the adaptive policy
+        self.clean_up_policy = clean_up_policy
+        self.clean_up_expired_fraction = clean_up_expired_fraction
+
+        # The maximal number of partial matches stored by each node (None for no limit) and the policy for selecting
+        # the partial matches to be dropped once this number is reached
+        self.max_partial_matches = max_partial_matches
+        self.load_shedding_policy = load_shedding_policy
+
+        # True if the sorted storages should be replaced with NumPy-backed columnar ones (see
+        # ColumnarPatternMatchStorage) and False otherwise. Ignored if NumPy is not installed
+        self.use_columnar_storage = use_columnar_storage
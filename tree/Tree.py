@@ -1,10 +1,12 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 from typing import List, Dict
 
 from base.Pattern import Pattern
 from base.PatternStructure import PatternStructure, CompositeStructure, UnaryStructure, PrimitiveEventStructure, \
     NegationOperator
+from misc import DefaultConfig
 from misc.ConsumptionPolicy import ConsumptionPolicy
+from misc.TimestampUnits import TimestampUnits, convert_time_window
 from plan.TreePlan import TreePlan, TreePlanNode, TreePlanLeafNode, TreePlanNestedNode, TreePlanUnaryNode, \
     OperatorTypes, TreePlanInternalNode, TreePlanBinaryNode
 from tree.nodes.AndNode import AndNode
@@ -23,9 +25,10 @@ class Tree:
     The plan_nodes_to_nodes_map is used in multi-pattern mode.
     """
     def __init__(self, tree_plan: TreePlan, pattern: Pattern, storage_params: TreeStorageParameters,
-                 plan_nodes_to_nodes_map: Dict[TreePlanNode, Node] = None):
+                 plan_nodes_to_nodes_map: Dict[TreePlanNode, Node] = None,
+                 timestamp_unit: TimestampUnits = DefaultConfig.DEFAULT_TIMESTAMP_UNIT):
         self.__plan_nodes_to_nodes_map = plan_nodes_to_nodes_map
-        pattern_parameters = PatternParameters(pattern.window, pattern.confidence)
+        pattern_parameters = PatternParameters(convert_time_window(pattern.window, timestamp_unit), pattern.confidence)
         self.__root = self.__construct_tree(pattern.full_structure, tree_plan.root,
                                             Tree.__get_operator_arg_list(pattern.full_structure),
                                             pattern_parameters, None, pattern.consumption_policy)
@@ -37,6 +40,11 @@ class Tree:
         self.__apply_condition(pattern)
 
         self.__root.set_is_output_node(True)
+        if storage_params.eager_clean_up and Tree.__contains_unbounded_negation(tree_plan.root):
+            # the matches held back by an unbounded negative node are released after their time window has passed,
+            # hence the partial matches they are to be joined with must not be removed as soon as they expire
+            storage_params = copy(storage_params)
+            storage_params.eager_clean_up = False
         self.__root.create_storage_unit(storage_params)
 
         self.__root.create_parent_to_info_dict()
@@ -79,6 +87,22 @@ class Tree:
         # a PrimitiveEventStructure
         return [operator]
 
+    @staticmethod
+    def __contains_unbounded_negation(tree_plan: TreePlanNode):
+        """
+        Returns True if the given tree plan contains a negative node with unbounded negative events and False otherwise.
+        """
+        if isinstance(tree_plan, TreePlanNestedNode):
+            return Tree.__contains_unbounded_negation(tree_plan.sub_tree_plan)
+        if isinstance(tree_plan, TreePlanUnaryNode):
+            return Tree.__contains_unbounded_negation(tree_plan.child)
+        if isinstance(tree_plan, TreePlanBinaryNode):
+            if tree_plan.operator in (OperatorTypes.NSEQ, OperatorTypes.NAND) and tree_plan.is_unbounded:
+                return True
+            return Tree.__contains_unbounded_negation(tree_plan.left_child) or \
+                Tree.__contains_unbounded_negation(tree_plan.right_child)
+        return False
+
     @staticmethod
     def __instantiate_internal_node(operator_node: TreePlanInternalNode, pattern_params: PatternParameters,
                                     parent: Node):
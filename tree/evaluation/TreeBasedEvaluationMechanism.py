@@ -13,6 +13,8 @@ from tree.MultiPatternTree import MultiPatternTree
 from adaptive.statistics import StatisticsCollector
 from tree.Tree import Tree
 from datetime import timedelta
+from misc import DefaultConfig
+from misc.TimestampUnits import TimestampUnits, convert_time_window
 from adaptive.optimizer import Optimizer
 
 
@@ -24,27 +26,32 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
                  storage_params: TreeStorageParameters,
                  statistics_collector: StatisticsCollector = None,
                  optimizer: Optimizer = None,
-                 statistics_update_time_window: timedelta = None):
+                 statistics_update_time_window: timedelta = None,
+                 timestamp_unit: TimestampUnits = DefaultConfig.DEFAULT_TIMESTAMP_UNIT):
         self.__is_multi_pattern_mode = len(pattern_to_tree_plan_map) > 1
         if self.__is_multi_pattern_mode:
             # TODO: support statistic collection in the multi-pattern mode
-            self._tree = MultiPatternTree(pattern_to_tree_plan_map, storage_params)
+            self._tree = MultiPatternTree(pattern_to_tree_plan_map, storage_params, timestamp_unit)
         else:
             pattern = list(pattern_to_tree_plan_map)[0]
             pattern.condition.set_statistics_collector(statistics_collector)
             self._tree = Tree(list(pattern_to_tree_plan_map.values())[0],
-                              list(pattern_to_tree_plan_map)[0], storage_params)
+                              list(pattern_to_tree_plan_map)[0], storage_params, timestamp_unit=timestamp_unit)
 
         self.__storage_params = storage_params
         self.__statistics_collector = statistics_collector
         self.__optimizer = optimizer
+        self.__timestamp_unit = timestamp_unit
 
         self._event_types_listeners = {}
-        self.__statistics_update_time_window = statistics_update_time_window
+        self.__statistics_update_time_window = convert_time_window(statistics_update_time_window, timestamp_unit)
 
         # The remainder of the initialization process is only relevant for the freeze map feature. This feature can
         # only be enabled in single-pattern mode.
         self._pattern = list(pattern_to_tree_plan_map)[0] if not self.__is_multi_pattern_mode else None
+        # the time window of the pattern in the timestamp representation of the evaluation mechanism
+        self._pattern_window = convert_time_window(self._pattern.window, timestamp_unit) \
+            if not self.__is_multi_pattern_mode else None
         self.__freeze_map = {}
         self.__active_freezers = []
 
@@ -57,10 +64,18 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
         Activates the tree evaluation mechanism on the input event stream and reports all found pattern matches to the
         given output stream.
         """
+        if data_formatter.get_timestamp_unit() != self.__timestamp_unit:
+            raise Exception("The timestamp unit of the data formatter (%s) differs from the one of the evaluation "
+                            "mechanism (%s)" % (data_formatter.get_timestamp_unit(), self.__timestamp_unit))
         self._event_types_listeners = self._register_event_listeners(self._tree)
         last_statistics_refresh_time = None
 
         for raw_event in events:
+            peeked_event_type = data_formatter.peek_event_type(raw_event)
+            if peeked_event_type is not None and peeked_event_type not in self._event_types_listeners:
+                # the event is irrelevant - no need to parse it
+                Event.skip()
+                continue
             event = Event(raw_event, data_formatter)
             if event.type not in self._event_types_listeners.keys():
                 continue
@@ -90,7 +105,7 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
         new_statistics = self.__statistics_collector.get_statistics()
         if self.__optimizer.should_optimize(new_statistics, self._pattern):
             new_tree_plan = self.__optimizer.build_new_plan(new_statistics, self._pattern)
-            new_tree = Tree(new_tree_plan, self._pattern, self.__storage_params)
+            new_tree = Tree(new_tree_plan, self._pattern, self.__storage_params, timestamp_unit=self.__timestamp_unit)
             self._tree_update(new_tree, last_event.max_timestamp)
         # this is the new last statistic refresh time
         return last_event.max_timestamp
@@ -201,7 +216,7 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
             # freeze option disabled
             return False
         self.__active_freezers = [freezer for freezer in self.__active_freezers
-                                  if event.max_timestamp - freezer.min_timestamp <= self._pattern.window]
+                                  if event.max_timestamp - freezer.min_timestamp <= self._pattern_window]
 
     def get_structure_summary(self):
         return self._tree.get_structure_summary()
@@ -8,9 +8,9 @@ class AndNode(BinaryNode):
     An internal node representing an "AND" operator.
     """
     def get_structure_summary(self):
-        return ("And",
-                self._left_subtree.get_structure_summary(),
-                self._right_subtree.get_structure_summary())
+        return self._add_condition_summary(("And",
+                                            self._left_subtree.get_structure_summary(),
+                                            self._right_subtree.get_structure_summary()))
 
     def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                             rel_op: RelopTypes = None, equation_side: EquationSides = None,
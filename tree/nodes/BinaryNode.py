@@ -1,15 +1,35 @@
+import operator
 from abc import ABC
 from datetime import timedelta
-from typing import List, Set
+from itertools import compress
+from typing import Iterable, List, Set
 
 from base.Event import Event
+from misc import DefaultConfig
 from misc.Utils import calculate_joint_probability
-from condition.Condition import Condition, Variable, EquationSides
+from condition.Condition import Condition, Variable, EquationSides, RelopTypes
+from condition.AttributeCache import AttributeCache
 from condition.BaseRelationCondition import BaseRelationCondition
+from condition.CompositeCondition import AndCondition
 from base.PatternMatch import PatternMatch
 from tree.nodes.InternalNode import InternalNode
 from tree.nodes.Node import Node, PrimitiveEventDefinition, PatternParameters
 
+try:
+    import numpy
+except ImportError:  # NumPy might not be installed
+    numpy = None
+
+# the comparison operators corresponding to the basic relation conditions, applicable to NumPy arrays
+RELOP_TYPE_TO_OPERATOR = {
+    RelopTypes.Equal: operator.eq,
+    RelopTypes.NotEqual: operator.ne,
+    RelopTypes.Greater: operator.gt,
+    RelopTypes.GreaterEqual: operator.ge,
+    RelopTypes.Smaller: operator.lt,
+    RelopTypes.SmallerEqual: operator.le,
+}
+
 
 class BinaryNode(InternalNode, ABC):
     """
@@ -21,6 +41,8 @@ class BinaryNode(InternalNode, ABC):
         super().__init__(pattern_params, parents, pattern_ids, event_defs)
         self._left_subtree = left
         self._right_subtree = right
+        # caches the conditions applicable to batches of candidates for each pair of event definition lists
+        self.__batch_conditions = {}
 
     def create_parent_to_info_dict(self):
         if self._left_subtree is not None:
@@ -121,18 +143,132 @@ class BinaryNode(InternalNode, ABC):
         # in the other subtree we check for new partial matches in this node.
         self._try_create_new_matches(new_partial_match, partial_matches_to_compare, first_event_defs, second_event_defs)
 
-    def _try_create_new_matches(self, new_partial_match: PatternMatch, partial_matches_to_compare: List[PatternMatch],
+    def _try_create_new_matches(self, new_partial_match: PatternMatch,
+                                partial_matches_to_compare: Iterable[PatternMatch],
                                 first_event_defs: List[PrimitiveEventDefinition],
                                 second_event_defs: List[PrimitiveEventDefinition]):
         """
         For each candidate pair of partial matches that can be joined to create a new one, verifies all the
         necessary conditions creates new partial matches if all constraints are satisfied.
+        The candidates are consumed directly from the storage of the other subtree, which may provide a view of its
+        internal buffer rather than a list.
         """
+        if numpy is not None and DefaultConfig.ENABLE_BATCH_CONDITION_EVALUATION and \
+                len(partial_matches_to_compare) >= DefaultConfig.BATCH_CONDITION_EVALUATION_MIN_CANDIDATES:
+            partial_matches_to_compare = self.__filter_candidates(new_partial_match, partial_matches_to_compare,
+                                                                  first_event_defs, second_event_defs)
+        new_events = new_partial_match.events
+        new_probability = new_partial_match.probability
+        new_first_timestamp = new_partial_match.first_timestamp
+        new_last_timestamp = new_partial_match.last_timestamp
+        sliding_window = self._sliding_window
+        merge_events = self._merge_events_for_new_match
+        validate_and_propagate = self._validate_and_propagate_partial_match
         for partial_match in partial_matches_to_compare:
-            events_for_new_match = self._merge_events_for_new_match(first_event_defs, second_event_defs,
-                                                                    new_partial_match.events, partial_match.events)
-            probability = calculate_joint_probability(new_partial_match.probability, partial_match.probability)
-            self._validate_and_propagate_partial_match(events_for_new_match, probability)
+            # the timestamps of the merged partial match are derived from the ones of its two parts
+            first_timestamp = min(new_first_timestamp, partial_match.first_timestamp)
+            last_timestamp = max(new_last_timestamp, partial_match.last_timestamp)
+            if last_timestamp - first_timestamp > sliding_window:
+                # the merged partial match cannot satisfy the time window - no need to merge the events
+                continue
+            events_for_new_match = merge_events(first_event_defs, second_event_defs, new_events, partial_match.events)
+            probability = calculate_joint_probability(new_probability, partial_match.probability)
+            validate_and_propagate(events_for_new_match, probability, first_timestamp, last_timestamp)
+
+    def __filter_candidates(self, new_partial_match: PatternMatch, candidates: Iterable[PatternMatch],
+                            first_event_defs: List[PrimitiveEventDefinition],
+                            second_event_defs: List[PrimitiveEventDefinition]):
+        """
+        Discards the candidates violating any of the numeric relation conditions between the two sides of this node.
+        For each such condition, the value of the new partial match is calculated once, the values of all candidates
+        are collected into an array, and the comparison is performed in a single vectorized operation.
+        The remaining candidates are still to be fully validated. If the values turn out to be non-numeric or cannot be
+        compared, the candidates are returned unfiltered, leaving the decision to the regular validation.
+        The candidates are only iterated over, such that a view returned by the storage is not copied.
+        """
+        batch_conditions = self.__get_batch_conditions(first_event_defs, second_event_defs)
+        if len(batch_conditions) == 0:
+            return candidates
+        get_event_content = self._get_event_content
+        get_attribute = AttributeCache.get_attribute_function()
+        use_attribute_cache = DefaultConfig.ENABLE_ATTRIBUTE_CACHE
+        mask = None
+        try:
+            for new_event_index, new_getattr_func, candidate_event_index, candidate_getattr_func, \
+                    relation_op, is_new_on_left in batch_conditions:
+                new_event = new_partial_match.events[new_event_index]
+                new_value = get_attribute(new_event, new_getattr_func, get_event_content(new_event)) \
+                    if use_attribute_cache else new_getattr_func(get_event_content(new_event))
+                if isinstance(new_value, bool) or not isinstance(new_value, (int, float)):
+                    return candidates
+                if use_attribute_cache:
+                    candidate_values = numpy.array([
+                        get_attribute(pm.events[candidate_event_index], candidate_getattr_func,
+                                      get_event_content(pm.events[candidate_event_index])) for pm in candidates
+                    ])
+                else:
+                    candidate_values = numpy.array([
+                        candidate_getattr_func(get_event_content(pm.events[candidate_event_index]))
+                        for pm in candidates
+                    ])
+                if candidate_values.dtype.kind not in "iuf":
+                    return candidates
+                result = relation_op(new_value, candidate_values) if is_new_on_left \
+                    else relation_op(candidate_values, new_value)
+                mask = result if mask is None else mask & result
+        except (TypeError, ValueError):
+            return candidates
+        if mask.all():
+            return candidates
+        return list(compress(candidates, mask.tolist()))
+
+    def __get_batch_conditions(self, first_event_defs: List[PrimitiveEventDefinition],
+                               second_event_defs: List[PrimitiveEventDefinition]):
+        """
+        Returns the conditions of this node that can be evaluated on batches of candidates, that is, the top-level
+        basic relation conditions comparing an attribute of the new partial match with an attribute of a candidate.
+        Conditions updating a statistics collector are excluded, as each of their evaluations has to be recorded.
+        Each condition is described by the event indices and the attribute getters of both sides, the comparison
+        operator, and whether the new partial match is on its left side.
+        """
+        cache_key = (id(first_event_defs), id(second_event_defs))
+        cached_value = self.__batch_conditions.get(cache_key)
+        if cached_value is not None:
+            return cached_value[2]
+        batch_conditions = []
+        if isinstance(self._condition, AndCondition):
+            first_indices = {event_def.name: i for i, event_def in enumerate(first_event_defs)}
+            second_indices = {event_def.name: i for i, event_def in enumerate(second_event_defs)}
+            for condition in BinaryNode.__get_conjuncts(self._condition):
+                if not isinstance(condition, BaseRelationCondition) or len(condition.terms) != 2 or \
+                        condition.get_statistics_collector() is not None:
+                    continue
+                left_term, right_term = condition.get_left_term(), condition.get_right_term()
+                relation_op = RELOP_TYPE_TO_OPERATOR[condition.relop_type]
+                if left_term.name in first_indices and right_term.name in second_indices:
+                    batch_conditions.append((first_indices[left_term.name], left_term.getattr_func,
+                                             second_indices[right_term.name], right_term.getattr_func,
+                                             relation_op, True))
+                elif right_term.name in first_indices and left_term.name in second_indices:
+                    batch_conditions.append((first_indices[right_term.name], right_term.getattr_func,
+                                             second_indices[left_term.name], left_term.getattr_func,
+                                             relation_op, False))
+        # the event definition lists are kept alongside the result such that their ids cannot be reused
+        self.__batch_conditions[cache_key] = (first_event_defs, second_event_defs, batch_conditions)
+        return batch_conditions
+
+    @staticmethod
+    def __get_conjuncts(condition: AndCondition):
+        """
+        Returns the conditions whose conjunction forms the given condition, flattening nested conjunctions.
+        """
+        conjuncts = []
+        for inner_condition in condition.get_conditions_list():
+            if isinstance(inner_condition, AndCondition):
+                conjuncts.extend(BinaryNode.__get_conjuncts(inner_condition))
+            else:
+                conjuncts.append(inner_condition)
+        return conjuncts
 
     def _merge_events_for_new_match(self,
                                     first_event_defs: List[PrimitiveEventDefinition],
@@ -219,6 +355,20 @@ class BinaryNode(InternalNode, ABC):
                 raise Exception("Internal error")
         return left_term, left_rel_op, left_equation_size, right_term, right_rel_op, right_equation_size
 
+    def __create_sorting_key(self, term: Variable, event_defs: List[PrimitiveEventDefinition]):
+        """
+        Returns a callback fetching the value of the given term from a partial match with the given event definitions.
+        If the attribute cache is enabled, the value is retrieved via the attribute cache of the respective event.
+        """
+        if DefaultConfig.ENABLE_ATTRIBUTE_CACHE:
+            index = [event_def.name for event_def in event_defs].index(term.name)
+            get_attribute = AttributeCache.get_attribute_function()
+            return lambda pm: get_attribute(pm.events[index], term.getattr_func,
+                                            self._get_event_content(pm.events[index]))
+        return lambda pm: term.eval(
+            {event_defs[i].name: self._get_event_content(pm.events[i]) for i in range(len(pm.events))}
+        )
+
     def _get_condition_based_sorting_keys(self, attributes_priorities: dict):
         """
         Calculates the sorting keys according to the conditions in the pattern and the user-provided priorities.
@@ -245,12 +395,8 @@ class BinaryNode(InternalNode, ABC):
 
         # convert terms into sorting key fetching callbacks
         if left_term is not None:
-            left_sorting_key = lambda pm: left_term.eval(
-                {left_event_defs[i].name: self._get_event_content(pm.events[i]) for i in range(len(pm.events))}
-            )
+            left_sorting_key = self.__create_sorting_key(left_term, left_event_defs)
         if right_term is not None:
-            right_sorting_key = lambda pm: right_term.eval(
-                {right_event_defs[i].name: self._get_event_content(pm.events[i]) for i in range(len(pm.events))}
-            )
+            right_sorting_key = self.__create_sorting_key(right_term, right_event_defs)
 
         return left_sorting_key, left_rel_op, left_equation_size, right_sorting_key, right_rel_op, right_equation_size
@@ -4,7 +4,8 @@ from typing import List, Set
 from base.Event import Event, AggregatedEvent
 from condition.Condition import RelopTypes, EquationSides
 from tree.nodes.Node import Node, PrimitiveEventDefinition, PatternParameters
-from tree.PatternMatchStorage import TreeStorageParameters, UnsortedPatternMatchStorage, SortedPatternMatchStorage
+from tree.PatternMatchStorage import TreeStorageParameters, UnsortedPatternMatchStorage, SortedPatternMatchStorage, \
+    HashedPatternMatchStorage, ColumnarPatternMatchStorage
 
 
 class InternalNode(Node, ABC):
@@ -28,6 +29,8 @@ class InternalNode(Node, ABC):
         if len(events_for_new_match) != len(set(events_for_new_match)):
             # the list contains duplicate events which is not allowed
             return False
+        if self._compiled_condition is not None:
+            return self._compiled_condition(events_for_new_match)
         binding = {
             self._event_defs[i].name: InternalNode._get_event_content(events_for_new_match[i])
             for i in range(len(self._event_defs))
@@ -54,9 +57,20 @@ class InternalNode(Node, ABC):
         """
         if not storage_params.sort_storage or sorting_key is None:
             self._partial_matches = UnsortedPatternMatchStorage(storage_params.clean_up_interval)
+        elif rel_op == RelopTypes.Equal:
+            # equality conditions are best served by a hash-based lookup
+            self._partial_matches = HashedPatternMatchStorage(sorting_key, storage_params.clean_up_interval)
+        elif storage_params.use_columnar_storage and ColumnarPatternMatchStorage.is_supported():
+            self._partial_matches = ColumnarPatternMatchStorage(sorting_key, rel_op, equation_side,
+                                                                storage_params.clean_up_interval,
+                                                                sort_by_first_timestamp)
         else:
             self._partial_matches = SortedPatternMatchStorage(sorting_key, rel_op, equation_side,
                                                               storage_params.clean_up_interval, sort_by_first_timestamp)
+        self._partial_matches.set_clean_up_policy(storage_params.clean_up_policy,
+                                                  storage_params.clean_up_expired_fraction)
+        self._partial_matches.set_load_shedding_policy(storage_params.max_partial_matches,
+                                                       storage_params.load_shedding_policy)
 
     def handle_new_partial_match(self, partial_match_source: Node):
         """
@@ -87,9 +87,10 @@ class KleeneClosureNode(UnaryNode):
         names = {event_def.name for event_def in self.get_event_definitions()}
         self._condition = condition.get_condition_of(names, get_kleene_closure_conditions=True,
                                                      consume_returned_conditions=True)
+        self._set_condition_reordering()
 
     def get_structure_summary(self):
-        return "KC", self._child.get_structure_summary()
+        return self._add_condition_summary(("KC", self._child.get_structure_summary()))
 
     def is_equivalent(self, other):
         """
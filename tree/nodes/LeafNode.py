@@ -6,7 +6,8 @@ from condition.Condition import Condition, RelopTypes, EquationSides
 from base.PatternStructure import PrimitiveEventStructure
 from tree.nodes.Node import Node
 from tree.nodes.Node import PrimitiveEventDefinition, PatternParameters
-from tree.PatternMatchStorage import TreeStorageParameters, SortedPatternMatchStorage
+from tree.PatternMatchStorage import TreeStorageParameters, SortedPatternMatchStorage, HashedPatternMatchStorage, \
+    ColumnarPatternMatchStorage
 
 
 class LeafNode(Node):
@@ -76,6 +77,8 @@ class LeafNode(Node):
         """
         if not super()._validate_new_match(events_for_new_match):
             return False
+        if self._compiled_condition is not None:
+            return self._compiled_condition(events_for_new_match)
         binding = {self.__event_name: events_for_new_match[0].payload}
         return self._condition.eval(binding)
 
@@ -91,14 +94,29 @@ class LeafNode(Node):
         arrival order if no storage parameters were explicitly specified.
         """
         should_use_default_storage_mode = not storage_params.sort_storage or sorting_key is None
-        actual_sorting_key = (lambda pm: pm.events[0].timestamp) if should_use_default_storage_mode else sorting_key
-        actual_sort_by_first_timestamp = should_use_default_storage_mode or sort_by_first_timestamp
-        self._partial_matches = SortedPatternMatchStorage(actual_sorting_key, rel_op, equation_side,
-                                                          storage_params.clean_up_interval,
-                                                          actual_sort_by_first_timestamp, True)
+        if not should_use_default_storage_mode and rel_op == RelopTypes.Equal:
+            # equality conditions are best served by a hash-based lookup
+            self._partial_matches = HashedPatternMatchStorage(sorting_key, storage_params.clean_up_interval, True)
+        else:
+            actual_sorting_key = (lambda pm: pm.events[0].timestamp) if should_use_default_storage_mode \
+                else sorting_key
+            actual_sort_by_first_timestamp = should_use_default_storage_mode or sort_by_first_timestamp
+            if storage_params.use_columnar_storage and ColumnarPatternMatchStorage.is_supported():
+                self._partial_matches = ColumnarPatternMatchStorage(actual_sorting_key, rel_op, equation_side,
+                                                                    storage_params.clean_up_interval,
+                                                                    actual_sort_by_first_timestamp, True)
+            else:
+                self._partial_matches = SortedPatternMatchStorage(actual_sorting_key, rel_op, equation_side,
+                                                                  storage_params.clean_up_interval,
+                                                                  actual_sort_by_first_timestamp, True,
+                                                                  storage_params.eager_clean_up)
+        self._partial_matches.set_clean_up_policy(storage_params.clean_up_policy,
+                                                  storage_params.clean_up_expired_fraction)
+        self._partial_matches.set_load_shedding_policy(storage_params.max_partial_matches,
+                                                       storage_params.load_shedding_policy)
 
     def get_structure_summary(self):
-        return self.__event_name
+        return self._add_condition_summary(self.__event_name)
 
     def is_equivalent(self, other):
         """
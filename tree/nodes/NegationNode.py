@@ -1,6 +1,6 @@
 from abc import ABC
 from datetime import datetime
-from typing import List, Set, Type
+from typing import Iterable, List, Set, Type
 from base.Event import Event
 from condition.Condition import RelopTypes, EquationSides
 from base.PatternMatch import PatternMatch
@@ -93,7 +93,8 @@ class NegationNode(BinaryNode, ABC):
         """
         return self._positive_event_defs
 
-    def _try_create_new_matches(self, new_partial_match: PatternMatch, partial_matches_to_compare: List[PatternMatch],
+    def _try_create_new_matches(self, new_partial_match: PatternMatch,
+                                partial_matches_to_compare: Iterable[PatternMatch],
                                 first_event_defs: List[PrimitiveEventDefinition],
                                 second_event_defs: List[PrimitiveEventDefinition]):
         """
@@ -215,9 +216,9 @@ class NegativeAndNode(NegationNode):
         super().__init__(pattern_params, is_unbounded, AndOperator, parents, pattern_ids, event_defs, left, right)
 
     def get_structure_summary(self):
-        return ("NAnd",
-                self._positive_subtree.get_structure_summary(),
-                self._negative_subtree.get_structure_summary())
+        return self._add_condition_summary(("NAnd",
+                                            self._positive_subtree.get_structure_summary(),
+                                            self._negative_subtree.get_structure_summary()))
 
 
 class NegativeSeqNode(NegationNode):
@@ -232,9 +233,9 @@ class NegativeSeqNode(NegationNode):
         super().__init__(pattern_params, is_unbounded, SeqOperator, parents, pattern_ids, event_defs, left, right)
 
     def get_structure_summary(self):
-        return ("NSeq",
-                self._positive_subtree.get_structure_summary(),
-                self._negative_subtree.get_structure_summary())
+        return self._add_condition_summary(("NSeq",
+                                            self._positive_subtree.get_structure_summary(),
+                                            self._negative_subtree.get_structure_summary()))
 
     def _set_event_definitions(self,
                                positive_event_defs: List[PrimitiveEventDefinition],
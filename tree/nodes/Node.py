@@ -7,7 +7,9 @@ from dataclasses import dataclass
 from base.Event import Event
 from condition.Condition import RelopTypes, EquationSides
 from condition.CompositeCondition import CompositeCondition, AndCondition
+from condition.ConditionCompiler import compile_event_condition
 from base.PatternMatch import PatternMatch
+from misc import DefaultConfig
 from tree.PatternMatchStorage import TreeStorageParameters
 
 
@@ -62,6 +64,9 @@ class Node(ABC):
         self._confidence = pattern_params.confidence
         self._partial_matches = None
         self._condition = AndCondition()
+        # the condition of this node compiled into a function over the positions of the events of a candidate partial
+        # match, or None if the condition is to be evaluated by the interpreter
+        self._compiled_condition = None
 
         # Full pattern matches that were not yet reported. Only relevant for an output node, that is, for a node
         # corresponding to a full pattern definition.
@@ -159,21 +164,25 @@ class Node(ABC):
         self._filtered_events |= new_filtered_events
         return True
 
-    def _validate_and_propagate_partial_match(self, events: List[Event], match_probability: float = None):
+    def _validate_and_propagate_partial_match(self, events: List[Event], match_probability: float = None,
+                                              first_timestamp=None, last_timestamp=None):
         """
         Creates a new partial match from the list of events, validates it, and propagates it up the tree.
         For probabilistic streams, receives the pre-calculated probability of the potential pattern match.
+        The earliest and the latest timestamps of the events are optionally provided if they are already known.
         """
         if not self._validate_new_match(events):
             return
-        self._propagate_partial_match(events, match_probability)
+        self._propagate_partial_match(events, match_probability, first_timestamp, last_timestamp)
 
-    def _propagate_partial_match(self, events: List[Event], match_probability: float = None):
+    def _propagate_partial_match(self, events: List[Event], match_probability: float = None,
+                                 first_timestamp=None, last_timestamp=None):
         """
         Receives an already verified list of events for new partial match and propagates it up the tree.
         For probabilistic streams, receives the pre-calculated probability of the potential pattern match.
+        The earliest and the latest timestamps of the events are optionally provided if they are already known.
         """
-        new_partial_match = PatternMatch(events, match_probability)
+        new_partial_match = PatternMatch(events, match_probability, first_timestamp, last_timestamp)
         if self.__can_add_partial_match(new_partial_match):
             self._add_partial_match(new_partial_match)
 
@@ -320,6 +329,30 @@ class Node(ABC):
         names = {event_def.name for event_def in self.get_event_definitions()}
         self._condition = condition.get_condition_of(names, get_kleene_closure_conditions=False,
                                                      consume_returned_conditions=True)
+        self._set_condition_reordering()
+        self._compile_condition()
+
+    def _set_condition_reordering(self):
+        """
+        Enables the periodic reordering of the condition of this node if configured.
+        """
+        if DefaultConfig.CONDITION_REORDERING_INTERVAL is not None and \
+                isinstance(self._condition, CompositeCondition):
+            self._condition.set_reordering_interval(DefaultConfig.CONDITION_REORDERING_INTERVAL)
+
+    def _compile_condition(self):
+        """
+        Compiles the condition of this node into a function over the events ordered according to the event
+        definitions of this node, unless compilation is disabled or not supported for this condition.
+        The event names are thereby resolved into positions once, instead of binding the names to the event payloads
+        upon each evaluation.
+        """
+        if not DefaultConfig.COMPILE_CONDITIONS:
+            self._compiled_condition = None
+            return
+        names = [event_def.name for event_def in self.get_event_definitions()]
+        self._compiled_condition = compile_event_condition(self._condition, names,
+                                                           DefaultConfig.ENABLE_ATTRIBUTE_CACHE)
 
     def get_first_unbounded_negative_node(self):
         """
@@ -404,6 +437,17 @@ class Node(ABC):
         """
         raise NotImplementedError()
 
+    def _add_condition_summary(self, summary):
+        """
+        Appends the condition of this node to the given summary of its subtree if the order of the condition was
+        changed by the periodic reordering, such that the current evaluation order is visible.
+        """
+        if not isinstance(self._condition, CompositeCondition) or not self._condition.is_reordered():
+            return summary
+        if isinstance(summary, tuple):
+            return summary + (str(self._condition),)
+        return summary, str(self._condition)
+
     def create_storage_unit(self, storage_params: TreeStorageParameters, sorting_key: callable = None,
                             rel_op: RelopTypes = None, equation_side: EquationSides = None,
                             sort_by_first_timestamp: bool = False):
@@ -1,19 +1,36 @@
-from typing import List
+from enum import Enum
+from typing import List, Set
 
 from base.Event import Event
 from condition.Condition import RelopTypes, EquationSides
 from misc.Utils import merge, merge_according_to, is_sorted
 from tree.nodes.BinaryNode import BinaryNode
-from tree.nodes.Node import PrimitiveEventDefinition
+from tree.nodes.Node import Node, PrimitiveEventDefinition, PatternParameters
 from tree.PatternMatchStorage import TreeStorageParameters
 
 
+class _MergeTypes(Enum):
+    """
+    The ways in which the event lists of two partial matches are merged into the event list of a new partial match.
+    """
+    FIRST_THEN_SECOND = 0
+    SECOND_THEN_FIRST = 1
+    INTERLEAVED = 2
+
+
 class SeqNode(BinaryNode):
     """
     An internal node representing a "SEQ" (sequence) operator.
     In addition to checking the time window and condition like the basic node does, SeqNode also verifies the order
     of arrival of the events in the partial matches it constructs.
     """
+    def __init__(self, pattern_params: PatternParameters, parents: List[Node] = None, pattern_ids: int or Set[int] = None,
+                 event_defs: List[PrimitiveEventDefinition] = None,
+                 left: Node = None, right: Node = None):
+        super().__init__(pattern_params, parents, pattern_ids, event_defs, left, right)
+        # maps pairs of event definition lists to the way their events are merged
+        self.__merge_types = {}
+
     def _set_event_definitions(self,
                                left_event_defs: List[PrimitiveEventDefinition],
                                right_event_defs: List[PrimitiveEventDefinition]):
@@ -24,18 +41,47 @@ class SeqNode(BinaryNode):
                                     second_event_defs: List[PrimitiveEventDefinition],
                                     first_event_list: List[Event],
                                     second_event_list: List[Event]):
+        merge_type = self.__get_merge_type(first_event_defs, second_event_defs)
+        if merge_type == _MergeTypes.FIRST_THEN_SECOND:
+            return first_event_list + second_event_list
+        if merge_type == _MergeTypes.SECOND_THEN_FIRST:
+            return second_event_list + first_event_list
         return merge_according_to(first_event_defs, second_event_defs,
                                   first_event_list, second_event_list, key=lambda x: x.index)
 
+    def __get_merge_type(self, first_event_defs: List[PrimitiveEventDefinition],
+                         second_event_defs: List[PrimitiveEventDefinition]):
+        """
+        Returns the way in which the events of the given definitions are merged. Since the merge only depends on the
+        event definitions, it is calculated once per pair of definition lists and cached. If all the events of one
+        subtree precede all the events of the other one, as is always the case in a left-deep tree, the events are
+        merged by a plain list concatenation rather than interleaved one by one.
+        """
+        key = (id(first_event_defs), id(second_event_defs))
+        cached_entry = self.__merge_types.get(key)
+        if cached_entry is not None:
+            return cached_entry[2]
+        first_indices = [event_def.index for event_def in first_event_defs]
+        second_indices = [event_def.index for event_def in second_event_defs]
+        if max(first_indices) < min(second_indices):
+            merge_type = _MergeTypes.FIRST_THEN_SECOND
+        elif max(second_indices) < min(first_indices):
+            merge_type = _MergeTypes.SECOND_THEN_FIRST
+        else:
+            merge_type = _MergeTypes.INTERLEAVED
+        # the definition lists are kept in the cache to prevent their IDs from being reused by other objects
+        self.__merge_types[key] = (first_event_defs, second_event_defs, merge_type)
+        return merge_type
+
     def _validate_new_match(self, events_for_new_match: List[Event]):
         if not is_sorted(events_for_new_match, key=lambda x: x.timestamp, secondary_key=lambda x: x.max_timestamp):
             return False
         return super()._validate_new_match(events_for_new_match)
 
     def get_structure_summary(self):
-        return ("Seq",
-                self._left_subtree.get_structure_summary(),
-                self._right_subtree.get_structure_summary())
+        return self._add_condition_summary(("Seq",
+                                            self._left_subtree.get_structure_summary(),
+                                            self._right_subtree.get_structure_summary()))
 
     def is_equivalent(self, other):
         """